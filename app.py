@@ -1,6 +1,9 @@
 import streamlit as st
 
-from utils.session_state import init_session_state, reset_session_state
+from core.asset_store import collect_garbage, mark_active
+from core.resilience import provider_status
+from utils.config import get_env, load_env
+from utils.session_state import get_state, init_session_state, reset_session_state
 
 st.set_page_config(
     page_title="EverydayBible",
@@ -9,12 +12,30 @@ st.set_page_config(
 )
 
 init_session_state()
+# 이 세션의 프로젝트를 활성으로 기록 (다른 세션의 자산 정리가 비우지 않도록)
+mark_active(get_state().project_id)
 
 with st.sidebar:
     if st.button("🔄 처음부터 다시 시작", use_container_width=True):
         reset_session_state()
         st.toast("프로젝트가 초기화되었습니다.", icon="✅")
         st.rerun()
+    if st.button("🧹 프로젝트 자산 정리", use_container_width=True,
+                 help="어떤 프로젝트도 참조하지 않는 이미지/오디오를 지우고, 용량 한도(ASSET_STORE_MAX_MB)를 넘으면 최근 사용하지 않은 오래된 프로젝트 자산부터 정리합니다."):
+        load_env()
+        max_mb = int(get_env("ASSET_STORE_MAX_MB", "5000"))
+        report = collect_garbage(max_bytes=max_mb * 1024 * 1024, protect={get_state().project_id})
+        st.toast(
+            f"파일 {report.removed_files}개 삭제 · {report.freed_bytes / 1024 / 1024:.1f}MB 확보 "
+            f"(현재 {report.total_bytes / 1024 / 1024:.0f}MB / 한도 {max_mb}MB)",
+            icon="🧹",
+        )
+        if report.skipped_projects:
+            st.caption(f"manifest가 없어 정리하지 않은 프로젝트: {', '.join(report.skipped_projects)}")
+    # 회로가 열린 외부 서비스 표시 (해당 호출은 잠시 바로 실패하거나 로컬 대체 경로 사용)
+    for provider, status in provider_status().items():
+        if status["state"] == "open":
+            st.warning(f"⚠️ {provider} 일시 차단 중 ({status['retry_after']:.0f}초 후 재시도)")
 
 pages = [
     st.Page("pages/1_script.py", title="1. 스크립트", icon="📝"),
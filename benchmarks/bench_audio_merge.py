@@ -0,0 +1,76 @@
+"""
+블록 10/50/200개 병합 시간을 비교합니다.
+- legacy: AudioSegment += 누적 (매번 전체 버퍼 복사) 후 MP3 재인코딩
+- decode: 블록별 한 번 디코딩 → PCM 한 번에 이어 붙이기 → 한 번 인코딩
+- stream_copy: MP3 프레임 그대로 이어 붙이기 (디코딩/인코딩 없음)
+세 방식의 타임스탬프가 같은지도 확인합니다.
+블록은 TTS 스트리밍 출력처럼 Xing 헤더 없는 44.1kHz 모노 128kbps MP3로 만듭니다 (6~14초).
+
+실행: python -m benchmarks.bench_audio_merge  (ffmpeg 필요)
+"""
+import io
+import time
+
+from pydub import AudioSegment
+from pydub.generators import Sine
+
+from core.audio_processor import AudioProcessor
+from models.data_models import AudioBlock
+
+BLOCK_COUNTS = (10, 50, 200)
+BLOCK_SECONDS = (6.2, 8.9, 11.3, 13.7, 7.4, 9.8)
+
+
+def legacy_merge(processor: AudioProcessor, blocks):
+    final_audio = AudioSegment.empty()
+    spans = []
+    current_time_ms = 0.0
+    for block in sorted(blocks, key=lambda x: x.section_index):
+        segment = AudioSegment.from_mp3(io.BytesIO(block.audio_data))
+        spans.append((current_time_ms / 1000.0, (current_time_ms + len(segment)) / 1000.0))
+        final_audio += segment
+        final_audio += processor.silence
+        current_time_ms += len(segment) + 500
+    buffer = io.BytesIO()
+    final_audio.export(buffer, format="mp3")
+    return buffer.getvalue(), spans
+
+
+def main() -> None:
+    sources = []
+    for i, seconds in enumerate(BLOCK_SECONDS):
+        tone = Sine(220 + 55 * i).to_audio_segment(duration=seconds * 1000, volume=-12)
+        buffer = io.BytesIO()
+        tone.set_frame_rate(44100).set_channels(1).export(
+            buffer, format="mp3", bitrate="128k", parameters=["-write_xing", "0"]
+        )
+        sources.append(buffer.getvalue())
+
+    processor = AudioProcessor()
+    for count in BLOCK_COUNTS:
+        blocks = [
+            AudioBlock(section_index=i, text="", audio_data=sources[i % len(sources)]) for i in range(count)
+        ]
+        sections_meta = [{"section_type": f"Section{i}"} for i in range(count)]
+        minutes = sum(BLOCK_SECONDS[i % len(BLOCK_SECONDS)] + 0.5 for i in range(count)) / 60
+
+        started = time.perf_counter()
+        legacy_bytes, legacy_spans = legacy_merge(processor, blocks)
+        results = [("legacy", time.perf_counter() - started, len(legacy_bytes), True)]
+        for stream_copy in (False, True):
+            started = time.perf_counter()
+            audio, timestamps = processor.merge_audio_blocks(blocks, sections_meta, stream_copy=stream_copy)
+            elapsed = time.perf_counter() - started
+            spans = [(t.start_time_seconds, t.end_time_seconds) for t in timestamps]
+            results.append((processor.last_merge_mode, elapsed, len(audio), spans == legacy_spans))
+
+        print(f"{count} blocks ({minutes:.1f} min):")
+        for mode, elapsed, size, same in results:
+            print(
+                f"  {mode:<12} {elapsed:7.2f}s  {size / 1024 / 1024:6.1f} MB  "
+                f"timestamps {'identical' if same else 'DIFFERENT'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+다양한 형식의 성경 구절 입력에 대한 parse_reference 처리량을 측정합니다.
+
+실행: python -m benchmarks.bench_bible_parser
+"""
+import time
+
+from utils.bible_parser import parse_reference
+
+INPUTS = [
+    "시편 23편", "시 23", "Psalm 23", "시편23장", "시편 이십삼편",
+    "요 3:16", "요한복음 3장 16절", "John 3:16-18", "1 John 4:8", "요일 4:8",
+    "창세기 1장", "창 1:1", "Gen 1", "사 53", "롬 8:28",
+    "고전 13", "빌 4:13", "히 11:1", "유다서", "계 22:20",
+]
+ITERATIONS = 20000
+
+
+def main() -> None:
+    for text in INPUTS:
+        parse_reference(text)
+
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for text in INPUTS:
+            parse_reference(text)
+    elapsed = time.perf_counter() - started
+
+    total = ITERATIONS * len(INPUTS)
+    print(f"{total} parses in {elapsed:.2f}s")
+    print(f"{total / elapsed:,.0f} parses/s, {elapsed / total * 1_000_000:.2f} us per parse")
+
+
+if __name__ == "__main__":
+    main()
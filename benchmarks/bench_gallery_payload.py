@@ -0,0 +1,64 @@
+"""
+페이지 2 갤러리 한 번의 rerun에서 브라우저로 보내는 이미지 바이트를 비교합니다.
+- 이전: 카드마다 원본 PNG(st.image) + 원본 PNG(download_button data)
+- 이후: 카드마다 썸네일 JPEG만 (원본은 다운로드/확대 요청 시에만 전송)
+
+실행: python -m benchmarks.bench_gallery_payload
+"""
+import os
+import random
+import tempfile
+import time
+
+from PIL import Image, ImageDraw, ImageFilter
+
+from core.thumbnails import get_thumbnail
+
+IMAGE_COUNT = 30
+IMAGE_SIZE = (1920, 1080)
+
+
+def _synthetic_image(path: str, seed: int) -> None:
+    """그라디언트 + 도형 + 노이즈로 생성 이미지와 비슷한 압축률의 PNG를 만듭니다."""
+    rng = random.Random(seed)
+    img = Image.linear_gradient("L").resize(IMAGE_SIZE).convert("RGB")
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x, y = rng.randrange(IMAGE_SIZE[0]), rng.randrange(IMAGE_SIZE[1])
+        r = rng.randrange(40, 300)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    img = img.filter(ImageFilter.GaussianBlur(6))
+    noise = Image.effect_noise(IMAGE_SIZE, 24).convert("RGB")
+    Image.blend(img, noise, 0.15).save(path, format="PNG")
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(IMAGE_COUNT):
+            path = os.path.join(tmp, f"{i:02d}_Section_00.png")
+            _synthetic_image(path, i)
+            paths.append(path)
+
+        before = sum(os.path.getsize(p) * 2 for p in paths)
+
+        started = time.perf_counter()
+        thumbs = [get_thumbnail(p) for p in paths]
+        first_build = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for p in paths:
+            get_thumbnail(p)
+        cached = time.perf_counter() - started
+
+        after = sum(os.path.getsize(t) for t in thumbs)
+        print(f"{IMAGE_COUNT} images, {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}")
+        print(f"rerun payload before: {before / 1024 / 1024:.1f} MB")
+        print(f"rerun payload after:  {after / 1024 / 1024:.2f} MB ({before / after:.0f}x smaller)")
+        print(f"thumbnail build: {first_build / IMAGE_COUNT * 1000:.1f} ms/image (first), "
+              f"{cached / IMAGE_COUNT * 1_000_000:.0f} us/image (cached)")
+
+
+if __name__ == "__main__":
+    main()
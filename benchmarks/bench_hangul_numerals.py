@@ -0,0 +1,45 @@
+"""
+숫자가 섞인 10개 섹션 대본에 대해 normalize_numerals 처리 속도를 측정합니다.
+
+실행: python -m benchmarks.bench_hangul_numerals
+"""
+import time
+
+from utils.hangul_numerals import normalize_numerals
+
+SECTIONS = [
+    "안녕하세요. 하루 딱! 한장과 함께하는 오늘의 말씀 시간입니다. 2024년 6월 1일, 새로운 하루를 하나님의 말씀으로 시작해보겠습니다.",
+    "오늘은 시편 23편 말씀을 함께 나누겠습니다. 다윗은 약 3,000년 전 베들레헴에서 양을 치던 목자였습니다. 그는 40년 동안 이스라엘을 다스렸습니다.",
+    "먼저 1절 말씀을 함께 읽어보겠습니다. 시편 23:1 여호와는 나의 목자시니 내게 부족함이 없으리로다.",
+    "목자는 하루 24시간 양 떼를 지킵니다. 100마리 중 1마리를 잃어도 찾아 나섭니다. 12개월 내내 푸른 풀밭을 찾아다니는 수고를 합니다.",
+    "이제 두 번째 구절을 함께 보겠습니다. 4절 말씀입니다. 내가 사망의 음침한 골짜기로 다닐지라도 해를 두려워하지 않을 것은 주께서 나와 함께 하심이라.",
+    "광야의 골짜기는 해발 1,200미터에서 400미터까지 급히 내려갑니다. 그곳에서 3명의 목자가 24,000명의 순례자를 인도했다는 기록도 있습니다.",
+    "마지막으로 6절 말씀을 읽어보겠습니다. 시편 23:6 내 평생에 선하심과 인자하심이 반드시 나를 따르리니.",
+    "2천 년 전 예수님은 요한복음 10장 11절에서 나는 선한 목자라 말씀하셨습니다. 99마리를 두고 1마리를 찾으시는 주님이십니다.",
+    "이제 함께 기도하겠습니다. 오늘 하루 8시간의 일터에서도, 3번의 식탁에서도 주님이 나의 목자 되심을 고백하게 하옵소서.",
+    "오늘도 1,440분의 하루를 주님과 함께 걸어가시길 바랍니다. 10월 10일 다음 시간에 다시 뵙겠습니다.",
+]
+ITERATIONS = 2000
+
+
+def main() -> None:
+    script_chars = sum(len(s) for s in SECTIONS)
+    for section in SECTIONS:
+        normalize_numerals(section)
+
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for section in SECTIONS:
+            normalize_numerals(section)
+    elapsed = time.perf_counter() - started
+
+    per_script_us = elapsed / ITERATIONS * 1_000_000
+    print(f"script: {len(SECTIONS)} sections, {script_chars} chars")
+    print(f"{per_script_us:.1f} us per script, {script_chars * ITERATIONS / elapsed / 1_000_000:.2f} M chars/s")
+    print()
+    for section in SECTIONS[:3]:
+        print(normalize_numerals(section))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+합성 프롬프트 50,000개로 ImageLibrary 삽입/콜드 스타트(로드 + 첫 검색)/검색/추가+검색 시간을 측정합니다.
+이미지 파일은 내용만 다른 작은 더미 파일을 사용합니다.
+
+실행: python -m benchmarks.bench_image_library
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+
+from core.image_library import ImageLibrary
+
+ENTRIES = 50000
+QUERIES = 200
+STYLE = "warm, pastel-toned watercolor style, soft lighting, peaceful atmosphere"
+
+SUBJECTS = ["Moses", "David", "a shepherd", "Jesus", "Peter", "Mary", "an old prophet", "a young king",
+            "fishermen", "a crowd of people", "Abraham", "a widow", "Elijah", "the disciples"]
+ACTIONS = ["praying on", "walking across", "standing beside", "kneeling at", "looking over",
+           "resting near", "teaching on", "weeping at", "singing on", "climbing"]
+PLACES = ["a rocky mountain", "the Sea of Galilee", "a desert road", "an olive garden", "the temple steps",
+          "a wheat field", "a quiet village", "the Jordan river", "a starry hillside", "a city gate"]
+MOODS = ["at sunrise", "at dusk", "under heavy clouds", "in golden light", "in the rain", "at night"]
+
+
+def make_prompt(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(ACTIONS)} {rng.choice(PLACES)} {rng.choice(MOODS)}"
+
+
+def wait_for_rebuilds() -> None:
+    # 백그라운드 IDF 재계산이 측정 중인 검색과 GIL을 다투지 않도록 끝날 때까지 기다림
+    for thread in threading.enumerate():
+        if thread.name == "image-library-rebuild":
+            thread.join()
+
+
+def main() -> None:
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = os.path.join(tmp, "src")
+        os.makedirs(source_dir)
+        items = []
+        for i in range(ENTRIES):
+            path = os.path.join(source_dir, f"{i}.png")
+            with open(path, "wb") as f:
+                f.write(i.to_bytes(4, "little"))
+            items.append((make_prompt(rng), path, STYLE))
+
+        library = ImageLibrary(os.path.join(tmp, "library"))
+        started = time.perf_counter()
+        for start in range(0, ENTRIES, 1000):
+            library.add_many(items[start : start + 1000])
+        library.flush()
+        wait_for_rebuilds()
+        print(f"insert: {len(library)} entries in {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        reloaded = ImageLibrary(os.path.join(tmp, "library"))
+        reloaded.search(make_prompt(rng))
+        print(f"cold start (load + first search): {(time.perf_counter() - started) * 1000:.1f} ms")
+        wait_for_rebuilds()
+
+        queries = [make_prompt(rng) for _ in range(QUERIES)]
+        started = time.perf_counter()
+        found = sum(1 for query in queries if reloaded.search(query, k=3, art_style=STYLE))
+        elapsed = time.perf_counter() - started
+        print(f"{QUERIES} searches: {elapsed / QUERIES * 1000:.2f} ms per search ({found} with matches)")
+
+        started = time.perf_counter()
+        for i, (prompt, path, style) in enumerate(items[:100]):
+            new_path = path + ".new.png"
+            with open(new_path, "wb") as f:
+                f.write((ENTRIES + i).to_bytes(4, "little"))
+            reloaded.add(prompt + " with a lamb", new_path, style)
+            reloaded.search(prompt)
+        elapsed = time.perf_counter() - started
+        print(f"100 incremental add+search: {elapsed / 100 * 1000:.2f} ms each")
+
+
+if __name__ == "__main__":
+    main()
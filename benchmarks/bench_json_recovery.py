@@ -0,0 +1,64 @@
+"""
+깨진 Claude 응답 코퍼스(benchmarks/json_corpus)에 대해
+json.loads 단독 / recover_json의 복구율과 파싱 시간을 측정합니다.
+
+실행: python -m benchmarks.bench_json_recovery
+"""
+import json
+import os
+import time
+
+from core.json_recovery import recover_json
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "json_corpus")
+REPEAT = 200
+
+
+def _plain_parse(text: str) -> dict:
+    start = text.find("{")
+    end = text.rfind("}")
+    return json.loads(text[start : end + 1])
+
+
+def _count_sections(data: dict) -> int:
+    return sum(
+        1
+        for item in data.get("sections", [])
+        if isinstance(item, dict) and "section_type" in item and "content" in item
+    )
+
+
+def _measure(fn, text: str):
+    try:
+        data = fn(text)
+    except Exception:
+        return None, 0.0
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(text)
+    return data, (time.perf_counter() - started) / REPEAT * 1000
+
+
+def main() -> None:
+    names = sorted(n for n in os.listdir(CORPUS_DIR) if n.endswith(".txt"))
+    recovered = {"json.loads": 0, "recover_json": 0}
+    print(f"{'file':<32}{'json.loads':>12}{'recover_json':>14}{'sections':>10}{'ms':>8}")
+    for name in names:
+        with open(os.path.join(CORPUS_DIR, name), "r", encoding="utf-8") as f:
+            text = f.read()
+        plain, _ = _measure(_plain_parse, text)
+        fixed, ms = _measure(recover_json, text)
+        recovered["json.loads"] += plain is not None
+        recovered["recover_json"] += fixed is not None
+        print(
+            f"{name:<32}{'ok' if plain is not None else 'fail':>12}"
+            f"{'ok' if fixed is not None else 'fail':>14}"
+            f"{_count_sections(fixed) if fixed else 0:>10}{ms:>8.3f}"
+        )
+    total = len(names)
+    for label, count in recovered.items():
+        print(f"{label}: {count}/{total} ({count / total * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
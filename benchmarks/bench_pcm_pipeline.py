@@ -0,0 +1,82 @@
+"""
+기존 MP3 병합 경로와 PCM 병합 경로의 병합 시간과 앱 프로세스 최대 메모리(tracemalloc)를 비교합니다.
+- mp3 decode: MP3 블록(44.1kHz, ElevenLabs 기본값) → merge_audio_blocks(stream_copy=False), 디코딩 후 재인코딩
+- pcm → mp3: WAV 블록(24kHz, ELEVENLABS_PCM_SAMPLE_RATE 기본값) → merge_pcm_blocks, 무음 제거/정규화/페이드 후 ffmpeg 표준 입력으로 한 번 인코딩
+- pcm → wav: 같은 처리 후 인코딩 없이 WAV로 반환
+블록은 앞뒤 300ms 무음이 있는 6~14초 톤입니다. ffmpeg 프로세스의 메모리는 포함하지 않습니다.
+
+실행: python -m benchmarks.bench_pcm_pipeline  (ffmpeg 필요)
+"""
+import io
+import time
+import tracemalloc
+
+import numpy as np
+from pydub import AudioSegment
+
+from core.audio_processor import AudioProcessor
+from core.pcm_audio import pcm_to_wav, to_int16
+from models.data_models import AudioBlock
+
+BLOCK_COUNTS = (10, 50, 200)
+BLOCK_SECONDS = (6.2, 8.9, 11.3, 13.7, 7.4, 9.8)
+PAD_SECONDS = 0.3
+
+
+def tone(seconds: float, frequency: float, sample_rate: int) -> np.ndarray:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pad = np.zeros(int(PAD_SECONDS * sample_rate))
+    return to_int16(np.concatenate([pad, 0.25 * np.sin(2 * np.pi * frequency * t), pad])[:, None])
+
+
+def make_sources():
+    mp3_sources, wav_sources = [], []
+    for i, seconds in enumerate(BLOCK_SECONDS):
+        frequency = 220 + 55 * i
+        mp3 = io.BytesIO()
+        AudioSegment(data=tone(seconds, frequency, 44100).tobytes(), sample_width=2, frame_rate=44100, channels=1).export(
+            mp3, format="mp3", bitrate="128k", parameters=["-write_xing", "0"]
+        )
+        mp3_sources.append(mp3.getvalue())
+        wav_sources.append(pcm_to_wav(tone(seconds, frequency, 24000).tobytes(), 24000))
+    return mp3_sources, wav_sources
+
+
+def measure(fn):
+    tracemalloc.start()
+    started = time.perf_counter()
+    audio, timestamps = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(audio), timestamps
+
+
+def main() -> None:
+    mp3_sources, wav_sources = make_sources()
+    processor = AudioProcessor()
+    for count in BLOCK_COUNTS:
+        sections_meta = [{"section_type": f"Section{i}"} for i in range(count)]
+        mp3_blocks = [
+            AudioBlock(section_index=i, text="", audio_data=mp3_sources[i % len(mp3_sources)]) for i in range(count)
+        ]
+        wav_blocks = [
+            AudioBlock(section_index=i, text="", audio_data=wav_sources[i % len(wav_sources)], audio_format="wav")
+            for i in range(count)
+        ]
+        runs = [
+            ("mp3 decode", lambda: processor.merge_audio_blocks(mp3_blocks, sections_meta, stream_copy=False)),
+            ("pcm -> mp3", lambda: processor.merge_pcm_blocks(wav_blocks, sections_meta)),
+            ("pcm -> wav", lambda: processor.merge_pcm_blocks(wav_blocks, sections_meta, output_format="wav")),
+        ]
+        print(f"{count} blocks:")
+        for name, fn in runs:
+            elapsed, peak, size, timestamps = measure(fn)
+            print(
+                f"  {name:<11} {elapsed:7.2f}s  peak {peak / 1024 / 1024:7.1f} MB  "
+                f"output {size / 1024 / 1024:6.1f} MB  length {timestamps[-1].end_time_seconds / 60:5.1f} min"
+            )
+
+
+if __name__ == "__main__":
+    main()
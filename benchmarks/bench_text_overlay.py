@@ -0,0 +1,98 @@
+"""
+1920x1080 합성 이미지에 한글 자막을 입히는 일괄 오버레이 처리량(장/초)을 측정합니다.
+- 폰트 로드: 매번 truetype 로드 vs (경로, 크기) 캐시
+- 줄바꿈: 기존 글자 수 추정(width*0.8/font_size) vs 측정 폭 기준에서 최대 폭을 넘는 줄 수
+- 오버레이당 추가 버퍼: 자막 영역 레이어 vs 기존 전체 프레임 RGBA 버퍼 3개
+- overlay_batch: 워커 1개 vs CPU 코어 수
+
+실행: OVERLAY_FONT_PATH=/path/to/NanumSquareRoundB.ttf python -m benchmarks.bench_text_overlay
+"""
+import os
+import random
+import tempfile
+import textwrap
+import time
+
+import numpy as np
+from PIL import Image, ImageFont
+
+from core.text_overlay import (
+    DEFAULT_FONT_SIZE,
+    MAX_LINE_RATIO,
+    TextOverlay,
+    load_font,
+    overlay_batch,
+    text_layer,
+    text_width,
+)
+
+IMAGES = 24
+SIZE = (1920, 1080)
+SAMPLE_TEXT = (
+    "태초에 하나님이 천지를 창조하시니라 땅이 혼돈하고 공허하며 흑암이 깊음 위에 있고 "
+    "하나님의 영은 수면 위에 운행하시니라 하나님이 이르시되 빛이 있으라 하시니 빛이 있었고"
+)
+
+
+def main() -> None:
+    overlay = TextOverlay()
+    font_path, font_size = overlay.font_path, DEFAULT_FONT_SIZE
+    print(f"font: {font_path}")
+
+    started = time.perf_counter()
+    for _ in range(20):
+        try:
+            ImageFont.truetype(font_path, font_size)
+        except IOError:
+            ImageFont.load_default(font_size)
+    print(f"font load per call: {(time.perf_counter() - started) / 20 * 1000:.2f} ms")
+    load_font(font_path, font_size)
+    started = time.perf_counter()
+    for _ in range(20):
+        load_font(font_path, font_size)
+    print(f"cached font lookup: {(time.perf_counter() - started) / 20 * 1_000_000:.2f} us")
+
+    max_width = SIZE[0] * MAX_LINE_RATIO
+    legacy = textwrap.fill(SAMPLE_TEXT, width=int(max_width / font_size)).split("\n")
+    measured = overlay.wrap(SAMPLE_TEXT, max_width)
+    font = load_font(font_path, font_size)
+    for name, lines in (("legacy estimate", legacy), ("measured", measured)):
+        overflow = sum(1 for line in lines if font.getlength(line) > max_width)
+        widest = max(font.getlength(line) for line in lines)
+        print(f"{name}: {len(lines)} lines, widest {widest:.0f}px / {max_width:.0f}px, {overflow} overflowing")
+    started = time.perf_counter()
+    for _ in range(1000):
+        text_width(SAMPLE_TEXT, font_path, font_size)
+    print(f"cached line width: {(time.perf_counter() - started):.3f} ms per line")
+
+    layer = text_layer(SAMPLE_TEXT, font_path, font_size, int(max_width))
+    # 레이어 + 합성용 영역 사본(RGBA) vs 기존: RGBA 변환본, 전체 크기 overlay, 합성 결과
+    region_bytes = layer.width * layer.height * 4 * 2
+    full_frame_bytes = SIZE[0] * SIZE[1] * 4 * 3
+    print(
+        f"overlay buffers: caption region {layer.width}x{layer.height} = {region_bytes / 1024:.0f} KB "
+        f"vs full-frame {full_frame_bytes / 1024 / 1024:.1f} MB"
+    )
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        for i in range(IMAGES):
+            path = os.path.join(tmp, f"{i:02d}.jpg")
+            gradient = np.linspace(0, 255, SIZE[0], dtype=np.uint8)[None, :, None]
+            pixels = np.broadcast_to(gradient, (SIZE[1], SIZE[0], 3)).copy()
+            pixels[:, :, i % 3] = rng.randrange(256)
+            Image.fromarray(pixels).save(path, quality=90)
+            words = SAMPLE_TEXT.split()
+            jobs.append((path, " ".join(words[: rng.randrange(6, len(words))]), os.path.join(tmp, f"{i:02d}_cap.jpg")))
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            report = overlay_batch(jobs, max_workers=workers)
+            print(
+                f"overlay_batch workers={report.workers}: {len(report.outputs)} images in "
+                f"{report.elapsed_seconds:.2f}s ({report.images_per_second:.1f} images/s, {len(report.errors)} errors)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+합성 성경 본문(약 31,000절)으로 VerseIndex 컴파일/첫 로드/조회 시간을 측정합니다.
+
+실행: python -m benchmarks.bench_verse_index
+"""
+import os
+import random
+import tempfile
+import time
+
+from core.verse_index import VerseIndex
+from utils.bible_data import BOOK_ORDER, CHAPTER_COUNTS
+
+VERSES_PER_CHAPTER = 26
+LOOKUPS = 100000
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "bible.txt")
+        keys = []
+        with open(source, "w", encoding="utf-8") as f:
+            for book in BOOK_ORDER:
+                for chapter in range(1, CHAPTER_COUNTS[book] + 1):
+                    for verse in range(1, VERSES_PER_CHAPTER + 1):
+                        f.write(f"{book}\t{chapter}\t{verse}\t{book} {chapter}장 {verse}절 본문입니다.\n")
+                        keys.append((book, chapter, verse))
+
+        index_dir = os.path.join(tmp, "index")
+        started = time.perf_counter()
+        count = VerseIndex(source, index_dir).compile()
+        print(f"compile: {count} verses in {time.perf_counter() - started:.2f}s")
+
+        index = VerseIndex(source, index_dir)
+        started = time.perf_counter()
+        index.get_verse(*keys[0])
+        print(f"first lookup (lazy load): {(time.perf_counter() - started) * 1000:.2f} ms")
+
+        sample = [random.choice(keys) for _ in range(LOOKUPS)]
+        started = time.perf_counter()
+        for key in sample:
+            index.get_verse(*key)
+        elapsed = time.perf_counter() - started
+        print(f"{LOOKUPS} lookups: {elapsed / LOOKUPS * 1_000_000:.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
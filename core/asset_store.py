@@ -0,0 +1,289 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+from core.thumbnails import THUMB_DIR_NAME
+from models.data_models import GcReport, ProjectState
+from utils.file_io import atomic_copy, atomic_write, file_sha256
+
+DEFAULT_ROOT = "output/Projects"
+BLOB_DIR_NAME = "_blobs"
+MANIFEST_FILE = "manifest.json"
+PROJECT_FILE = "project.json"
+ASSET_DIRS = ("images", "audio")
+# 이 시간 안에 사용(mark_active)됐거나 manifest가 갱신된 프로젝트는 용량 초과 정리에서 제외
+ACTIVE_PROJECT_SECONDS = 6 * 60 * 60
+
+# 같은 서버 프로세스의 모든 세션이 공유하는 활성 프로젝트 기록: 프로젝트 폴더 -> 마지막 사용 시각
+_active_projects: Dict[str, float] = {}
+_active_lock = threading.Lock()
+
+
+def mark_active(project_id: str, root: str = DEFAULT_ROOT) -> None:
+    """세션이 이 프로젝트를 사용 중임을 기록합니다 (다른 세션의 collect_garbage가 비우지 않도록)."""
+    with _active_lock:
+        _active_projects[os.path.normpath(os.path.join(root, project_id))] = time.time()
+
+
+def _recently_active(root: str, project_id: str, now: float, active_seconds: float) -> bool:
+    with _active_lock:
+        last_used = _active_projects.get(os.path.normpath(os.path.join(root, project_id)), 0.0)
+    return now - last_used < active_seconds
+
+
+class AssetStore:
+    """
+    프로젝트(project_id)별 이미지/오디오 저장소.
+    output/Projects/<project_id>/images, audio 아래에 임시 파일 → rename으로 원자적으로 쓰고,
+    내용이 같은 파일은 _blobs/<sha256>과 하드 링크로 연결하여 프로젝트 간 중복 저장을 없앱니다.
+    manifest.json에는 ProjectState가 참조하는 모든 파일이 기록되며 collect_garbage의 기준이 됩니다.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, project_id: str, root: str = DEFAULT_ROOT) -> None:
+        if not project_id or os.path.basename(project_id) != project_id or project_id.startswith("_"):
+            raise ValueError(f"Invalid project id: {project_id!r}")
+        self.project_id = project_id
+        self.root = root
+        self.project_dir = os.path.join(root, project_id)
+        self.image_dir = os.path.join(self.project_dir, "images")
+        self.audio_dir = os.path.join(self.project_dir, "audio")
+        self.blob_dir = os.path.join(root, BLOB_DIR_NAME)
+        for directory in (self.image_dir, self.audio_dir, self.blob_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    def write_bytes(self, relpath: str, data: bytes) -> str:
+        """프로젝트 폴더 기준 상대 경로(예: 'audio/01_Opening.mp3')에 원자적으로 쓰고 경로를 반환합니다."""
+        path = self._resolve(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, data)
+        self.dedupe(path)
+        return path
+
+    def import_file(self, source_path: str, relpath: str) -> str:
+        """다른 위치(캐시 등)의 파일을 프로젝트 폴더로 원자적으로 복사합니다."""
+        path = self._resolve(relpath)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_copy(source_path, path)
+        self.dedupe(path)
+        return path
+
+    def dedupe(self, path: str) -> bool:
+        """
+        같은 내용의 blob이 있으면 path를 그 blob의 하드 링크로 바꾸고, 없으면 path를 blob으로 등록합니다.
+        하드 링크를 지원하지 않는 파일 시스템에서는 아무것도 하지 않습니다.
+        Returns: 기존 blob과 합쳐져 디스크 공간을 절약했으면 True
+        """
+        try:
+            blob_path = os.path.join(self.blob_dir, file_sha256(path))
+            with self._lock:
+                if not os.path.exists(blob_path):
+                    os.link(path, blob_path)
+                    return False
+                if os.path.samefile(path, blob_path):
+                    return False
+                tmp_path = f"{path}.link.tmp"
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                os.link(blob_path, tmp_path)
+                os.replace(tmp_path, path)
+                return True
+        except OSError:
+            return False
+
+    def write_manifest(self, state: ProjectState) -> str:
+        """ProjectState가 참조하는 이미지/오디오 파일 목록을 manifest.json에 기록합니다."""
+        files = []
+        for path in referenced_paths(state):
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            files.append({"path": os.path.relpath(path, self.root), "bytes": size})
+        manifest = {
+            "project_id": self.project_id,
+            "bible_passage": state.bible_passage,
+            "updated_at": time.time(),
+            "files": files,
+        }
+        path = os.path.join(self.project_dir, MANIFEST_FILE)
+        atomic_write(path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+        return path
+
+    def _resolve(self, relpath: str) -> str:
+        path = os.path.normpath(os.path.join(self.project_dir, relpath))
+        if os.path.commonpath([path, os.path.normpath(self.project_dir)]) != os.path.normpath(self.project_dir):
+            raise ValueError(f"Path escapes project directory: {relpath}")
+        return path
+
+
+def referenced_paths(state: ProjectState) -> List[str]:
+    """ProjectState에서 디스크 파일을 가리키는 모든 경로 (이미지와 파생 비율 이미지, 섹션 오디오, 최종 오디오, 썸네일)"""
+    paths = []
+    if state.script:
+        for ip in state.script.all_image_prompts:
+            if ip.image_path:
+                paths.append(ip.image_path)
+            paths.extend(ip.variants.values())
+    for block in state.audio_blocks:
+        if block.audio_path:
+            paths.append(block.audio_path)
+    if state.final_audio_path:
+        paths.append(state.final_audio_path)
+    if state.youtube_metadata:
+        paths.extend(state.youtube_metadata.thumbnail_candidates)
+        if state.youtube_metadata.thumbnail_path:
+            paths.append(state.youtube_metadata.thumbnail_path)
+    return paths
+
+
+def collect_garbage(
+    root: str = DEFAULT_ROOT,
+    max_bytes: Optional[int] = None,
+    protect: Optional[Set[str]] = None,
+    grace_seconds: float = 600.0,
+    active_seconds: float = ACTIVE_PROJECT_SECONDS,
+) -> GcReport:
+    """
+    Mark & sweep 방식으로 프로젝트 자산을 정리합니다.
+    1) mark: 모든 manifest.json이 참조하는 파일
+       (manifest가 없거나 읽을 수 없으면 project.json의 ProjectState로 다시 만들고,
+        그것도 없으면 그 프로젝트는 정리 대상에서 제외 — manifest가 없다고 참조가 없는 것은 아님)
+    2) sweep: 프로젝트 images/audio 폴더에서 참조되지 않은 파일 삭제
+       (grace_seconds 이내에 만들어진 파일은 아직 manifest에 반영되지 않았을 수 있으므로 유지)
+    3) max_bytes를 넘으면 오래 갱신되지 않은 프로젝트부터 자산 폴더를 비움
+       (protect에 있거나, active_seconds 안에 어떤 세션이든 사용(mark_active)했거나 manifest가 갱신된 프로젝트는 제외)
+    4) 어떤 프로젝트도 링크하지 않는 blob 삭제
+    """
+    report = GcReport()
+    protect = protect or set()
+    if not os.path.isdir(root):
+        return report
+    now = time.time()
+
+    manifests: Dict[str, dict] = {}
+    unmanaged: List[str] = []
+    for project_id in os.listdir(root):
+        project_dir = os.path.join(root, project_id)
+        if project_id.startswith("_") or not os.path.isdir(project_dir):
+            continue
+        manifest = _read_manifest(root, project_id)
+        if manifest is None:
+            unmanaged.append(project_id)
+            report.skipped_projects.append(project_id)
+        else:
+            manifests[project_id] = manifest
+
+    marked = {
+        os.path.normpath(os.path.join(root, entry["path"]))
+        for manifest in manifests.values()
+        for entry in manifest.get("files", [])
+    }
+
+    # 참조 중인 이미지의 썸네일도 유지 (_thumbs/<stem>_<w>x<h>.jpg)
+    marked_stems = {
+        (os.path.dirname(path), os.path.splitext(os.path.basename(path))[0]) for path in marked
+    }
+
+    def is_marked(path: str) -> bool:
+        if path in marked:
+            return True
+        directory, filename = os.path.split(path)
+        if os.path.basename(directory) == THUMB_DIR_NAME:
+            stem = os.path.splitext(filename)[0].rsplit("_", 1)[0]
+            return (os.path.dirname(directory), stem) in marked_stems
+        return False
+
+    usage: Dict[str, int] = {}
+    for project_id in manifests:
+        usage[project_id] = 0
+        for path, st in _iter_assets(os.path.join(root, project_id)):
+            if is_marked(os.path.normpath(path)) or now - st.st_mtime < grace_seconds:
+                usage[project_id] += st.st_size
+                continue
+            if _remove(path):
+                report.removed_files += 1
+                report.freed_bytes += st.st_size
+
+    if max_bytes is not None:
+        total = sum(usage.values())
+        candidates = sorted(
+            (
+                pid for pid in manifests
+                if pid not in protect
+                and now - manifests[pid].get("updated_at", 0.0) >= active_seconds
+                and not _recently_active(root, pid, now, active_seconds)
+            ),
+            key=lambda pid: manifests[pid].get("updated_at", 0.0),
+        )
+        for project_id in candidates:
+            if total <= max_bytes:
+                break
+            for path, st in list(_iter_assets(os.path.join(root, project_id))):
+                if _remove(path):
+                    report.removed_files += 1
+                    report.freed_bytes += st.st_size
+                    total -= st.st_size
+            report.evicted_projects.append(project_id)
+
+    blob_dir = os.path.join(root, BLOB_DIR_NAME)
+    if os.path.isdir(blob_dir):
+        for name in os.listdir(blob_dir):
+            path = os.path.join(blob_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            # 링크 수 1 = blob 자신만 남음 (모든 프로젝트에서 삭제됨)
+            if st.st_nlink <= 1 and _remove(path):
+                report.removed_files += 1
+
+    report.total_bytes = sum(
+        st.st_size
+        for project_id in list(manifests) + unmanaged
+        for _, st in _iter_assets(os.path.join(root, project_id))
+    )
+    return report
+
+
+def _read_manifest(root: str, project_id: str) -> Optional[dict]:
+    """manifest.json을 읽고, 없거나 깨졌으면 project.json으로 다시 만듭니다. 둘 다 없으면 None."""
+    project_dir = os.path.join(root, project_id)
+    try:
+        with open(os.path.join(project_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(project_dir, PROJECT_FILE), "r", encoding="utf-8") as f:
+            state = ProjectState.model_validate_json(f.read())
+        path = AssetStore(project_id, root).write_manifest(state)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _iter_assets(project_dir: str):
+    for name in ASSET_DIRS:
+        directory = os.path.join(project_dir, name)
+        if not os.path.isdir(directory):
+            continue
+        for dirpath, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    yield path, os.stat(path)
+                except OSError:
+                    continue
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
@@ -1,78 +1,303 @@
 import io
+import subprocess
 import static_ffmpeg
-from typing import List, Tuple
+from typing import List, Optional, Sequence, Tuple
 
+import numpy as np
 from pydub import AudioSegment
+from pydub.exceptions import CouldntEncodeError
 
+from core.pcm_audio import apply_fades, mix_sections, normalize_gain, pcm_to_wav, read_wav, resample, to_int16, trim_silence
 from models.data_models import AudioBlock, TimestampedSection
 
 # ffmpeg 경로 자동 설정
 static_ffmpeg.add_paths()
 
+# 섹션 간 묵음 길이 (ms)
+SECTION_GAP_MS = 500
+# PCM 병합에서 블록 경계에 적용하는 페이드 길이 (ms)
+DEFAULT_CROSSFADE_MS = 10
+
+# MPEG 오디오 Layer III 프레임 헤더 표 (버전 비트: 0=MPEG2.5, 2=MPEG2, 3=MPEG1)
+_MP3_BITRATES_KBPS = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+_VBR_HEADER_MARKERS = (b"Xing", b"Info", b"VBRI")
+
+
+def _frame_info(data: bytes, pos: int) -> Optional[Tuple[int, int, int, int]]:
+    """
+    pos 위치의 Layer III 프레임 헤더를 해석합니다.
+    Returns: (프레임 길이(바이트), 프레임당 샘플 수, 샘플레이트, 채널 수) 또는 올바른 헤더가 아니면 None
+    """
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version = (data[pos + 1] >> 3) & 3
+    layer = (data[pos + 1] >> 1) & 3
+    bitrate_index = data[pos + 2] >> 4
+    sample_rate_index = (data[pos + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES_KBPS[3 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sample_rate_index]
+    padding = (data[pos + 2] >> 1) & 1
+    channels = 1 if data[pos + 3] >> 6 == 3 else 2
+    if version == 3:
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate, channels
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate, channels
+
+
+def parse_mp3_frames(data: bytes) -> Optional[Tuple[Tuple[int, int, int], int, int, int]]:
+    """
+    MP3 바이트에서 오디오 프레임 구간을 찾습니다 (ID3v2/ID3v1/APE 태그 제외).
+    디코더가 앞뒤를 잘라내는 Xing/Info/VBRI 헤더가 있거나, 프레임 사이에 알 수 없는 데이터가 있으면
+    디코딩 길이를 헤더만으로 확정할 수 없으므로 None을 반환합니다.
+    Returns: ((MPEG 버전 비트, 샘플레이트 인덱스, 모노 여부), 샘플 수, 시작 오프셋, 끝 오프셋)
+    """
+    start = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        start = 10 + size + (10 if data[5] & 0x10 else 0)
+    first = _frame_info(data, start)
+    if first is None:
+        return None
+    # 첫 프레임의 사이드 정보 뒤(또는 VBRI는 32바이트 뒤)에 VBR 헤더가 있는지 확인
+    side_info = (32 if first[3] == 2 else 17) if first[1] == 1152 else (17 if first[3] == 2 else 9)
+    header_end = start + 4 + (0 if data[start + 1] & 1 else 2)
+    if any(marker in data[header_end : header_end + max(side_info, 32) + 4] for marker in _VBR_HEADER_MARKERS):
+        return None
+
+    key = (data[start + 1] >> 3 & 3, data[start + 2] >> 2 & 3, data[start + 3] >> 6 == 3)
+    pos, samples = start, 0
+    while pos < len(data):
+        info = _frame_info(data, pos)
+        if info is None:
+            if data[pos : pos + 3] == b"TAG" or data[pos : pos + 8] == b"APETAGEX":
+                break
+            return None
+        frame_key = (data[pos + 1] >> 3 & 3, data[pos + 2] >> 2 & 3, data[pos + 3] >> 6 == 3)
+        if frame_key != key or pos + info[0] > len(data):
+            return None
+        pos += info[0]
+        samples += info[1]
+    return key, samples, start, pos
+
+
+def silent_mp3_frame(header: bytes) -> bytes:
+    """
+    header(실제 프레임의 4바이트 헤더)와 같은 형식의 무음 Layer III 프레임을 만듭니다.
+    사이드 정보를 모두 0으로 두면(part2_3_length=0, main_data_begin=0) 디코더는 무음을 출력합니다.
+    """
+    header = bytes((header[0], header[1] | 0x01, header[2] & 0xFD, header[3]))  # CRC 없음, 패딩 없음
+    frame_length = _frame_info(header + b"\0", 0)[0]
+    return header + bytes(frame_length - 4)
+
+
 class AudioProcessor:
     def __init__(self):
         # 섹션 간 0.5초(500ms) 묵음 추가
-        self.silence = AudioSegment.silent(duration=500)
+        self.silence = AudioSegment.silent(duration=SECTION_GAP_MS)
+        # 마지막 병합 방식: "stream_copy"(MP3 프레임 이어 붙이기), "decode"(디코딩 후 한 번 인코딩), "pcm"(merge_pcm_blocks)
+        self.last_merge_mode = ""
 
     def merge_audio_blocks(
-        self, blocks: List[AudioBlock], sections_metadata: List[dict]
+        self, blocks: List[AudioBlock], sections_metadata: List[dict], stream_copy: bool = True
     ) -> Tuple[bytes, List[TimestampedSection]]:
         """
         여러 오디오 블록을 순서대로 병합하고 타임스탬프를 계산합니다.
-        
+        모든 블록이 같은 형식(MPEG 버전, 샘플레이트, 채널)의 MP3이면 프레임을 그대로 이어 붙이고(재인코딩 없음),
+        아니면 각 블록을 한 번씩 디코딩해 PCM을 한 번에 이어 붙인 뒤 한 번만 인코딩합니다.
+        두 방식 모두 타임스탬프는 블록 길이(ms) + 500ms 간격으로 같게 계산됩니다.
+
         Args:
             blocks: 생성된 AudioBlock 리스트
             sections_metadata: ScriptSection 정보 (section_type 등)
-            
+            stream_copy: False이면 항상 디코딩 경로 사용
+
         Returns:
             (final_audio_bytes, timestamps_list)
         """
-        final_audio = AudioSegment.empty()
-        timestamps = []
-        current_time_ms = 0.0
-
         # 블록을 인덱스 순서대로 정렬
-        sorted_blocks = sorted(blocks, key=lambda x: x.section_index)
+        sorted_blocks = [b for b in sorted(blocks, key=lambda x: x.section_index) if b.audio_data]
 
-        for block in sorted_blocks:
-            if not block.audio_data:
-                continue
+        if stream_copy:
+            parsed = [parse_mp3_frames(block.audio_data) for block in sorted_blocks]
+            if parsed and all(p is not None and p[0] == parsed[0][0] for p in parsed):
+                self.last_merge_mode = "stream_copy"
+                return self._merge_frames(sorted_blocks, parsed, sections_metadata)
+        self.last_merge_mode = "decode"
+        return self._merge_decoded(sorted_blocks, sections_metadata)
 
+    def _merge_decoded(
+        self, blocks: Sequence[AudioBlock], sections_metadata: List[dict]
+    ) -> Tuple[bytes, List[TimestampedSection]]:
+        decoded = []
+        for block in blocks:
             # bytes -> AudioSegment 변환
             try:
-                segment = AudioSegment.from_mp3(io.BytesIO(block.audio_data))
+                decoded.append((block, AudioSegment.from_file(io.BytesIO(block.audio_data), format=block.audio_format)))
             except Exception:
                 # MP3 디코딩 실패 시 건너뛰기 혹은 에러 처리
                 continue
+        timestamps = _build_timestamps([(block, len(segment)) for block, segment in decoded], sections_metadata)
+        if not decoded:
+            return b"", timestamps
 
-            duration_ms = len(segment)
-            
-            # 타임스탬프 기록 (초 단위)
-            start_sec = current_time_ms / 1000.0
-            end_sec = (current_time_ms + duration_ms) / 1000.0
-            
-            # 해당 블록의 섹션 타입 찾기
-            section_type = "Unknown"
-            if 0 <= block.section_index < len(sections_metadata):
-                section_type = sections_metadata[block.section_index].get(
-                    "section_type", "Unknown"
-                )
-
-            timestamps.append(TimestampedSection(
-                section_type=section_type,
-                start_time_seconds=start_sec,
-                end_time_seconds=end_sec
-            ))
-
-            # 오디오 병합
-            final_audio += segment
-            final_audio += self.silence # 섹션 간 간격 추가
-            current_time_ms += duration_ms + 500 # 묵음 시간 포함
+        # AudioSegment 덧셈(_sync)과 같은 기준으로 형식을 맞춤 (묵음: 모노, 16bit, 11025Hz)
+        segments = [segment for _, segment in decoded]
+        channels = max(max(s.channels for s in segments), self.silence.channels)
+        frame_rate = max(max(s.frame_rate for s in segments), self.silence.frame_rate)
+        sample_width = max(max(s.sample_width for s in segments), self.silence.sample_width)
+        gap = bytes(int(frame_rate * SECTION_GAP_MS / 1000) * channels * sample_width)
 
-        # Export to bytes (MP3)
-        if len(final_audio) == 0:
-            return b"", timestamps
+        # += 누적은 매번 지금까지의 버퍼 전체를 복사하므로(O(n²)) 조각을 모아 한 번에 이어 붙임
+        parts = []
+        for segment in segments:
+            parts.append(segment.set_channels(channels).set_frame_rate(frame_rate).set_sample_width(sample_width).raw_data)
+            parts.append(gap)  # 섹션 간 간격 추가
+        final_audio = AudioSegment(
+            data=b"".join(parts), sample_width=sample_width, frame_rate=frame_rate, channels=channels
+        )
 
+        # Export to bytes (MP3)
         buffer = io.BytesIO()
         final_audio.export(buffer, format="mp3")
-        return buffer.getvalue(), timestamps
\ No newline at end of file
+        return buffer.getvalue(), timestamps
+
+    def _merge_frames(
+        self,
+        blocks: Sequence[AudioBlock],
+        parsed: Sequence[Tuple[Tuple[int, int, int], int, int, int]],
+        sections_metadata: List[dict],
+    ) -> Tuple[bytes, List[TimestampedSection]]:
+        first_data, first_start = blocks[0].audio_data, parsed[0][2]
+        _, samples_per_frame, sample_rate, _ = _frame_info(first_data, first_start)
+        silence_frame = silent_mp3_frame(first_data[first_start : first_start + 4])
+
+        # pydub len()과 같은 방식으로 ms 단위 길이 계산 (디코딩 경로와 같은 타임스탬프)
+        durations = [round(1000 * (samples / sample_rate)) for _, samples, _, _ in parsed]
+        timestamps = _build_timestamps(list(zip(blocks, durations)), sections_metadata)
+
+        # 묵음은 프레임 단위(1152샘플 ≈ 26ms)로만 넣을 수 있으므로, 매 간격마다 실제 위치가
+        # 타임스탬프 기준 위치에 가장 가깝도록 프레임 수를 골라 오차가 누적되지 않게 함 (최대 반 프레임)
+        parts = []
+        emitted_samples = 0
+        nominal_ms = 0
+        for block, (_, samples, start, end), duration_ms in zip(blocks, parsed, durations):
+            parts.append(memoryview(block.audio_data)[start:end])
+            emitted_samples += samples
+            nominal_ms += duration_ms + SECTION_GAP_MS
+            gap_frames = max(0, round((nominal_ms * sample_rate / 1000 - emitted_samples) / samples_per_frame))
+            parts.append(silence_frame * gap_frames)
+            emitted_samples += gap_frames * samples_per_frame
+        return b"".join(parts), timestamps
+
+    def merge_pcm_blocks(
+        self,
+        blocks: List[AudioBlock],
+        sections_metadata: List[dict],
+        gap_ms: int = SECTION_GAP_MS,
+        trim: bool = True,
+        normalize: bool = True,
+        crossfade_ms: int = DEFAULT_CROSSFADE_MS,
+        output_format: str = "mp3",
+    ) -> Tuple[bytes, List[TimestampedSection]]:
+        """
+        블록을 NumPy 배열(PCM)로 한 번씩 읽어 앞뒤 무음 제거, 음량 정규화, 경계 페이드를 벡터 연산으로 적용하고
+        gap_ms 간격으로 이어 붙인 뒤 마지막에 한 번만 인코딩합니다 (WAV 블록이면 손실 인코딩은 이 한 번뿐).
+        타임스탬프는 무음을 잘라낸 실제 배치 위치 기준입니다.
+        output_format: "mp3"이면 ffmpeg로 인코딩, "wav"이면 인코딩 없이 WAV로 반환
+        """
+        self.last_merge_mode = "pcm"
+        processed = []
+        for block in sorted(blocks, key=lambda x: x.section_index):
+            if not block.audio_data:
+                continue
+            try:
+                samples, sample_rate = decode_block(block)
+            except Exception:
+                continue
+            if trim:
+                samples = trim_silence(samples, sample_rate)
+            if normalize:
+                samples = normalize_gain(samples)
+            # 처리가 끝난 블록은 int16으로 보관 (float32의 절반)
+            processed.append((block, to_int16(apply_fades(samples, sample_rate * crossfade_ms // 1000)), sample_rate))
+        if not processed:
+            return b"", []
+
+        sample_rate = max(rate for _, _, rate in processed)
+        arrays = [
+            samples if rate == sample_rate else to_int16(resample(samples / np.float32(32768.0), rate, sample_rate))
+            for _, samples, rate in processed
+        ]
+        mixed, spans = mix_sections(arrays, sample_rate, gap_ms, crossfade_ms)
+        timestamps = [
+            TimestampedSection(
+                section_type=_section_type(block, sections_metadata),
+                start_time_seconds=start / sample_rate,
+                end_time_seconds=end / sample_rate,
+            )
+            for (block, _, _), (start, end) in zip(processed, spans)
+        ]
+        del processed, arrays
+
+        if output_format == "wav":
+            return pcm_to_wav(mixed.tobytes(), sample_rate, mixed.shape[1]), timestamps
+        return _encode_pcm(mixed, sample_rate, output_format), timestamps
+
+
+def decode_block(block: AudioBlock) -> Tuple[np.ndarray, int]:
+    """AudioBlock을 (샘플 수, 채널 수) 모양의 -1~1 float32 배열과 샘플레이트로 디코딩합니다."""
+    if block.audio_format == "wav":
+        try:
+            return read_wav(block.audio_data)
+        except ValueError:
+            pass  # 16bit가 아닌 WAV는 pydub로 읽음
+    segment = AudioSegment.from_file(io.BytesIO(block.audio_data), format=block.audio_format)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32).reshape(-1, segment.channels)
+    return samples / float(1 << (8 * segment.sample_width - 1)), segment.frame_rate
+
+
+def _encode_pcm(pcm: np.ndarray, sample_rate: int, output_format: str) -> bytes:
+    """
+    int16 배열을 복사 없이 ffmpeg 표준 입력으로 흘려 보내고 표준 출력에서 인코딩 결과를 받습니다.
+    (pydub export처럼 WAV 사본과 임시 파일을 만들지 않음)
+    """
+    command = [
+        AudioSegment.converter, "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", str(pcm.shape[1]), "-i", "pipe:0",
+        "-f", output_format, "pipe:1",
+    ]
+    result = subprocess.run(command, input=memoryview(np.ascontiguousarray(pcm)).cast("B"), capture_output=True)
+    if result.returncode != 0:
+        raise CouldntEncodeError(
+            f"Encoding failed. ffmpeg returned error code: {result.returncode}\n\n{result.stderr.decode(errors='replace')}"
+        )
+    return result.stdout
+
+
+def _section_type(block: AudioBlock, sections_metadata: List[dict]) -> str:
+    # 해당 블록의 섹션 타입 찾기
+    if 0 <= block.section_index < len(sections_metadata):
+        return sections_metadata[block.section_index].get("section_type", "Unknown")
+    return "Unknown"
+
+
+def _build_timestamps(
+    durations: Sequence[Tuple[AudioBlock, int]], sections_metadata: List[dict]
+) -> List[TimestampedSection]:
+    """(블록, 길이 ms) 목록으로 섹션별 시작/끝 시간(초)을 계산합니다. 섹션 사이에는 500ms 간격이 들어갑니다."""
+    timestamps = []
+    current_time_ms = 0.0
+    for block, duration_ms in durations:
+        # 타임스탬프 기록 (초 단위)
+        timestamps.append(TimestampedSection(
+            section_type=_section_type(block, sections_metadata),
+            start_time_seconds=current_time_ms / 1000.0,
+            end_time_seconds=(current_time_ms + duration_ms) / 1000.0,
+        ))
+        current_time_ms += duration_ms + SECTION_GAP_MS  # 묵음 시간 포함
+    return timestamps
@@ -0,0 +1,110 @@
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
+
+from core.rate_limiter import TokenBucket
+from core.script_generator import ScriptGenerator
+from models.data_models import BibleReference, BulkRunReport, ChapterJobResult, ProjectState
+from utils.bible_data import get_chapter_count
+
+
+class BulkScriptGenerator:
+    """
+    한 책의 여러 장을 병렬로 대본 생성하여 장별 프로젝트 파일로 저장합니다.
+    동시 실행 수(max_workers)와 분당 토큰 한도(tokens_per_minute)로 호출량을 제한합니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        tokens_per_minute: int = 80000,
+        output_dir: str = "output/Projects",
+        force_refresh: bool = False,
+        output_mode: str = "json",
+        defer_english: bool = False,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.limiter = TokenBucket(tokens_per_minute)
+        self.output_dir = output_dir
+        self.force_refresh = force_refresh
+        self.output_mode = output_mode
+        self.defer_english = defer_english
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @staticmethod
+    def validate_range(book: str, start_chapter: int, end_chapter: int) -> None:
+        chapter_count = get_chapter_count(book)
+        if chapter_count == 0:
+            raise ValueError(f"알 수 없는 성경 책입니다: {book}")
+        if not 1 <= start_chapter <= end_chapter <= chapter_count:
+            raise ValueError(
+                f"{book}의 장 범위가 올바르지 않습니다: {start_chapter}-{end_chapter} (1-{chapter_count})"
+            )
+
+    def iter_run(
+        self, book: str, start_chapter: int, end_chapter: int
+    ) -> Iterator[ChapterJobResult]:
+        """장별 결과를 완료된 순서대로 반환합니다."""
+        self.validate_range(book, start_chapter, end_chapter)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._generate_chapter, book, chapter)
+                for chapter in range(start_chapter, end_chapter + 1)
+            ]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self, book: str, start_chapter: int, end_chapter: int) -> BulkRunReport:
+        started = time.perf_counter()
+        report = BulkRunReport(book=book, start_chapter=start_chapter, end_chapter=end_chapter)
+        for result in self.iter_run(book, start_chapter, end_chapter):
+            report.results.append(result)
+        report.results.sort(key=lambda r: r.chapter)
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    def estimate_tokens(system_prompt: str) -> int:
+        """요청 1회당 예상 토큰 (실제로 보내는 시스템 프롬프트 입력 + 최대 출력)"""
+        return len(system_prompt) // 3 + 8000
+
+    @staticmethod
+    def get_project_id(book: str, chapter: int) -> str:
+        safe_book = re.sub(r"[^A-Za-z0-9가-힣_-]", "", book)
+        return f"{safe_book}_{chapter:03d}"
+
+    def get_project_path(self, book: str, chapter: int) -> str:
+        # 프로젝트 자산 폴더(AssetStore)와 같은 output/Projects/<project_id>/ 아래에 저장
+        return os.path.join(self.output_dir, self.get_project_id(book, chapter), "project.json")
+
+    def _generate_chapter(self, book: str, chapter: int) -> ChapterJobResult:
+        reference = BibleReference(book=book, chapter=chapter).display
+        result = ChapterJobResult(book=book, chapter=chapter, bible_reference=reference)
+        started = time.perf_counter()
+        try:
+            # 스레드마다 별도 인스턴스 사용 (last_cache_hit 등 상태 공유 방지)
+            generator = ScriptGenerator(output_mode=self.output_mode, defer_english=self.defer_english)
+            # 캐시 적중이 예상되면 토큰 한도를 소비하지 않음
+            if self.force_refresh or not generator.is_cached(reference):
+                self.limiter.acquire(self.estimate_tokens(generator.system_prompt))
+            script = generator.generate_script(reference, force_refresh=self.force_refresh)
+
+            project_path = self.get_project_path(book, chapter)
+            os.makedirs(os.path.dirname(project_path), exist_ok=True)
+            state = ProjectState(
+                project_id=self.get_project_id(book, chapter), bible_passage=reference, script=script
+            )
+            tmp_path = f"{project_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(state.model_dump_json(indent=2))
+            os.replace(tmp_path, project_path)
+
+            result.success = True
+            result.cache_hit = generator.last_cache_hit
+            result.project_path = project_path
+        except Exception as e:
+            result.error = str(e)
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
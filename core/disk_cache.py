@@ -0,0 +1,106 @@
+import abc
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from utils.file_io import atomic_write
+
+
+class DiskLRUCache(abc.ABC):
+    """
+    한 폴더에 키별 파일로 저장하는 디스크 캐시의 공통 부분.
+    - LRU: 조회할 때 mtime을 갱신하고, 용량(max_entries/max_bytes) 초과 시 mtime이 오래된 항목부터 삭제
+    - _stats.json: 적중/미적중 횟수
+    하위 클래스는 _find(key)와 _is_entry(파일 이름)를 구현합니다.
+    """
+
+    STATS_FILE = "_stats.json"
+    # 여러 인스턴스(일괄 생성 워커 등)가 같은 디렉터리를 공유하므로 클래스 단위 잠금 (하위 클래스별로 재정의)
+    _lock = threading.Lock()
+
+    def __init__(self, cache_dir: str, max_entries: int, max_bytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def contains(self, key: str) -> bool:
+        """통계/LRU 순서를 건드리지 않고 항목 존재 여부만 확인합니다."""
+        return self._find(key) is not None
+
+    def clear(self) -> None:
+        for path, _, _ in self._list_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, float]:
+        counters = self._read_stats()
+        entries = self._list_entries()
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+            "entries": len(entries),
+            "bytes": sum(size for _, _, size in entries),
+        }
+
+    @abc.abstractmethod
+    def _find(self, key: str) -> Optional[str]:
+        """key에 해당하는 항목 파일 경로. 없으면 None."""
+
+    @abc.abstractmethod
+    def _is_entry(self, name: str) -> bool:
+        """캐시 폴더의 파일 이름이 이 캐시의 항목인지 여부"""
+
+    def _touch(self, path: str) -> None:
+        # LRU 순서 갱신 (mtime 기준)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    def _list_entries(self) -> List[Tuple[str, float, int]]:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name == self.STATS_FILE or not self._is_entry(name):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_mtime, st.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = sorted(self._list_entries(), key=lambda e: e[1])
+            total_bytes = sum(size for _, _, size in entries)
+            while entries and (
+                len(entries) > self.max_entries or total_bytes > self.max_bytes
+            ):
+                path, _, size = entries.pop(0)
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                total_bytes -= size
+
+    def _read_stats(self) -> Dict[str, int]:
+        try:
+            with open(os.path.join(self.cache_dir, self.STATS_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _bump(self, counter: str) -> None:
+        with self._lock:
+            counters = self._read_stats()
+            counters[counter] = counters.get(counter, 0) + 1
+            atomic_write(os.path.join(self.cache_dir, self.STATS_FILE), json.dumps(counters))
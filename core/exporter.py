@@ -3,7 +3,7 @@ import os
 import re
 import zipfile
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from models.data_models import ScriptData, TimestampedSection
 
@@ -14,10 +14,12 @@ def build_zip_package(
     final_audio_bytes: Optional[bytes],
     srt_content: str,
     timestamps: Optional[List[TimestampedSection]] = None,
+    captioned_images: Optional[Dict[str, str]] = None,
 ) -> bytes:
     """
     모든 생성물을 하나의 ZIP 파일로 압축하여 바이트로 반환합니다.
     이미지는 ScriptData의 image_prompts에서 가져옵니다.
+    captioned_images: {원본 이미지 경로: 자막을 입힌 이미지 경로} (Images_Captioned/에 저장)
     """
     folder_name = _safe_folder_name(bible_reference)
     date_str = datetime.now().strftime("%Y%m%d")
@@ -38,8 +40,19 @@ def build_zip_package(
             for j, ip in enumerate(section.image_prompts):
                 if ip.image_path and os.path.exists(ip.image_path):
                     filename = _build_image_filename(global_idx + 1, section.section_type, j, ts)
-                    with open(ip.image_path, "rb") as f:
-                        zf.writestr(f"{root}/Images/{filename}", f.read())
+                    filename += os.path.splitext(ip.image_path)[1].lower() or ".png"
+                    # 이미 압축된 형식이므로 다시 deflate하지 않고 그대로 저장
+                    zf.write(ip.image_path, f"{root}/Images/{filename}", compress_type=zipfile.ZIP_STORED)
+                    captioned = (captioned_images or {}).get(ip.image_path)
+                    if captioned and os.path.exists(captioned):
+                        zf.write(captioned, f"{root}/Images_Captioned/{filename}", compress_type=zipfile.ZIP_STORED)
+                    for ratio, variant_path in ip.variants.items():
+                        if os.path.exists(variant_path):
+                            zf.write(
+                                variant_path,
+                                f"{root}/Images_{ratio.replace(':', 'x')}/{filename}",
+                                compress_type=zipfile.ZIP_STORED,
+                            )
                 global_idx += 1
 
     zip_buffer.seek(0)
@@ -64,7 +77,7 @@ def _build_image_filename(
         seconds = total % 60
 
     safe_section = re.sub(r"[^A-Za-z0-9가-힣_-]", "", section_type)
-    return f"{minutes:02d}_{seconds:02d}_{index:02d}_{safe_section}.png"
+    return f"{minutes:02d}_{seconds:02d}_{index:02d}_{safe_section}"
 
 
 def _safe_folder_name(text: str) -> str:
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+from core.image_generator import ImageGenerator
+from core.rate_limiter import AdaptiveTokenBucket
+from core.resilience import is_rate_limit_error
+from models.data_models import ImageBatchReport, ImageJob, ImageJobResult, ScriptData
+
+
+def _file_size(path: Optional[str]) -> int:
+    try:
+        return os.path.getsize(path) if path else 0
+    except OSError:
+        return 0
+
+
+def build_image_jobs(script: ScriptData, image_generator: ImageGenerator) -> List[ImageJob]:
+    """아직 생성되지 않은 이미지 프롬프트를 갤러리 순서대로 작업 목록으로 만듭니다."""
+    jobs = []
+    index = 0
+    for i, section in enumerate(script.sections):
+        for j, ip in enumerate(section.image_prompts):
+            if not (ip.generated and ip.image_path):
+                jobs.append(
+                    ImageJob(
+                        index=index,
+                        section_index=i,
+                        prompt_index=j,
+                        prompt=f"{script.art_style}. {ip.prompt_english}",
+                        filename=image_generator.get_output_path(index, section.section_type, j),
+                    )
+                )
+            index += 1
+    return jobs
+
+
+class ImageBatchGenerator:
+    """
+    여러 이미지를 스레드 풀로 동시에 생성합니다.
+    분당 요청 수는 AdaptiveTokenBucket으로 제한하며, 429/할당량 오류를 받으면
+    속도를 절반으로 줄이고 지수 백오프 후 재시도합니다.
+    같은 배치 안의 동일 프롬프트는 한 번만 생성하고, 이미지 캐시 적중은 속도 제한을 소비하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        images_per_minute: float = 20,
+        max_retries: int = 4,
+        base_backoff: float = 2.0,
+        image_generator: Optional[ImageGenerator] = None,
+    ) -> None:
+        self.max_workers = max(1, max_workers)
+        self.limiter = AdaptiveTokenBucket(images_per_minute, capacity=self.max_workers)
+        self.max_retries = max(0, max_retries)
+        self.base_backoff = base_backoff
+        self.image_generator = image_generator if image_generator is not None else ImageGenerator()
+        self.rate_limit_hits = 0
+        self._hits_lock = threading.Lock()
+
+    def iter_run(self, jobs: List[ImageJob]) -> Iterator[ImageJobResult]:
+        """작업 결과를 완료된 순서대로 반환합니다."""
+        if not jobs:
+            return
+        # 캐시 키가 같은 작업은 첫 작업만 생성하고 나머지는 그 결과를 복사
+        leaders: List[ImageJob] = []
+        followers: Dict[str, List[ImageJob]] = {}
+        for job in jobs:
+            key = self.image_generator.cache_key(job.prompt)
+            if key in followers:
+                followers[key].append(job)
+            else:
+                followers[key] = []
+                leaders.append(job)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(leaders))) as executor:
+            futures = {executor.submit(self._generate, job): job for job in leaders}
+            for future in as_completed(futures):
+                result = future.result()
+                yield result
+                key = self.image_generator.cache_key(futures[future].prompt)
+                for job in followers[key]:
+                    yield self._copy_result(job, result)
+
+    def run(self, jobs: List[ImageJob]) -> ImageBatchReport:
+        started = time.perf_counter()
+        report = ImageBatchReport()
+        for result in self.iter_run(jobs):
+            report.results.append(result)
+        report.results.sort(key=lambda r: r.index)
+        report.elapsed_seconds = time.perf_counter() - started
+        report.rate_limit_hits = self.rate_limit_hits
+        return report
+
+    def _generate(self, job: ImageJob) -> ImageJobResult:
+        result = ImageJobResult(
+            index=job.index, section_index=job.section_index, prompt_index=job.prompt_index
+        )
+        started = time.perf_counter()
+        # 캐시 적중은 API를 호출하지 않으므로 속도 제한 없이 바로 처리
+        if self.image_generator.is_cached(job.prompt):
+            try:
+                result.image_path = self.image_generator.generate_image(job.prompt, job.filename)
+                result.success = True
+                result.cache_hit = True
+                result.file_bytes = _file_size(result.image_path)
+                result.elapsed_seconds = time.perf_counter() - started
+                return result
+            except Exception:
+                pass
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            result.attempts = attempt + 1
+            try:
+                result.image_path = self.image_generator.generate_image(job.prompt, job.filename)
+                result.success = True
+                result.error = None
+                saved = self.image_generator.save_log.get(result.image_path, {})
+                result.save_seconds = saved.get("save_seconds", 0.0)
+                self.limiter.reward()
+                break
+            except Exception as e:
+                result.error = str(e)
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    break
+                with self._hits_lock:
+                    self.rate_limit_hits += 1
+                backoff = self.base_backoff * (2 ** attempt)
+                self.limiter.penalize(cooldown=backoff)
+        if result.success:
+            result.file_bytes = _file_size(result.image_path)
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+    def _copy_result(self, job: ImageJob, source: ImageJobResult) -> ImageJobResult:
+        result = ImageJobResult(
+            index=job.index,
+            section_index=job.section_index,
+            prompt_index=job.prompt_index,
+            deduplicated=True,
+        )
+        if not source.success:
+            result.error = source.error
+            return result
+        try:
+            result.image_path = self.image_generator.copy_image(source.image_path, job.filename)
+            result.file_bytes = source.file_bytes
+            result.success = True
+        except OSError as e:
+            result.error = str(e)
+        return result
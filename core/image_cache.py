@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from core.disk_cache import DiskLRUCache
+from utils.file_io import atomic_copy
+
+# 캐시에 저장하는 이미지 확장자 (저장 형식이 바뀌어도 같은 키로 조회)
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+class ImageCache(DiskLRUCache):
+    """
+    생성된 이미지를 (모델, 화면 비율, 전체 프롬프트) 해시로 저장하는 콘텐츠 주소 캐시.
+    같은 스타일+프롬프트가 다른 프로젝트에서 다시 요청되면 API 호출 없이 파일을 복사합니다.
+    용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제합니다 (LRU).
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: str = "output/Cache/images",
+        max_entries: int = 2000,
+        max_bytes: int = 1024 * 1024 * 1024,
+    ) -> None:
+        super().__init__(cache_dir, max_entries, max_bytes)
+
+    @staticmethod
+    def make_key(model_name: str, aspect_ratio: str, full_prompt: str) -> str:
+        raw = json.dumps([model_name, aspect_ratio, full_prompt.strip()], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 이미지 경로를 반환합니다. 없으면 None."""
+        path = self._find(key)
+        if path is None:
+            self._bump("misses")
+            return None
+        self._touch(path)
+        self._bump("hits")
+        return path
+
+    def put(self, key: str, image_path: str) -> str:
+        """image_path의 파일을 캐시에 복사하고 캐시 내 경로를 반환합니다."""
+        ext = os.path.splitext(image_path)[1].lower() or ".png"
+        dest = os.path.join(self.cache_dir, f"{key}{ext}")
+        atomic_copy(image_path, dest)
+        self._evict()
+        return dest
+
+    def _find(self, key: str) -> Optional[str]:
+        for ext in IMAGE_EXTENSIONS:
+            path = os.path.join(self.cache_dir, f"{key}{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _is_entry(self, name: str) -> bool:
+        return os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
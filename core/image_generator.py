@@ -1,58 +1,214 @@
 import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
 from google import genai
 from google.genai import types
 from PIL import Image
 import io
 
-from utils.config import load_env, require_env
+from core.asset_store import AssetStore
+from core.image_cache import ImageCache
+from core.resilience import get_guard, is_rate_limit_error, is_transient_error
+from utils.config import get_env, load_env, require_env
+
+# save_log에 보관하는 최근 저장 기록 수 (생성기가 세션에 남아 있으므로 상한을 둠)
+SAVE_LOG_MAX_ENTRIES = 256
+
+# 저장 코덱: 이름 -> (확장자, MIME 타입, PIL 포맷)
+IMAGE_CODECS = {
+    "png": (".png", "image/png", "PNG"),
+    "webp": (".webp", "image/webp", "WEBP"),
+    "jpeg": (".jpg", "image/jpeg", "JPEG"),
+}
+_MIME_TO_CODEC = {mime: name for name, (_, mime, _) in IMAGE_CODECS.items()}
+_EXT_TO_MIME = {ext: mime for ext, mime, _ in IMAGE_CODECS.values()}
+_EXT_TO_MIME[".jpeg"] = "image/jpeg"
+
+
+def image_mime_type(path: str) -> str:
+    """파일 확장자로 이미지 MIME 타입을 반환합니다 (다운로드 버튼 등)."""
+    return _EXT_TO_MIME.get(os.path.splitext(path)[1].lower(), "application/octet-stream")
 
 
 class ImageGenerator:
-    def __init__(self):
+    def __init__(
+        self,
+        cache: Optional[ImageCache] = None,
+        use_cache: bool = True,
+        storage_codec: Optional[str] = None,
+        storage_quality: Optional[int] = None,
+        asset_store: Optional[AssetStore] = None,
+        hedge: Optional[bool] = None,
+    ):
+        """
+        storage_codec: "auto"(API가 준 형식 그대로 저장) / "png" / "webp" / "jpeg"
+                       기본값은 IMAGE_STORAGE_CODEC 환경 변수, 없으면 "auto"
+        storage_quality: webp/jpeg 품질 (기본값 IMAGE_STORAGE_QUALITY 또는 90)
+        asset_store: 지정하면 공용 output/Images 대신 프로젝트 자산 폴더(images/)에 저장하고
+                     같은 내용의 파일을 하드 링크로 중복 제거합니다.
+        hedge: True이면 최근 p95 소요 시간 안에 응답이 없을 때 같은 요청을 한 번 더 보냅니다
+               (기본값 IMAGE_HEDGE_REQUESTS=1 환경 변수, 없으면 사용 안 함)
+        """
         load_env()
         self.api_key = require_env("GOOGLE_API_KEY")
-        self.client = genai.Client(api_key=self.api_key)
+        # 429는 ImageBatchGenerator의 적응형 속도 제한이 재시도하므로 여기서는 시간 초과/5xx만 재시도
+        self.guard = get_guard(
+            "gemini_image",
+            retry_if=lambda e: is_transient_error(e) and not is_rate_limit_error(e),
+        )
+        self.client = genai.Client(
+            api_key=self.api_key,
+            http_options=types.HttpOptions(timeout=int(self.guard.timeout * 1000)),
+        )
+        self.hedge = hedge if hedge is not None else get_env("IMAGE_HEDGE_REQUESTS", "0") == "1"
         self.model_name = "gemini-3-pro-image-preview"
+        self.aspect_ratio = "16:9"
+        self.cache = cache if cache is not None else (ImageCache() if use_cache else None)
+        self.storage_codec = (storage_codec or get_env("IMAGE_STORAGE_CODEC", "auto")).lower()
+        if self.storage_codec != "auto" and self.storage_codec not in IMAGE_CODECS:
+            raise ValueError(f"Unknown image storage codec: {self.storage_codec}")
+        self.storage_quality = int(storage_quality or get_env("IMAGE_STORAGE_QUALITY", "90"))
+        # 최근 저장 경로별 {bytes, save_seconds, codec, transcoded} (배치 생성 시 여러 스레드에서 기록)
+        # SAVE_LOG_MAX_ENTRIES개를 넘으면 오래된 기록부터 버림
+        self.save_log: "OrderedDict[str, dict]" = OrderedDict()
+        self._log_lock = threading.Lock()
 
-        self.output_dir = "output/Images"
+        self.asset_store = asset_store
+        self.output_dir = asset_store.image_dir if asset_store is not None else "output/Images"
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def generate_image(self, prompt: str, filename: str) -> str:
+    def cache_key(self, prompt: str) -> str:
+        return ImageCache.make_key(self.model_name, self.aspect_ratio, prompt)
+
+    def is_cached(self, prompt: str) -> bool:
+        """API 호출 없이 캐시에서 바로 만들 수 있는지 확인합니다."""
+        return self.cache is not None and self.cache.contains(self.cache_key(prompt))
+
+    def generate_image(self, prompt: str, filename: str, force_refresh: bool = False) -> str:
         """
         Google GenAI (Imagen 3)를 사용하여 이미지를 생성하고 저장합니다.
+        같은 (모델, 비율, 프롬프트) 이미지가 캐시에 있으면 API 호출 없이 복사합니다.
+        force_refresh=True이면 캐시를 무시하고 새로 생성한 뒤 캐시를 갱신합니다 (재생성 버튼용).
+        저장 형식에 따라 filename의 확장자는 실제 형식(.png/.webp/.jpg)으로 바뀔 수 있습니다.
         Returns: 저장된 파일 경로
         """
+        stem = os.path.join(self.output_dir, os.path.splitext(filename)[0])
+        key = self.cache_key(prompt)
+        if self.cache is not None and not force_refresh:
+            cached_path = self.cache.get(key)
+            if cached_path is not None:
+                return self.copy_image(cached_path, filename)
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_modalities=['TEXT', 'IMAGE'],
-                    image_config=types.ImageConfig(
-                        aspect_ratio="16:9"
-                    ),
-                )
+            call = self.guard.call_hedged if self.hedge else self.guard.call
+            data, mime_type = call(self._request_image, prompt)
+            save_path = self._save_image_bytes(data, mime_type, stem)
+        except Exception as e:
+            # 원래 예외(레이트 리밋 여부 판별용)를 __cause__로 유지
+            raise RuntimeError(f"Image generation failed: {str(e)}") from e
+
+        if self.asset_store is not None:
+            self.asset_store.dedupe(save_path)
+        if self.cache is not None:
+            try:
+                self.cache.put(key, save_path)
+            except OSError:
+                pass
+        return save_path
+
+    def _request_image(self, prompt: str) -> Tuple[bytes, Optional[str]]:
+        """API를 한 번 호출하여 (이미지 바이트, MIME 타입)을 반환합니다. 헤지 요청이 동시에 실행될 수 있으므로 파일은 쓰지 않습니다."""
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=types.GenerateContentConfig(
+                response_modalities=['TEXT', 'IMAGE'],
+                image_config=types.ImageConfig(
+                    aspect_ratio=self.aspect_ratio
+                ),
             )
+        )
 
-            # response.parts에서 이미지 추출
-            image_found = False
-            for part in response.parts:
-                if image := part.as_image():
-                    save_path = os.path.join(self.output_dir, filename)
-                    image.save(save_path)
-                    image_found = True
-                    return save_path
+        # response.parts에서 이미지 바이트 추출 (디코딩 없이 그대로 사용)
+        inline = next(
+            (part.inline_data for part in response.parts
+             if part.inline_data is not None and part.inline_data.data),
+            None,
+        )
+        if inline is None:
+            raise RuntimeError("No images returned from API")
+        return inline.data, inline.mime_type
 
-            if not image_found:
-                raise RuntimeError("No images returned from API")
+    def copy_image(self, source_path: str, filename: str) -> str:
+        """
+        기존 이미지(캐시, 같은 배치의 동일 프롬프트 결과)를 출력 폴더에 원자적으로 복사합니다.
+        확장자는 원본 파일을 따릅니다.
+        """
+        filename = os.path.splitext(filename)[0] + os.path.splitext(source_path)[1]
+        if self.asset_store is not None:
+            return self.asset_store.import_file(
+                source_path, os.path.relpath(os.path.join(self.output_dir, filename), self.asset_store.project_dir)
+            )
+        save_path = os.path.join(self.output_dir, filename)
+        tmp_path = f"{save_path}.tmp"
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, save_path)
+        return save_path
 
-        except Exception as e:
-            raise RuntimeError(f"Image generation failed: {str(e)}")
+    def _save_image_bytes(self, data: bytes, mime_type: Optional[str], stem: str) -> str:
+        """
+        받은 형식이 저장 코덱과 맞으면 바이트를 그대로 쓰고,
+        아니면 한 번 디코딩하여 저장 코덱으로 인코딩합니다.
+        """
+        started = time.perf_counter()
+        source_codec = _MIME_TO_CODEC.get((mime_type or "").lower())
+        target_codec = self.storage_codec
+        if target_codec == "auto":
+            target_codec = source_codec or "png"
+        ext = IMAGE_CODECS[target_codec][0]
+        transcoded = source_codec != target_codec
+        if transcoded:
+            data, ext = self._transcode(data, target_codec)
+
+        save_path = stem + ext
+        tmp_path = f"{save_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, save_path)
+
+        with self._log_lock:
+            self.save_log[save_path] = {
+                "bytes": len(data),
+                "save_seconds": time.perf_counter() - started,
+                "codec": target_codec,
+                "transcoded": transcoded,
+            }
+            self.save_log.move_to_end(save_path)
+            while len(self.save_log) > SAVE_LOG_MAX_ENTRIES:
+                self.save_log.popitem(last=False)
+        return save_path
+
+    def _transcode(self, data: bytes, codec: str) -> Tuple[bytes, str]:
+        ext, _, pil_format = IMAGE_CODECS[codec]
+        with Image.open(io.BytesIO(data)) as img:
+            if pil_format == "JPEG" and img.mode not in ("RGB", "L"):
+                img = img.convert("RGB")
+            buffer = io.BytesIO()
+            if pil_format == "PNG":
+                img.save(buffer, format=pil_format)
+            else:
+                img.save(buffer, format=pil_format, quality=self.storage_quality)
+        return buffer.getvalue(), ext
 
     def get_output_path(self, global_index: int, section_name: str, sub_index: int = 0) -> str:
         """
         파일 저장 경로 규칙 생성
         예: 01_Opening_00.png (전체순서_섹션명_서브인덱스.png)
+        실제 확장자는 저장 형식에 따라 generate_image가 결정합니다.
         """
         safe_name = "".join(c for c in section_name if c.isalnum())
         return f"{global_index:02d}_{safe_name}_{sub_index:02d}.png"
@@ -0,0 +1,339 @@
+import atexit
+import io
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.data_models import LibraryMatch
+from utils.file_io import atomic_write, file_sha256
+
+# 검색 행렬 차원 / 문서 빈도(df)를 세는 해시 공간 / 문자 n-gram 범위
+VECTOR_DIM = 256
+HASH_SPACE = 1 << 20
+NGRAM_RANGE = (3, 4)
+# 문서 빈도(df, 4MB)는 메모리에 두고 이 개수만큼 항목이 추가될 때마다(또는 flush 때) 디스크에 씀
+DF_FLUSH_INTERVAL = 500
+_TOKEN_CLEANER = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def ngram_features(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문자 n-gram을 crc32로 해시한 (특징 id 배열, 1 + log(count) 가중치 배열)을 반환합니다.
+    Python hash()는 프로세스마다 달라지므로 crc32를 사용합니다.
+    """
+    cleaned = " " + _TOKEN_CLEANER.sub(" ", text.lower()).strip() + " "
+    counts = Counter(
+        cleaned[i : i + n]
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1)
+        for i in range(len(cleaned) - n + 1)
+    )
+    ids = np.fromiter((zlib.crc32(gram.encode("utf-8")) for gram in counts), dtype=np.int64, count=len(counts))
+    weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    return ids, weights
+
+
+def project(ids: np.ndarray, weights: np.ndarray, dim: int = VECTOR_DIM) -> np.ndarray:
+    """특징을 부호 있는 해시로 dim 차원에 모으고 L2 정규화합니다."""
+    signs = np.where((ids >> 31) & 1, 1.0, -1.0)
+    vector = np.bincount(ids % dim, weights=weights * signs, minlength=dim).astype(np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class ImageLibrary:
+    """
+    지금까지 생성한 모든 이미지를 prompt_english 기준으로 검색하는 로컬 라이브러리.
+    - vectors.f16: 항목별 TF-IDF 벡터 (VECTOR_DIM 차원으로 투영 후 정규화, 행 단위 append)
+    - df.npz: 해시 n-gram별 문서 빈도 (IDF 계산용)와 반영된 항목 수. 추가할 때마다 쓰지 않고
+      DF_FLUSH_INTERVAL개마다/flush() 때 쓰며, 반영되지 않은 뒤쪽 항목은 로드할 때 다시 셉니다.
+    - entries.jsonl: 프롬프트, 스타일, 이미지 경로
+    - images/<sha256>: 하드 링크(불가하면 복사)로 보관하여 프로젝트 정리(GC)와 무관하게 유지
+    벡터는 추가 시점의 IDF로 계산되므로, 항목 수가 마지막 재계산 시점의 두 배가 되면
+    백그라운드 스레드에서 전체 벡터를 현재 IDF로 다시 계산해 교체합니다 (삽입당 평균 O(1), 검색은 기다리지 않음).
+    """
+
+    VECTORS_FILE = "vectors.f16"
+    ENTRIES_FILE = "entries.jsonl"
+    DF_FILE = "df.npz"
+    META_FILE = "meta.json"
+    _lock = threading.Lock()
+    _shared: Dict[str, "ImageLibrary"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, library_dir: str = "output/Library", dim: int = VECTOR_DIM) -> None:
+        self.library_dir = library_dir
+        self.image_dir = os.path.join(library_dir, "images")
+        self.dim = dim
+        os.makedirs(self.image_dir, exist_ok=True)
+        self._entries: Optional[List[dict]] = None
+        self._shas: Dict[str, int] = {}
+        self._matrix = np.zeros((0, dim), dtype=np.float32)
+        self._size = 0
+        self._df = np.zeros(HASH_SPACE, dtype=np.int32)
+        self._df_count = 0
+        self._built_count = 0
+        self._rebuilding = False
+
+    @classmethod
+    def shared(cls, library_dir: str = "output/Library") -> "ImageLibrary":
+        """프로세스 안의 모든 세션이 같은 인덱스(메모리 행렬)를 쓰도록 경로별 인스턴스를 공유합니다."""
+        key = os.path.abspath(library_dir)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(library_dir)
+                atexit.register(cls._shared[key].flush)
+            return cls._shared[key]
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._entries)
+
+    def add(self, prompt: str, image_path: str, art_style: str = "") -> str:
+        """이미지를 라이브러리에 추가하고 라이브러리 내 경로를 반환합니다. 같은 이미지(내용 해시)는 한 번만 저장합니다."""
+        return self.add_many([(prompt, image_path, art_style)])[0]
+
+    def add_many(self, items: Sequence[Tuple[str, str, str]]) -> List[str]:
+        """(prompt, image_path, art_style) 목록을 한 번에 추가합니다."""
+        self._load()
+        paths = []
+        new_entries = []
+        new_features = []
+        with self._lock:
+            for prompt, image_path, art_style in items:
+                sha = file_sha256(image_path)
+                if sha in self._shas:
+                    paths.append(self._entries[self._shas[sha]]["image_path"])
+                    continue
+                library_path = self._store_image(image_path, sha)
+                self._shas[sha] = len(self._entries) + len(new_entries)
+                new_entries.append({
+                    "sha": sha,
+                    "prompt": prompt,
+                    "art_style": art_style,
+                    "image_path": library_path,
+                    "created_at": time.time(),
+                })
+                ids, weights = ngram_features(prompt)
+                self._df[np.unique(ids % HASH_SPACE)] += 1
+                new_features.append((ids, weights))
+                paths.append(library_path)
+
+            if not new_entries:
+                return paths
+            total = len(self._entries) + len(new_entries)
+            rows = np.vstack([self._vector(ids, weights, total) for ids, weights in new_features])
+            # 벡터를 먼저 쓰고 항목을 기록 (중단 시 _load가 짧은 쪽 길이에 맞춤)
+            with open(os.path.join(self.library_dir, self.VECTORS_FILE), "ab") as f:
+                f.write(rows.astype(np.float16).tobytes())
+            with open(os.path.join(self.library_dir, self.ENTRIES_FILE), "a", encoding="utf-8") as f:
+                for entry in new_entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+            self._entries.extend(new_entries)
+            self._append_rows(rows)
+            if len(self._entries) - self._df_count >= DF_FLUSH_INTERVAL:
+                self._write_df()
+            self._schedule_rebuild()
+        return paths
+
+    def flush(self) -> None:
+        """메모리의 문서 빈도(df)를 디스크에 씁니다 (공유 인스턴스는 프로세스 종료 시 자동 호출)."""
+        if self._entries is None:
+            return
+        with self._lock:
+            if self._df_count != len(self._entries):
+                self._write_df()
+
+    def search(
+        self,
+        prompt: str,
+        k: int = 3,
+        threshold: float = 0.55,
+        art_style: Optional[str] = None,
+    ) -> List[LibraryMatch]:
+        """
+        prompt와 비슷한 이미지를 코사인 유사도 내림차순으로 최대 k개 반환합니다 (threshold 미만 제외).
+        art_style을 지정하면 같은 스타일로 생성된 이미지만 반환합니다.
+        """
+        self._load()
+        if not self._entries:
+            return []
+        with self._lock:
+            matrix = self._matrix[: self._size]
+            entries = self._entries
+            query = self._vector(*ngram_features(prompt), len(entries))
+        scores = matrix @ query
+
+        # 스타일 필터로 걸러질 수 있으므로 k보다 넉넉히 후보를 고른 뒤 정렬
+        candidate_count = min(scores.shape[0], max(k * 8, 32))
+        candidates = np.argpartition(-scores, candidate_count - 1)[:candidate_count]
+        candidates = candidates[scores[candidates] >= threshold]
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        matches = []
+        for index in order:
+            entry = entries[index]
+            if art_style is not None and entry["art_style"] != art_style:
+                continue
+            if not os.path.exists(entry["image_path"]):
+                continue
+            matches.append(
+                LibraryMatch(
+                    image_path=entry["image_path"],
+                    prompt=entry["prompt"],
+                    art_style=entry["art_style"],
+                    score=float(scores[index]),
+                )
+            )
+            if len(matches) >= k:
+                break
+        return matches
+
+    def _vector(self, ids: np.ndarray, weights: np.ndarray, total: int, df: Optional[np.ndarray] = None) -> np.ndarray:
+        df = self._df if df is None else df
+        idf = np.log((1.0 + total) / (1.0 + df[ids % HASH_SPACE])) + 1.0
+        return project(ids, weights * idf, self.dim)
+
+    def _schedule_rebuild(self) -> None:
+        # _lock을 잡은 상태에서 호출
+        if self._rebuilding or len(self._entries) < 2 * max(self._built_count, 1):
+            return
+        self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name="image-library-rebuild", daemon=True).start()
+
+    def _rebuild_in_background(self) -> None:
+        """스냅샷한 항목과 df로 벡터를 다시 계산한 뒤, 그 사이 추가된 행은 그대로 두고 앞쪽 행만 교체합니다."""
+        try:
+            with self._lock:
+                entries = self._entries[:]
+                df = self._df.copy()
+            rows = self._compute_rows(entries, df)
+            with self._lock:
+                self._install_rows(rows)
+        finally:
+            self._rebuilding = False
+
+    def _compute_rows(self, entries: Sequence[dict], df: np.ndarray) -> np.ndarray:
+        total = len(entries)
+        return np.vstack([self._vector(*ngram_features(entry["prompt"]), total, df) for entry in entries])
+
+    def _install_rows(self, rows: np.ndarray) -> None:
+        """앞쪽 len(rows)개 벡터를 교체하고 vectors.f16/meta.json을 다시 씁니다 (_lock을 잡은 상태에서 호출)."""
+        total = rows.shape[0]
+        size = max(total, self._size)
+        # search()가 잠금 밖에서 이전 행렬의 뷰로 계산하므로 제자리에서 고치지 않고 새 배열로 교체
+        matrix = np.zeros((max(size, self._matrix.shape[0]), self.dim), dtype=np.float32)
+        matrix[:total] = rows
+        matrix[total:size] = self._matrix[total:size]
+        self._matrix = matrix
+        self._size = size
+        atomic_write(
+            os.path.join(self.library_dir, self.VECTORS_FILE), self._matrix[: self._size].astype(np.float16).tobytes()
+        )
+        self._built_count = total
+        atomic_write(
+            os.path.join(self.library_dir, self.META_FILE),
+            json.dumps({"built_count": total, "dim": self.dim}).encode("utf-8"),
+        )
+
+    def _write_df(self) -> None:
+        # _lock을 잡은 상태에서 호출. df와 반영된 항목 수를 한 파일에 원자적으로 씀
+        buffer = io.BytesIO()
+        np.savez(buffer, df=self._df, count=np.int64(len(self._entries)))
+        atomic_write(os.path.join(self.library_dir, self.DF_FILE), buffer.getvalue())
+        self._df_count = len(self._entries)
+
+    def _append_rows(self, rows: np.ndarray) -> None:
+        # 용량을 두 배씩 늘려 append가 평균 O(1). search()가 보는 앞쪽 _size개 행은 건드리지 않음
+        needed = self._size + rows.shape[0]
+        if needed > self._matrix.shape[0]:
+            grown = np.zeros((max(needed, self._matrix.shape[0] * 2, 64), self.dim), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+        self._matrix[self._size : needed] = rows
+        self._size = needed
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+        with self._lock:
+            if self._entries is not None:
+                return
+            entries = _read_entries(os.path.join(self.library_dir, self.ENTRIES_FILE))
+            try:
+                with open(os.path.join(self.library_dir, self.META_FILE), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                meta = {}
+            try:
+                vectors = np.fromfile(os.path.join(self.library_dir, self.VECTORS_FILE), dtype=np.float16)
+            except (OSError, ValueError):
+                vectors = np.zeros(0, dtype=np.float16)
+            try:
+                with np.load(os.path.join(self.library_dir, self.DF_FILE)) as saved:
+                    self._df, df_count = saved["df"], min(int(saved["count"]), len(entries))
+            except (OSError, ValueError, KeyError):
+                self._df, df_count = np.zeros(HASH_SPACE, dtype=np.int32), 0
+            # 마지막 df 저장 이후 추가된 항목의 문서 빈도를 다시 셈
+            for entry in entries[df_count:]:
+                self._df[np.unique(ngram_features(entry["prompt"])[0] % HASH_SPACE)] += 1
+            self._df_count = df_count
+
+            self._shas = {entry["sha"]: i for i, entry in enumerate(entries)}
+            self._entries = entries
+            rows = vectors.size // self.dim
+            if meta.get("dim", self.dim) != self.dim or rows < len(entries):
+                # 차원이 바뀌었거나 벡터가 빠진 항목이 있으면 전체 재계산
+                if entries:
+                    self._install_rows(self._compute_rows(entries, self._df))
+                return
+            if rows > len(entries):
+                # 항목 기록 전에 중단된 쓰기: 남은 벡터 행을 잘라냄
+                os.truncate(os.path.join(self.library_dir, self.VECTORS_FILE), len(entries) * self.dim * 2)
+            count = len(entries)
+            self._append_rows(vectors[: count * self.dim].reshape(count, self.dim).astype(np.float32))
+            self._built_count = min(meta.get("built_count", 0), count)
+            self._schedule_rebuild()
+
+    def _store_image(self, image_path: str, sha: str) -> str:
+        dest = os.path.join(self.image_dir, sha + os.path.splitext(image_path)[1].lower())
+        if os.path.exists(dest):
+            return dest
+        tmp_path = f"{dest}.tmp"
+        try:
+            os.link(image_path, tmp_path)
+        except OSError:
+            shutil.copyfile(image_path, tmp_path)
+        os.replace(tmp_path, dest)
+        return dest
+
+
+def _read_entries(path: str) -> List[dict]:
+    """
+    entries.jsonl을 읽습니다. 줄마다 json.loads를 부르지 않고 한 번에 JSON 배열로 파싱하며,
+    중간에 깨진 줄이 있으면 줄 단위로 읽어 그 앞까지만 사용합니다 (쓰다 중단된 마지막 줄 등).
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    try:
+        return json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+        return entries
+
@@ -0,0 +1,223 @@
+import json
+import re
+from typing import List, Tuple
+
+# 문자열을 여는/닫는 따옴표로 인정하는 문자 (스마트 따옴표 포함)
+_OPEN_QUOTES = {'"': '"', "“": "”"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+# 값 뒤의 쉼표 다음에 올 수 있는 토큰의 첫 글자
+_VALUE_STARTS = set('"“{[]}')
+# 숫자/true/false/null 리터럴을 이루는 문자와 완결된 리터럴
+_LITERAL_CHARS = set("0123456789+-.eEabcdefghijklmnopqrstuvwxyzABCDFGHIJKLMNOPQRSTUVWXYZ")
+_COMPLETE_LITERAL = re.compile(r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null")
+
+
+class RecoveryError(ValueError):
+    """복구 후에도 JSON 파싱에 실패한 경우. pos는 원본 텍스트 기준 오류 위치입니다."""
+
+    def __init__(self, message: str, pos: int) -> None:
+        super().__init__(message)
+        self.pos = pos
+
+
+def recover_json(text: str) -> dict:
+    """
+    Claude 응답에서 자주 발생하는 JSON 오류를 한 번의 순회로 복구하여 파싱합니다.
+    - 스마트 따옴표(“ ”)로 감싼 키/값
+    - 문자열 내부의 raw 개행/탭
+    - 후행 쉼표 (trailing comma)
+    - 응답이 잘린 경우 (마지막 완결 값까지 살리고 괄호를 닫음)
+    - 이스케이프되지 않은 내부 따옴표 ("그가 "예"라고 말했다")
+    """
+    repaired, src_map = repair_json_text(text)
+    if not repaired:
+        raise RecoveryError("No JSON object found in Claude response.", 0)
+    try:
+        data = json.loads(repaired)
+    except json.JSONDecodeError as e:
+        raise RecoveryError(
+            f"JSON decode error after recovery at position {e.pos}: {e.msg}",
+            _source_pos(src_map, e.pos),
+        )
+    if not isinstance(data, dict):
+        raise RecoveryError("Recovered JSON is not an object.", 0)
+    return data
+
+
+def repair_json_text(text: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    복구된 JSON 문자열과, (출력 위치, 원본 위치) 매핑 목록을 반환합니다.
+    매핑은 오류 위치를 원본 텍스트 좌표로 되돌리는 데 사용됩니다.
+    """
+    start = text.find("{")
+    if start == -1:
+        return "", []
+
+    out: List[str] = []
+    src_map: List[Tuple[int, int]] = []
+    out_len = 0
+
+    # stack 항목: [종류("{" 또는 "["), 값 대기 여부(객체에서 키를 읽은 뒤 True)]
+    stack: List[list] = []
+    need_comma = False
+    safe_len = 0
+    safe_stack: List[str] = []
+
+    in_string = False
+    string_is_key = False
+    close_quote = '"'
+
+    def emit(piece: str, src: int) -> None:
+        nonlocal out_len
+        src_map.append((out_len, src))
+        out.append(piece)
+        out_len += len(piece)
+
+    def strip_trailing_comma() -> None:
+        nonlocal out_len
+        idx = len(out) - 1
+        while idx >= 0 and out[idx].isspace():
+            idx -= 1
+        if idx >= 0 and out[idx] == ",":
+            out[idx] = ""
+            out_len -= 1
+            for k in range(idx + 1, len(src_map)):
+                src_map[k] = (src_map[k][0] - 1, src_map[k][1])
+
+    def value_closed() -> None:
+        nonlocal need_comma, safe_len, safe_stack
+        need_comma = True
+        if stack and stack[-1][0] == "{":
+            stack[-1][1] = False
+        safe_len = out_len
+        safe_stack = [frame[0] for frame in stack]
+
+    i = start
+    n = len(text)
+    while i < n:
+        ch = text[i]
+
+        if in_string:
+            if ch == "\\":
+                nxt = text[i + 1] if i + 1 < n else ""
+                if nxt in _VALID_ESCAPES:
+                    emit(ch + nxt, i)
+                    i += 2
+                    continue
+                emit("\\\\", i)
+            elif ch == '"' or ch == close_quote:
+                if _looks_like_close(text, i + 1, string_is_key):
+                    emit('"', i)
+                    in_string = False
+                    if string_is_key:
+                        stack[-1][1] = True
+                        need_comma = False
+                    else:
+                        value_closed()
+                else:
+                    emit('\\"', i)
+            elif ch == "\n":
+                emit("\\n", i)
+            elif ch == "\r":
+                pass
+            elif ch == "\t":
+                emit("\\t", i)
+            elif ord(ch) < 0x20:
+                emit(f"\\u{ord(ch):04x}", i)
+            else:
+                emit(ch, i)
+            i += 1
+            continue
+
+        if ch in _OPEN_QUOTES:
+            if need_comma:
+                emit(",", i)
+            need_comma = False
+            in_string = True
+            close_quote = _OPEN_QUOTES[ch]
+            string_is_key = bool(stack) and stack[-1][0] == "{" and not stack[-1][1]
+            emit('"', i)
+        elif ch in "{[":
+            if need_comma:
+                emit(",", i)
+            need_comma = False
+            stack.append([ch, False])
+            emit(ch, i)
+        elif ch in "}]":
+            strip_trailing_comma()
+            want = "{" if ch == "}" else "["
+            # 괄호 짝이 맞지 않으면 안쪽 컨테이너부터 닫음
+            while stack and stack[-1][0] != want:
+                emit("}" if stack.pop()[0] == "{" else "]", i)
+            if stack:
+                stack.pop()
+                emit(ch, i)
+            value_closed()
+            if not stack:
+                break
+        elif ch == ",":
+            need_comma = False
+            emit(ch, i)
+        elif ch in _LITERAL_CHARS and stack and (stack[-1][0] == "[" or stack[-1][1]):
+            # 숫자/true/false/null: 구분자 앞에서 끝났거나 입력 끝에서 완결된 토큰이면 값으로 확정
+            # (잘린 'tr', '1.' 등은 확정하지 않으므로 마지막 완결 값까지 되돌릴 때 함께 빠짐)
+            j = i + 1
+            while j < n and text[j] in _LITERAL_CHARS:
+                j += 1
+            if need_comma:
+                emit(",", i)
+            need_comma = False
+            emit(text[i:j], i)
+            if _COMPLETE_LITERAL.fullmatch(text[i:j]):
+                value_closed()
+            i = j
+            continue
+        else:
+            # 공백, 콜론 등
+            emit(ch, i)
+        i += 1
+
+    if stack:
+        # 응답이 잘린 경우: 마지막으로 완결된 값까지 되돌린 뒤 괄호를 닫음
+        repaired = "".join(out)[:safe_len].rstrip()
+        if repaired.endswith(","):
+            repaired = repaired[:-1]
+        closers = "".join("}" if kind == "{" else "]" for kind in reversed(safe_stack))
+        src_map = [m for m in src_map if m[0] < len(repaired)]
+        return repaired + closers, src_map
+
+    return "".join(out), src_map
+
+
+def _looks_like_close(text: str, j: int, is_key: bool) -> bool:
+    """따옴표 다음 토큰을 보고 문자열의 끝인지, 내부 따옴표인지 판단합니다."""
+    n = len(text)
+    newline = False
+    while j < n and text[j].isspace():
+        newline = newline or text[j] == "\n"
+        j += 1
+    if j >= n:
+        return True
+    c = text[j]
+    if is_key:
+        return c == ":"
+    if c in "}]":
+        return True
+    if c in '"“' and newline:
+        # 값 사이 쉼표가 빠진 경우 (줄바꿈 후 다음 키가 시작)
+        return True
+    if c == ",":
+        k = j + 1
+        while k < n and text[k].isspace():
+            k += 1
+        return k >= n or text[k] in _VALUE_STARTS
+    return False
+
+
+def _source_pos(src_map: List[Tuple[int, int]], out_pos: int) -> int:
+    src = 0
+    for out_start, src_index in src_map:
+        if out_start > out_pos:
+            break
+        src = src_index
+    return src
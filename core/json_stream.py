@@ -0,0 +1,83 @@
+import json
+from typing import List
+
+from core.json_recovery import RecoveryError, recover_json
+
+
+class SectionStreamReader:
+    """
+    스트리밍으로 도착하는 JSON 텍스트 조각을 받아,
+    최상위 객체의 "sections" 배열 안에서 닫힌 섹션 객체를 즉시 반환합니다.
+
+    예: {"sections": [{...}, {...}]} 에서 각 {...}가 닫히는 순간 dict로 파싱됩니다.
+    """
+
+    def __init__(self) -> None:
+        self.buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._in_section = False
+        self._section_chars: List[str] = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self.buffer)
+
+    def feed(self, chunk: str) -> List[dict]:
+        """텍스트 조각을 추가하고, 이번에 완성된 섹션 dict 목록을 반환합니다."""
+        self.buffer.append(chunk)
+        completed: List[dict] = []
+
+        for ch in chunk:
+            if self._in_section:
+                self._section_chars.append(ch)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                if self._started:
+                    self._in_string = True
+                continue
+
+            if ch in "{[":
+                if not self._started:
+                    # 코드 블록 등 JSON 이전 텍스트는 무시
+                    if ch != "{":
+                        continue
+                    self._started = True
+                self._stack.append(ch)
+                if ch == "{" and self._stack == ["{", "[", "{"]:
+                    self._in_section = True
+                    self._section_chars = ["{"]
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if ch == "}" and self._in_section and self._stack == ["{", "["]:
+                    item = self._parse_section("".join(self._section_chars))
+                    if item is not None:
+                        completed.append(item)
+                    self._in_section = False
+                    self._section_chars = []
+        return completed
+
+    @staticmethod
+    def _parse_section(payload: str):
+        try:
+            # strict=False: 문자열 내부의 raw 개행 허용
+            item = json.loads(payload, strict=False)
+        except json.JSONDecodeError:
+            try:
+                item = recover_json(payload)
+            except RecoveryError:
+                return None
+        if isinstance(item, dict) and "section_type" in item and "content" in item:
+            return item
+        return None
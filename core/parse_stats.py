@@ -0,0 +1,58 @@
+import json
+import os
+import threading
+from typing import Dict
+
+from utils.file_io import atomic_write
+
+# 파싱 결과 분류
+OUTCOMES = ("direct", "local_recovery", "model_repair", "failed")
+
+
+class ParseStats:
+    """
+    출력 모드(json/tool)별 응답 파싱 결과를 디스크에 누적 기록합니다.
+    - direct: 바로 파싱 성공
+    - local_recovery: 로컬 복구 파서로 성공
+    - model_repair: Claude 재호출(구간 복구)로 성공
+    - failed: 최종 실패
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = "output/Stats/parse_stats.json") -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def record(self, mode: str, outcome: str) -> None:
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown parse outcome: {outcome}")
+        with self._lock:
+            data = self._read()
+            counters = data.setdefault(mode, {})
+            counters[outcome] = counters.get(outcome, 0) + 1
+            self._write(data)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for mode, counters in self._read().items():
+            total = sum(counters.get(o, 0) for o in OUTCOMES)
+            row = {o: counters.get(o, 0) for o in OUTCOMES}
+            row["total"] = total
+            # 바로 파싱되지 않은 비율 / 두 번째 LLM 호출이 필요했던 비율
+            row["failure_rate"] = (total - row["direct"]) / total if total else 0.0
+            row["repair_call_rate"] = (
+                (row["model_repair"] + row["failed"]) / total if total else 0.0
+            )
+            result[mode] = row
+        return result
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: dict) -> None:
+        atomic_write(self.path, json.dumps(data))
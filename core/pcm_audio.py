@@ -0,0 +1,129 @@
+import io
+import wave
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+# 무음 판정 창 길이(ms)와 기준(dBFS), 잘라낸 뒤 앞뒤로 남겨 둘 여유(ms)
+SILENCE_WINDOW_MS = 10
+SILENCE_THRESHOLD_DBFS = -45.0
+TRIM_KEEP_MS = 40
+# 음량 정규화 목표 RMS와 피크 상한 (dBFS)
+TARGET_RMS_DBFS = -20.0
+PEAK_CEILING_DBFS = -1.0
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """헤더 없는 PCM(little-endian)에 WAV 헤더를 붙입니다."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def read_wav(data: bytes) -> Tuple[np.ndarray, int]:
+    """16bit WAV를 (샘플 수, 채널 수) 모양의 -1~1 float32 배열과 샘플레이트로 읽습니다."""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"Unsupported WAV sample width: {wav.getsampwidth() * 8} bit")
+        channels, sample_rate = wav.getnchannels(), wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels)
+    return samples.astype(np.float32) / 32768.0, sample_rate
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    return (np.clip(samples, -1.0, 1.0) * 32767.0).astype("<i2")
+
+
+def resample(samples: np.ndarray, sample_rate: int, target_rate: int) -> np.ndarray:
+    """선형 보간으로 샘플레이트를 바꿉니다 (블록마다 샘플레이트가 다를 때만 사용)."""
+    if sample_rate == target_rate or samples.shape[0] == 0:
+        return samples
+    count = int(round(samples.shape[0] * target_rate / sample_rate))
+    positions = np.arange(count, dtype=np.float64) * (sample_rate / target_rate)
+    source = np.arange(samples.shape[0], dtype=np.float64)
+    return np.stack([np.interp(positions, source, samples[:, c]) for c in range(samples.shape[1])], axis=1).astype(
+        np.float32
+    )
+
+
+def trim_silence(
+    samples: np.ndarray,
+    sample_rate: int,
+    threshold_dbfs: float = SILENCE_THRESHOLD_DBFS,
+    keep_ms: int = TRIM_KEEP_MS,
+) -> np.ndarray:
+    """
+    SILENCE_WINDOW_MS 창별 RMS가 threshold_dbfs보다 큰 첫 창과 마지막 창 사이만 남깁니다 (앞뒤 keep_ms 여유).
+    전부 무음이면 길이 0 배열을 반환합니다.
+    """
+    window = max(1, sample_rate * SILENCE_WINDOW_MS // 1000)
+    count = samples.shape[0] // window
+    if count == 0:
+        return samples
+    power = np.square(samples[: count * window].reshape(count, -1)).mean(axis=1)
+    loud = np.flatnonzero(power > 10 ** (threshold_dbfs / 10))
+    if loud.size == 0:
+        return samples[:0]
+    keep = sample_rate * keep_ms // 1000
+    start = max(0, loud[0] * window - keep)
+    end = min(samples.shape[0], (loud[-1] + 1) * window + keep)
+    return samples[start:end]
+
+
+def normalize_gain(
+    samples: np.ndarray,
+    target_rms_dbfs: float = TARGET_RMS_DBFS,
+    peak_ceiling_dbfs: float = PEAK_CEILING_DBFS,
+) -> np.ndarray:
+    """RMS를 target_rms_dbfs로 맞추되, 피크가 peak_ceiling_dbfs를 넘지 않도록 이득을 제한합니다."""
+    if samples.size == 0:
+        return samples
+    rms = float(np.sqrt(np.square(samples).mean()))
+    peak = float(np.abs(samples).max())
+    if rms == 0.0:
+        return samples
+    gain = min(10 ** (target_rms_dbfs / 20) / rms, 10 ** (peak_ceiling_dbfs / 20) / peak)
+    return samples * np.float32(gain)
+
+
+def apply_fades(samples: np.ndarray, fade_samples: int) -> np.ndarray:
+    """앞뒤 fade_samples 구간에 선형 페이드 인/아웃을 적용합니다 (잘라낸 경계의 클릭 방지)."""
+    fade = min(fade_samples, samples.shape[0] // 2)
+    if fade <= 0:
+        return samples
+    samples = samples.copy() if not samples.flags.writeable else samples
+    ramp = np.linspace(0.0, 1.0, fade, endpoint=False, dtype=np.float32)[:, None]
+    samples[:fade] *= ramp
+    samples[-fade:] *= ramp[::-1]
+    return samples
+
+
+def mix_sections(
+    blocks: Sequence[np.ndarray], sample_rate: int, gap_ms: int, crossfade_ms: int
+) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """
+    int16 블록 사이에 gap_ms 묵음을 두고 한 번에 할당한 int16 버퍼에 더해 넣습니다.
+    gap_ms가 crossfade_ms보다 짧으면 모자란 만큼 앞 블록의 페이드 아웃과 다음 블록의 페이드 인이 겹칩니다.
+    마지막 블록 뒤에도 gap_ms 묵음이 붙습니다.
+    Returns: (합친 int16 배열, 블록별 (시작, 끝) 샘플 위치)
+    """
+    gap = sample_rate * gap_ms // 1000
+    overlap = max(0, sample_rate * crossfade_ms // 1000 - gap)
+    spans = []
+    position = 0
+    for samples in blocks:
+        start = max(0, position - overlap) if spans else 0
+        spans.append((start, start + samples.shape[0]))
+        position = start + samples.shape[0] + gap
+    channels = max((samples.shape[1] for samples in blocks), default=1)
+    mixed = np.zeros((position, channels), dtype="<i2")
+    for samples, (start, end) in zip(blocks, spans):
+        # 겹치는 구간만 int32로 더한 뒤 잘라냄 (모노 블록은 채널 방향으로 브로드캐스트)
+        region = mixed[start:end].astype(np.int32) + samples
+        mixed[start:end] = np.clip(region, -32768, 32767)
+    return mixed, spans
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from anthropic import Anthropic
+
+from core.json_recovery import RecoveryError, recover_json
+from core.resilience import get_guard
+from models.data_models import ScriptData
+from utils.config import load_env, require_env
+from utils.file_io import atomic_write
+
+
+class TranslationCache:
+    """
+    번역 결과를 (prompt_korean, art_style, model) 키로 디스크에 저장합니다.
+    변경되지 않은 프롬프트를 다시 저장해도 API를 호출하지 않도록 합니다.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = "output/Cache/translations.json") -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._entries: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def make_key(korean_text: str, art_style: str, model: str) -> str:
+        raw = json.dumps([korean_text.strip(), art_style.strip(), model], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        return self._load().get(key)
+
+    def put_many(self, items: Dict[str, str]) -> None:
+        if not items:
+            return
+        with self._lock:
+            # 다른 세션이 쓴 항목을 잃지 않도록 파일을 다시 읽어 병합
+            self._entries = None
+            entries = self._load()
+            entries.update(items)
+            atomic_write(self.path, json.dumps(entries, ensure_ascii=False))
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+
+class PromptTranslator:
+    """
+    한글 이미지 설명을 Gemini용 영문 프롬프트로 변환합니다.
+    여러 설명을 batch_size 단위로 묶어 한 번의 요청으로 번역하고,
+    묶음들은 max_workers 개까지 동시에 요청합니다.
+    """
+
+    def __init__(
+        self,
+        model: str = "claude-haiku-4-5-20251001",
+        batch_size: int = 8,
+        max_workers: int = 4,
+        cache: Optional[TranslationCache] = None,
+    ) -> None:
+        load_env()
+        api_key = require_env("ANTHROPIC_API_KEY")
+        self.guard = get_guard("anthropic")
+        self.client = Anthropic(api_key=api_key, timeout=self.guard.timeout, max_retries=0)
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.cache = cache if cache is not None else TranslationCache()
+        self.last_latency = 0.0
+        self.last_cache_hits = 0
+        self.last_api_calls = 0
+
+    def translate(self, korean_text: str, art_style: str) -> str:
+        return self.translate_batch([korean_text], art_style)[0]
+
+    def translate_batch(self, korean_texts: List[str], art_style: str) -> List[str]:
+        """
+        입력 순서대로 영문 프롬프트 리스트를 반환합니다.
+        캐시에 있는 항목과 중복 항목은 제외하고 나머지만 묶어서 번역합니다.
+        """
+        started = time.perf_counter()
+        keys = [self.cache.make_key(text, art_style, self.model) for text in korean_texts]
+        resolved: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, korean_texts):
+            cached = self.cache.get(key)
+            if cached is not None:
+                resolved[key] = cached
+            else:
+                pending.setdefault(key, text)
+
+        self.last_cache_hits = len(korean_texts) - sum(1 for k in keys if k in pending)
+        pending_keys = list(pending.keys())
+        chunks = [
+            pending_keys[i : i + self.batch_size]
+            for i in range(0, len(pending_keys), self.batch_size)
+        ]
+        self.last_api_calls = len(chunks)
+        if chunks:
+            translated: Dict[str, str] = {}
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                for chunk, outputs in zip(
+                    chunks,
+                    executor.map(
+                        lambda chunk: self._translate_chunk([pending[k] for k in chunk], art_style),
+                        chunks,
+                    ),
+                ):
+                    translated.update(zip(chunk, outputs))
+            self.cache.put_many(translated)
+            resolved.update(translated)
+
+        self.last_latency = time.perf_counter() - started
+        return [resolved[key] for key in keys]
+
+    def fill_missing_english(self, script: ScriptData) -> int:
+        """prompt_english가 비어 있는 이미지 프롬프트를 한 번에 번역하여 채웁니다."""
+        targets = [ip for ip in script.all_image_prompts if not ip.prompt_english.strip()]
+        if not targets:
+            self.last_latency = 0.0
+            return 0
+        translated = self.translate_batch([ip.prompt_korean for ip in targets], script.art_style)
+        for ip, english in zip(targets, translated):
+            ip.prompt_english = english
+        return len(targets)
+
+    def _translate_chunk(self, korean_texts: List[str], art_style: str) -> List[str]:
+        """
+        묶음을 한 번에 번역합니다. 응답 형식이 맞지 않으면(개수 불일치, 객체가 아닌 JSON 등)
+        묶음을 항목별 요청으로 나눠 다시 번역하고, 한 항목도 맞지 않으면 RuntimeError를 발생시킵니다.
+        """
+        numbered = "\n".join(f"{i + 1}. {text}" for i, text in enumerate(korean_texts))
+        prompt = f"""Convert each Korean image description below into a detailed English prompt for Gemini image generation.
+Keep each one concise but vivid. Focus on visual elements, composition, and atmosphere.
+
+Art style context: {art_style}
+
+Korean descriptions:
+{numbered}
+
+Return ONLY a JSON object of the form {{"prompts": ["...", "..."]}} with exactly {len(korean_texts)} English prompts in the same order."""
+
+        response = self.guard.call(
+            self.client.messages.create,
+            model=self.model,
+            max_tokens=min(8000, 200 * len(korean_texts) + 100),
+            temperature=0.3,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        prompts = parse_prompts(response.content[0].text)
+        if prompts is not None and len(prompts) == len(korean_texts):
+            return prompts
+        if len(korean_texts) > 1:
+            return [self._translate_chunk([text], art_style)[0] for text in korean_texts]
+        raise RuntimeError(
+            "Prompt translation returned an unexpected response: "
+            + ("invalid JSON" if prompts is None else f"{len(prompts)} prompts for 1 input")
+        )
+
+
+def parse_prompts(text: str) -> Optional[List[str]]:
+    """
+    번역 응답에서 {"prompts": [...]} (또는 맨 배열)을 꺼냅니다.
+    JSON이 아니거나 형식이 다르면(null, 문자열, 객체 안의 객체 등) None을 반환합니다.
+    """
+    try:
+        data = json.loads(text[text.find("{") : text.rfind("}") + 1])
+    except ValueError:
+        try:
+            data = recover_json(text)
+        except RecoveryError:
+            try:
+                data = json.loads(text[text.find("[") : text.rfind("]") + 1])
+            except ValueError:
+                return None
+    prompts = data.get("prompts") if isinstance(data, dict) else data
+    if not isinstance(prompts, list) or not all(isinstance(p, (str, int, float)) for p in prompts):
+        return None
+    return [str(p).strip() for p in prompts]
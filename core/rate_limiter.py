@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    토큰 버킷 방식의 레이트 리미터 (스레드 안전).
+    rate_per_minute 만큼 분당 토큰이 채워지고, acquire()는 토큰이 충분할 때까지 대기합니다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """
+        amount 만큼 토큰을 소비합니다. 대기한 시간(초)을 반환합니다.
+        버킷 용량보다 큰 요청은 용량만큼 채워지면 허용합니다.
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                shortfall = amount - self._tokens
+                delay = shortfall / self.rate_per_second
+            time.sleep(delay)
+            waited += delay
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+
+
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    429/할당량 오류에 맞춰 충전 속도를 자동으로 조절하는 토큰 버킷 (AIMD).
+    - penalize(): 속도를 절반으로 줄이고 (min_rate_per_minute 이상), cooldown 동안 토큰 발급을 멈춤
+    - reward(): 성공할 때마다 원래 속도(rate_per_minute)까지 조금씩 되돌림
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        min_rate_per_minute: Optional[float] = None,
+        recovery_per_success: float = 0.1,
+    ) -> None:
+        super().__init__(rate_per_minute, capacity)
+        self.max_rate_per_second = self.rate_per_second
+        self.min_rate_per_second = (
+            min_rate_per_minute / 60.0 if min_rate_per_minute else self.rate_per_second / 8
+        )
+        # 성공 1회당 회복량 (최대 속도 대비 비율)
+        self.recovery_per_success = recovery_per_success
+        self.penalties = 0
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self.rate_per_second * 60.0
+
+    def penalize(self, cooldown: float = 0.0) -> None:
+        """레이트 리밋 응답을 받았을 때 호출합니다. cooldown(초)은 서버가 알려준 재시도 대기 시간."""
+        with self._lock:
+            self._refill()
+            self.rate_per_second = max(self.min_rate_per_second, self.rate_per_second / 2)
+            # 남은 토큰을 비우고 cooldown 만큼 음수로 만들어 그동안 발급을 멈춤
+            self._tokens = min(0.0, self._tokens) - cooldown * self.rate_per_second
+            self.penalties += 1
+
+    def reward(self) -> None:
+        with self._lock:
+            self.rate_per_second = min(
+                self.max_rate_per_second,
+                self.rate_per_second + self.max_rate_per_second * self.recovery_per_success,
+            )
@@ -0,0 +1,348 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from utils.config import get_env, load_env
+
+# 제공자별 기본값: 호출당 제한 시간(초), 재시도 횟수, 회로 차단 기준 연속 실패 수, 차단 유지 시간(초)
+PROVIDER_DEFAULTS: Dict[str, dict] = {
+    "anthropic": {"timeout": 300.0, "max_retries": 2, "failure_threshold": 4, "reset_timeout": 60.0},
+    "gemini_image": {"timeout": 120.0, "max_retries": 2, "failure_threshold": 5, "reset_timeout": 60.0},
+    "gemini_text": {"timeout": 60.0, "max_retries": 0, "failure_threshold": 3, "reset_timeout": 120.0},
+    "elevenlabs": {"timeout": 90.0, "max_retries": 2, "failure_threshold": 4, "reset_timeout": 60.0},
+}
+
+_RATE_LIMIT_MARKERS = ("429", "resource_exhausted", "resource exhausted", "quota", "rate limit")
+_TRANSIENT_MARKERS = ("timeout", "timed out", "connection", "temporarily", "unavailable", "overloaded")
+_TRANSIENT_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+# 헤지(중복) 요청용 공용 스레드 풀
+_HEDGE_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+
+class CircuitOpenError(RuntimeError):
+    """회로 차단기가 열려 있어 호출하지 않고 바로 실패함"""
+
+
+def _iter_chain(error: Optional[BaseException]) -> Iterator[BaseException]:
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        yield error
+        error = error.__cause__ or error.__context__
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for attr in ("status_code", "code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """예외(및 __cause__ 체인)가 429/할당량 초과 오류인지 판별합니다."""
+    for exc in _iter_chain(error):
+        if _status_code(exc) == 429:
+            return True
+        message = str(exc).lower()
+        if any(marker in message for marker in _RATE_LIMIT_MARKERS):
+            return True
+    return False
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """시간 초과, 연결 오류, 429/5xx처럼 다시 시도하면 성공할 수 있는 오류인지 판별합니다."""
+    for exc in _iter_chain(error):
+        if isinstance(exc, CircuitOpenError):
+            return False
+        if isinstance(exc, (TimeoutError, ConnectionError)):
+            return True
+        name = type(exc).__name__.lower()
+        if "timeout" in name or "connection" in name:
+            return True
+        status = _status_code(exc)
+        if status is not None:
+            return status in _TRANSIENT_STATUS
+        message = str(exc).lower()
+        if any(marker in message for marker in _TRANSIENT_MARKERS + _RATE_LIMIT_MARKERS):
+            return True
+    return False
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold 번 쌓이면 열려(open) reset_timeout 동안 호출을 막고,
+    그 뒤 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다 (스레드 안전).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._probing:
+                    self.trips += 1
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self) -> None:
+        """시험 호출이 서비스 상태와 무관한 이유(4xx, 429, 로컬 예외)로 끝났을 때: 상태는 그대로 두고 다음 시험 호출만 허용"""
+        with self._lock:
+            self._probing = False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+class LatencyTracker:
+    """최근 성공 호출의 소요 시간(초)으로 백분위를 계산합니다."""
+
+    def __init__(self, window: int = 200) -> None:
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(round(q / 100.0 * (len(ordered) - 1))))]
+
+
+class ProviderGuard:
+    """
+    외부 API 호출 하나를 감싸는 공용 복원력 계층.
+    - timeout: SDK 클라이언트에 넘기는 호출당 제한 시간 (소켓 수준에서 끊김)
+    - 일시적 오류(시간 초과, 연결, 5xx)는 지터가 있는 지수 백오프로 max_retries 번까지 재시도
+    - 일시적 오류가 이어지면 회로를 열어 reset_timeout 동안 CircuitOpenError로 즉시 실패
+    - call_hedged: 최근 p95 소요 시간이 지나도 응답이 없으면 같은 요청을 한 번 더 보내 먼저 끝난 결과 사용.
+      중복 요청도 과금되므로 전체 호출의 hedge_budget 비율, 동시에 max_hedges_in_flight개까지만 보냅니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float = 60.0,
+        max_retries: int = 2,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 20.0,
+        retry_if: Callable[[BaseException], bool] = is_transient_error,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.retry_if = retry_if
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = LatencyTracker()
+        self.min_hedge_samples = 20
+        # 중복 전송은 전체 호출의 10% 이하, 진 쪽 요청이 아직 실행 중인 쌍은 2개까지
+        self.hedge_budget = 0.1
+        self.max_hedges_in_flight = 2
+        self._hedges_in_flight = 0
+        self.calls = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self._stats_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.breaker.state != "open"
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._run(lambda: fn(*args, **kwargs), hedge=False)
+
+    def call_hedged(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return self._run(lambda: fn(*args, **kwargs), hedge=True)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """재시도 없이 회로 차단과 성공/실패 기록만 적용합니다 (스트리밍처럼 다시 보낼 수 없는 호출용)."""
+        self._check_open()
+        try:
+            yield
+        except Exception as e:
+            self._record_failure(e)
+            raise
+        self.breaker.record_success()
+
+    def status(self) -> dict:
+        p95 = self.latency.percentile(95)
+        return {
+            "state": self.breaker.state,
+            "retry_after": self.breaker.retry_after(),
+            "calls": self.calls,
+            "retries": self.retries,
+            "trips": self.breaker.trips,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_seconds": p95,
+        }
+
+    def _run(self, thunk: Callable[[], Any], hedge: bool) -> Any:
+        self._check_open()
+        with self._stats_lock:
+            self.calls += 1
+        for attempt in range(self.max_retries + 1):
+            try:
+                result, elapsed = self._attempt_hedged(thunk) if hedge else _timed(thunk)
+            except Exception as e:
+                self._record_failure(e)
+                if attempt == self.max_retries or not self.retry_if(e) or not self.breaker.allow():
+                    raise
+                with self._stats_lock:
+                    self.retries += 1
+                # full jitter: 0 ~ min(max_backoff, base * 2^attempt)
+                time.sleep(random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt))))
+                continue
+            # 이긴 요청 자신의 소요 시간만 기록 (헤지 대기 시간이 섞이지 않도록)
+            self.latency.record(elapsed)
+            self.breaker.record_success()
+            return result
+
+    def _attempt_hedged(self, thunk: Callable[[], Any]) -> Tuple[Any, float]:
+        # 지연 통계가 충분히 쌓이기 전에는 헤지하지 않음
+        if len(self.latency) < self.min_hedge_samples:
+            return _timed(thunk)
+        hedge_after = self.latency.percentile(95)
+        primary = _HEDGE_EXECUTOR.submit(_timed, thunk)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        secondary = _HEDGE_EXECUTOR.submit(_timed, thunk)
+        pending = {primary, secondary}
+        first_error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    if future is secondary:
+                        with self._stats_lock:
+                            self.hedge_wins += 1
+                    # 진 쪽이 아직 시작 전이면 보내지 않음. 이미 실행 중인 SDK 호출은 중단할 수 없으므로
+                    # 끝날 때(늦어도 timeout)까지 중복 전송 슬롯을 잡고 있다가 반납
+                    loser = secondary if future is primary else primary
+                    loser.cancel()
+                    loser.add_done_callback(lambda _: self._release_hedge())
+                    return future.result()
+                first_error = first_error or error
+        self._release_hedge()
+        raise first_error
+
+    def _reserve_hedge(self) -> bool:
+        with self._stats_lock:
+            if self._hedges_in_flight >= self.max_hedges_in_flight or self.hedges + 1 > self.hedge_budget * self.calls:
+                return False
+            self._hedges_in_flight += 1
+            self.hedges += 1
+            return True
+
+    def _release_hedge(self) -> None:
+        with self._stats_lock:
+            self._hedges_in_flight -= 1
+
+    def _check_open(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"{self.name} 서비스 응답이 불안정하여 잠시 호출을 중단했습니다 "
+                f"({self.breaker.retry_after():.0f}초 후 다시 시도)"
+            )
+
+    def _record_failure(self, error: BaseException) -> None:
+        # 요청 자체가 잘못된 경우(4xx)나 레이트 리밋은 서비스 장애로 보지 않음 (회로 상태를 바꾸지 않음)
+        if is_transient_error(error) and not is_rate_limit_error(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release_probe()
+
+
+def _timed(thunk: Callable[[], Any]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = thunk()
+    return result, time.perf_counter() - started
+
+
+_guards: Dict[str, ProviderGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_guard(provider: str, **overrides: Any) -> ProviderGuard:
+    """
+    제공자별 ProviderGuard를 프로세스 안에서 공유합니다 (회로 상태와 지연 통계가 인스턴스 간에 유지되도록).
+    설정은 PROVIDER_DEFAULTS < 환경 변수(<PROVIDER>_TIMEOUT_SECONDS, <PROVIDER>_MAX_RETRIES) < overrides 순으로 적용됩니다.
+    overrides는 처음 만들 때만 적용됩니다.
+    """
+    with _guards_lock:
+        if provider not in _guards:
+            load_env()
+            config = dict(PROVIDER_DEFAULTS.get(provider, {}))
+            prefix = provider.upper()
+            timeout = get_env(f"{prefix}_TIMEOUT_SECONDS")
+            if timeout:
+                config["timeout"] = float(timeout)
+            max_retries = get_env(f"{prefix}_MAX_RETRIES")
+            if max_retries:
+                config["max_retries"] = int(max_retries)
+            config.update(overrides)
+            _guards[provider] = ProviderGuard(provider, **config)
+        return _guards[provider]
+
+
+def provider_status() -> Dict[str, dict]:
+    """지금까지 사용된 제공자별 회로 상태와 호출 통계"""
+    with _guards_lock:
+        guards = list(_guards.values())
+    return {guard.name: guard.status() for guard in guards}
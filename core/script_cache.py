@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from core.disk_cache import DiskLRUCache
+from models.data_models import ScriptData
+from utils.bible_parser import reference_key
+from utils.file_io import atomic_write
+
+
+class ScriptCache(DiskLRUCache):
+    """
+    ScriptGenerator 결과(파싱 완료된 ScriptData)를 디스크에 저장하는 캐시.
+    키: 정규화된 성경 구절 (책, 장, 절) + 모델 + temperature + 프롬프트 해시
+    용량 초과 시 가장 오래 사용되지 않은 항목부터 삭제합니다 (LRU).
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(
+        self,
+        cache_dir: str = "output/Cache/scripts",
+        max_entries: int = 500,
+        max_bytes: int = 50 * 1024 * 1024,
+    ) -> None:
+        super().__init__(cache_dir, max_entries, max_bytes)
+
+    @staticmethod
+    def make_key(
+        bible_reference: str,
+        model: str,
+        temperature: float,
+        system_prompt: str,
+        user_prompt: str,
+    ) -> str:
+        prompt_hash = hashlib.sha256(
+            (system_prompt + "\x00" + user_prompt).encode("utf-8")
+        ).hexdigest()
+        raw = json.dumps(
+            [reference_key(bible_reference), model, float(temperature), prompt_hash],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ScriptData]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                script = ScriptData.model_validate_json(f.read())
+        except (OSError, ValueError):
+            self._bump("misses")
+            return None
+
+        self._touch(path)
+        self._bump("hits")
+        return script
+
+    def put(self, key: str, script: ScriptData) -> None:
+        atomic_write(self._entry_path(key), script.model_dump_json())
+        self._evict()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _find(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        return path if os.path.exists(path) else None
+
+    def _is_entry(self, name: str) -> bool:
+        return name.endswith(".json")
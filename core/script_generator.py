@@ -1,35 +1,366 @@
 import json
-from typing import Any
+import time
+from typing import Any, Callable, List, Optional
 
 from anthropic import Anthropic
 
-from models.data_models import ImagePrompt, ScriptData, ScriptSection
-from prompts.script_prompt import SYSTEM_PROMPT, get_user_prompt
+from core.json_recovery import RecoveryError, recover_json
+from core.json_stream import SectionStreamReader
+from core.parse_stats import ParseStats
+from core.resilience import get_guard
+from core.script_cache import ScriptCache
+from core.token_usage import TokenUsageStats, usage_to_dict
+from core.verse_index import VerseIndex
+from models.data_models import BibleReference, ImagePrompt, ScriptData, ScriptSection
+from prompts.script_prompt import (
+    SCRIPT_TOOL_NAME,
+    TOOL_MODE_INSTRUCTION,
+    get_script_tool,
+    get_section_regen_prompt,
+    get_system_prompt,
+    get_user_prompt,
+)
+from utils.bible_parser import parse_bible_reference, parse_reference
 from utils.config import load_env, require_env
+from utils.hangul_numerals import normalize_numerals
+
+OUTPUT_MODES = ("json", "tool")
+
+
+def _canonical_reference(bible_reference: str) -> str:
+    """표준 표기('시편 23편'). 장 번호가 범위를 벗어나면 입력을 그대로 사용합니다."""
+    try:
+        return parse_bible_reference(bible_reference)
+    except ValueError:
+        return bible_reference.strip()
+
+
+def _book_of(bible_reference: str) -> Optional[str]:
+    """구절 문자열의 정식 책 이름. 해석할 수 없으면 None."""
+    try:
+        return parse_reference(bible_reference).book
+    except ValueError:
+        return None
 
 
 class ScriptGenerator:
-    def __init__(self, model: str = "claude-sonnet-4-20250514") -> None:
+    def __init__(
+        self,
+        model: str = "claude-sonnet-4-20250514",
+        temperature: float = 0.7,
+        cache: Optional[ScriptCache] = None,
+        use_cache: bool = True,
+        output_mode: str = "json",
+        defer_english: bool = False,
+        verse_index: Optional[VerseIndex] = None,
+    ) -> None:
+        """
+        output_mode: "json" (본문 텍스트로 JSON 출력) 또는
+                     "tool" (tool input_schema로 구조화된 출력)
+        defer_english: True이면 한글 이미지 프롬프트만 생성하고
+                       prompt_english는 대본 확정 후 PromptTranslator로 채웁니다.
+        verse_index: 지정하면(기본값: BIBLE_TEXT_PATH 환경 변수) Reading 섹션은 구절 참조만 생성하고
+                     구절 본문은 로컬 VerseIndex에서 삽입합니다.
+        """
+        if output_mode not in OUTPUT_MODES:
+            raise ValueError(f"Unknown output_mode: {output_mode}")
         load_env()
         api_key = require_env("ANTHROPIC_API_KEY")
-        self.client = Anthropic(api_key=api_key)
+        # 재시도는 공용 복원력 계층(ProviderGuard)이 담당하므로 SDK 자체 재시도는 끔
+        self.guard = get_guard("anthropic")
+        self.client = Anthropic(api_key=api_key, timeout=self.guard.timeout, max_retries=0)
         self.model = model
+        self.temperature = temperature
+        self.cache = cache if cache is not None else (ScriptCache() if use_cache else None)
+        self.output_mode = output_mode
+        self.defer_english = defer_english
+        self.verse_index = verse_index if verse_index is not None else VerseIndex.from_env()
+        self.system_prompt = get_system_prompt(
+            korean_only=defer_english, verse_references=self.verse_index is not None
+        )
+        self.parse_stats = ParseStats()
+        self.token_usage = TokenUsageStats()
+        self.last_usage: dict = {}
+        self.last_cache_hit = False
+        self.last_timing: dict = {"first_section": None, "total": None}
 
-    def generate_script(self, bible_reference: str) -> ScriptData:
+    def generate_script(self, bible_reference: str, force_refresh: bool = False) -> ScriptData:
         """
         Claude API를 호출하여 성경 구절에 대한 스크립트를 생성하고 ScriptData 객체를 반환합니다.
+        캐시에 동일한 요청 결과가 있으면 API 호출 없이 반환합니다.
+        force_refresh=True이면 캐시를 무시하고 새로 생성한 뒤 캐시를 갱신합니다.
         """
-        user_prompt = get_user_prompt(bible_reference)
-        response = self.client.messages.create(
+        user_prompt = self._user_prompt(bible_reference)
+        cache_key = self._cache_key(bible_reference, user_prompt)
+        cached = self._load_cached(cache_key, force_refresh)
+        if cached is not None:
+            return cached
+
+        response = self.guard.call(self.client.messages.create, **self._request_kwargs(user_prompt))
+        data = self._parse_response(response)
+        self._record_usage("generate", response, data)
+        sections = self._build_sections(data, _book_of(bible_reference))
+        self._splice_verses(sections, bible_reference)
+        return self._finish(bible_reference, sections, cache_key)
+
+    def generate_script_stream(
+        self,
+        bible_reference: str,
+        on_section: Optional[Callable[[ScriptSection], None]] = None,
+        force_refresh: bool = False,
+    ) -> ScriptData:
+        """
+        스트리밍 API로 스크립트를 생성합니다.
+        각 섹션 객체가 닫히는 즉시 on_section 콜백으로 ScriptSection을 전달하고,
+        완료 후 전체 ScriptData를 반환합니다.
+        소요 시간은 self.last_timing ({"first_section", "total"}, 초 단위)에 기록됩니다.
+        """
+        started = time.perf_counter()
+        self.last_timing = {"first_section": None, "total": None}
+
+        user_prompt = self._user_prompt(bible_reference)
+        cache_key = self._cache_key(bible_reference, user_prompt)
+        cached = self._load_cached(cache_key, force_refresh)
+        if cached is not None:
+            for section in cached.sections:
+                self._emit(section, on_section, started)
+            self.last_timing["total"] = time.perf_counter() - started
+            return cached
+
+        reader = SectionStreamReader()
+        book = _book_of(bible_reference)
+        streamed: List[ScriptSection] = []
+        # 이미 화면에 보낸 섹션이 중복되지 않도록 스트리밍은 재시도하지 않고 회로 차단만 적용
+        with self.guard.guard(), self.client.messages.stream(**self._request_kwargs(user_prompt)) as stream:
+            for event in stream:
+                chunk = self._stream_chunk(event)
+                if not chunk:
+                    continue
+                for item in reader.feed(chunk):
+                    section = self._build_sections({"sections": [item]}, book)[0]
+                    self._splice_verses([section], bible_reference)
+                    streamed.append(section)
+                    self._emit(section, on_section, started)
+            final_message = stream.get_final_message()
+
+        # 최종 결과는 전체 응답 기준으로 다시 파싱 (스트리밍 중 누락된 섹션 보완)
+        try:
+            data = self._parse_response(final_message)
+            sections = self._build_sections(data, book)
+            self._splice_verses(sections, bible_reference)
+        except ValueError:
+            data = None
+            if not streamed:
+                self._record_usage("stream", final_message)
+                raise
+            sections = streamed
+        self._record_usage("stream", final_message, data)
+
+        for section in sections[len(streamed):]:
+            self._emit(section, on_section, started)
+
+        script = self._finish(bible_reference, sections, cache_key)
+        self.last_timing["total"] = time.perf_counter() - started
+        return script
+
+    def regenerate_section(
+        self, script: ScriptData, index: int, problems: Optional[List[str]] = None
+    ) -> ScriptSection:
+        """
+        script.sections[index] 하나만 다시 생성하여 교체합니다 (image_prompts 포함).
+        앞뒤 섹션 내용을 맥락으로 함께 보내고, 나머지 섹션은 그대로 유지합니다.
+        """
+        if not 0 <= index < len(script.sections):
+            raise IndexError(f"Section index out of range: {index}")
+        current = script.sections[index]
+        previous = script.sections[index - 1].content if index > 0 else ""
+        following = script.sections[index + 1].content if index + 1 < len(script.sections) else ""
+
+        user_prompt = get_section_regen_prompt(
+            bible_passage=script.bible_reference,
+            section_type=current.section_type,
+            current_content=current.content,
+            previous_content=previous,
+            next_content=following,
+            problems=problems or [],
+            korean_only=self.defer_english,
+            verse_references=self.verse_index is not None,
+        )
+        response = self.guard.call(
+            self.client.messages.create,
             model=self.model,
-            max_tokens=8000,
-            temperature=0.7,
-            system=SYSTEM_PROMPT,
+            max_tokens=2000,
+            temperature=self.temperature,
+            system=self._system_blocks(),
             messages=[{"role": "user", "content": user_prompt}],
         )
-
+        self._record_usage("regenerate", response)
         text = self._extract_text(response)
+        try:
+            data = self._parse_json(text)
+        except ValueError:
+            data = recover_json(text)
+
+        # 섹션 타입은 기존 값을 유지 (모델이 다른 이름을 반환해도 순서가 깨지지 않도록)
+        data["section_type"] = current.section_type
+        sections = self._build_sections({"sections": [data]}, _book_of(script.bible_reference))
+        if not sections:
+            raise ValueError(f"{current.section_type} 섹션 재생성 결과가 올바르지 않습니다.")
+        self._splice_verses(sections, script.bible_reference)
+        script.sections[index] = sections[0]
+        return sections[0]
+
+    def is_cached(self, bible_reference: str) -> bool:
+        """API 호출 없이 캐시에서 바로 반환될 수 있는지 확인합니다."""
+        cache_key = self._cache_key(bible_reference, self._user_prompt(bible_reference))
+        return cache_key is not None and self.cache.contains(cache_key)
+
+    def _user_prompt(self, bible_reference: str) -> str:
+        # 표준 표기로 보내야 '시 23', 'Psalm 23'이 같은 프롬프트(= 같은 캐시 키)가 됨
+        user_prompt = get_user_prompt(_canonical_reference(bible_reference))
+        if self.output_mode == "tool":
+            user_prompt += TOOL_MODE_INSTRUCTION
+        return user_prompt
+
+    def _request_kwargs(self, user_prompt: str) -> dict:
+        kwargs = {
+            "model": self.model,
+            "max_tokens": 8000,
+            "temperature": self.temperature,
+            "system": self._system_blocks(),
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+        if self.output_mode == "tool":
+            kwargs["tools"] = [
+                get_script_tool(
+                    korean_only=self.defer_english,
+                    verse_references=self.verse_index is not None,
+                )
+            ]
+            kwargs["tool_choice"] = {"type": "tool", "name": SCRIPT_TOOL_NAME}
+        return kwargs
 
+    def _system_blocks(self) -> List[dict]:
+        """
+        시스템 프롬프트는 모든 호출에서 동일하므로 프롬프트 캐시 지점으로 표시합니다.
+        (tools 정의도 시스템 프롬프트 앞에 위치하므로 함께 캐시됩니다)
+        """
+        return [
+            {"type": "text", "text": self.system_prompt, "cache_control": {"type": "ephemeral"}}
+        ]
+
+    def _record_usage(self, call: str, response: Any, data: Optional[dict] = None) -> None:
+        """응답의 토큰 사용량을 기록합니다. data가 있으면 섹션별 출력 크기도 함께 기록합니다."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        self.last_usage = usage_to_dict(usage)
+        section_sizes = {}
+        for item in (data or {}).get("sections", []):
+            if isinstance(item, dict) and "section_type" in item:
+                size = len(json.dumps(item, ensure_ascii=False))
+                section_type = str(item["section_type"])
+                section_sizes[section_type] = section_sizes.get(section_type, 0) + size
+        try:
+            self.token_usage.record(call, self.last_usage, section_sizes)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _stream_chunk(event: Any) -> Optional[str]:
+        """스트리밍 이벤트에서 JSON 텍스트 조각(text 또는 tool input)을 꺼냅니다."""
+        if getattr(event, "type", None) != "content_block_delta":
+            return None
+        delta = event.delta
+        if delta.type == "text_delta":
+            return delta.text
+        if delta.type == "input_json_delta":
+            return delta.partial_json
+        return None
+
+    def _parse_response(self, response: Any) -> dict:
+        """출력 모드에 맞게 응답을 파싱하고 결과를 모드별 통계에 기록합니다."""
+        if self.output_mode == "tool":
+            tool_input = self._extract_tool_input(response)
+            if tool_input is not None:
+                sections = tool_input.get("sections")
+                if isinstance(sections, list):
+                    self.parse_stats.record(self.output_mode, "direct")
+                    return tool_input
+                if isinstance(sections, str):
+                    # sections 배열이 문자열로 직렬화되어 온 경우
+                    return self._parse_response_text('{"sections": ' + sections + "}")
+                return self._parse_response_text(json.dumps(tool_input, ensure_ascii=False))
+        return self._parse_response_text(self._extract_text(response))
+
+    def _emit(
+        self,
+        section: ScriptSection,
+        on_section: Optional[Callable[[ScriptSection], None]],
+        started: float,
+    ) -> None:
+        if self.last_timing.get("first_section") is None:
+            self.last_timing["first_section"] = time.perf_counter() - started
+        if on_section is not None:
+            on_section(section)
+
+    def _cache_key(self, bible_reference: str, user_prompt: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return ScriptCache.make_key(
+            bible_reference, self.model, self.temperature, self.system_prompt, user_prompt
+        )
+
+    def _load_cached(self, cache_key: Optional[str], force_refresh: bool) -> Optional[ScriptData]:
+        self.last_cache_hit = False
+        # 회로가 열려 있으면 새로 생성하라는 요청이어도 캐시된 대본으로 대체
+        if cache_key is None or (force_refresh and self.guard.available):
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            self.last_cache_hit = True
+        return cached
+
+    def _finish(
+        self, bible_reference: str, sections: List[ScriptSection], cache_key: Optional[str]
+    ) -> ScriptData:
+        script = ScriptData(bible_reference=bible_reference, sections=sections)
+        if cache_key is not None:
+            try:
+                self.cache.put(cache_key, script)
+            except OSError:
+                pass
+        return script
+
+    def _splice_verses(self, sections: List[ScriptSection], bible_reference: str) -> None:
+        """
+        bible_verse 참조가 있는 섹션에 VerseIndex의 구절 본문을 이어 붙입니다.
+        이미 본문이 들어 있거나 찾을 수 없는 참조는 그대로 둡니다.
+        """
+        if self.verse_index is None:
+            return
+        try:
+            context: Optional[BibleReference] = parse_reference(bible_reference)
+        except ValueError:
+            context = None
+        for section in sections:
+            if not section.bible_verse:
+                continue
+            verse_text = self.verse_index.lookup(section.bible_verse, context)
+            if not verse_text:
+                continue
+            # 대본 본문은 _build_sections에서 이미 한글 수사로 바뀌었으므로 삽입하는 구절도 같게 맞춤
+            verse_text = normalize_numerals(verse_text, context.book if context else None)
+            if verse_text in section.content:
+                continue
+            section.content = f'{section.content.rstrip()} "{verse_text}"'
+            # 이미지 구간이 삽입된 구절까지 덮도록 마지막 text_segment를 확장
+            if section.image_prompts:
+                last = section.image_prompts[-1]
+                last.text_segment = f'{last.text_segment.rstrip()} "{verse_text}"'
+
+    def _parse_response_text(self, text: str) -> dict:
+        """응답 텍스트를 JSON으로 파싱합니다. 실패 시 로컬 복구 → 구간 repair 순으로 재시도합니다."""
         # 디버깅: 원본 응답 저장
         debug_file = "/tmp/claude_response_debug.txt"
         try:
@@ -38,40 +369,49 @@ class ScriptGenerator:
         except Exception:
             pass
 
-        # JSON 파싱 시도
+        # 1) 정상 JSON  2) 로컬 복구 파서  3) 오류 주변 구간만 Claude로 복구
         try:
             data = self._parse_json(text)
+            self.parse_stats.record(self.output_mode, "direct")
+            return data
         except Exception as e1:
             try:
-                sanitized = self._sanitize_json_text(text)
-                data = self._parse_json(sanitized)
-            except Exception as e2:
+                data = recover_json(text)
+                self.parse_stats.record(self.output_mode, "local_recovery")
+                return data
+            except RecoveryError as e2:
                 try:
-                    repaired = self._repair_json(text)
-                    data = self._parse_json(repaired)
+                    repaired = self._repair_json_region(text, e2.pos)
+                    data = recover_json(repaired)
+                    self.parse_stats.record(self.output_mode, "model_repair")
+                    return data
                 except Exception as e3:
+                    self.parse_stats.record(self.output_mode, "failed")
                     error_msg = (
                         f"JSON 파싱 실패.\n"
                         f"원본 오류: {str(e1)}\n"
-                        f"Sanitize 후 오류: {str(e2)}\n"
+                        f"로컬 복구 후 오류: {str(e2)}\n"
                         f"Repair 후 오류: {str(e3)}\n"
                         f"디버그 파일: {debug_file}"
                     )
                     raise ValueError(error_msg)
 
-        sections = self._build_sections(data)
-        return ScriptData(bible_reference=bible_reference, sections=sections)
-
     @staticmethod
-    def _build_sections(data: dict) -> list:
-        """파싱된 JSON에서 ScriptSection 리스트를 생성합니다."""
+    def _build_sections(data: dict, book: Optional[str] = None) -> list:
+        """
+        파싱된 JSON에서 ScriptSection 리스트를 생성합니다.
+        book: 대본의 성경 책 (책 이름 없이 쓴 'N:M'을 이 책의 장:절로 읽음)
+        """
         sections = []
-        for item in data["sections"]:
+        for item in data.get("sections", []):
+            # 잘린 응답에서 복구된 미완성 섹션은 제외
+            if not isinstance(item, dict) or "section_type" not in item or "content" not in item:
+                continue
             image_prompts = []
             for ip in item.get("image_prompts", []):
                 image_prompts.append(
                     ImagePrompt(
-                        text_segment=ip.get("text_segment", ""),
+                        text_segment=normalize_numerals(ip.get("text_segment", ""), book),
                         prompt_korean=ip.get("prompt_korean", ""),
                         prompt_english=ip.get("prompt_english", ""),
                     )
@@ -90,12 +430,21 @@ class ScriptGenerator:
             sections.append(
                 ScriptSection(
                     section_type=item["section_type"],
-                    content=item["content"],
+                    # TTS를 위해 남아 있는 아라비아 숫자를 한글 수사로 변환
+                    content=normalize_numerals(item["content"], book),
+                    bible_verse=item.get("bible_verse") or None,
                     image_prompts=image_prompts,
                 )
             )
         return sections
 
+    @staticmethod
+    def _extract_tool_input(response: Any) -> Optional[dict]:
+        for block in getattr(response, "content", None) or []:
+            if getattr(block, "type", None) == "tool_use" and block.name == SCRIPT_TOOL_NAME:
+                return block.input if isinstance(block.input, dict) else None
+        return None
+
     @staticmethod
     def _extract_text(response: Any) -> str:
         if hasattr(response, "content") and response.content:
@@ -127,65 +476,43 @@ class ScriptGenerator:
         except json.JSONDecodeError as e:
             raise ValueError(f"JSON decode error at position {e.pos}: {e.msg}")
 
-    @staticmethod
-    def _sanitize_json_text(text: str) -> str:
-        """JSON 문자열 내부의 개행/따옴표 문제를 완화합니다."""
-        replacements = {
-            "\u201c": '"',
-            "\u201d": '"',
-            "\u2018": "'",
-            "\u2019": "'",
-        }
-        for k, v in replacements.items():
-            text = text.replace(k, v)
-
-        out = []
-        in_string = False
-        escape = False
-        for ch in text:
-            if in_string:
-                if escape:
-                    out.append(ch)
-                    escape = False
-                    continue
-                if ch == "\\":
-                    out.append(ch)
-                    escape = True
-                    continue
-                if ch == '"':
-                    in_string = False
-                    out.append(ch)
-                    continue
-                if ch == "\n":
-                    out.append("\\n")
-                    continue
-                out.append(ch)
-            else:
-                if ch == '"':
-                    in_string = True
-                out.append(ch)
-        return "".join(out)
-
-    def _repair_json(self, text: str) -> str:
-        """Claude가 반환한 텍스트를 JSON으로 복구합니다."""
+    def _repair_json_region(self, text: str, error_pos: int, radius: int = 600) -> str:
+        """
+        오류 위치 주변 구간만 Claude로 복구하여 원문에 다시 끼워 넣습니다.
+        전체 응답을 다시 보내지 않으므로 토큰/지연이 구간 크기에 비례합니다.
+        """
+        start = max(0, error_pos - radius)
+        end = min(len(text), error_pos + radius)
+        # 가까운 줄 경계가 있으면 구간을 줄 단위로 맞춤 (한 줄짜리 JSON이면 그대로 사용)
+        line_start = text.rfind("\n", 0, start)
+        if line_start != -1 and start - line_start <= radius:
+            start = line_start + 1
+        line_end = text.find("\n", end)
+        if line_end != -1 and line_end - end <= radius:
+            end = line_end
+        region = text[start:end]
+
         repair_prompt = (
-            "Fix the following text into a valid JSON object.\n\n"
+            "The following text is a FRAGMENT cut out of a larger JSON document and contains a syntax error.\n\n"
             "CRITICAL RULES:\n"
-            "1. Return ONLY the JSON object - no markdown, no explanations\n"
-            "2. All content must be on SINGLE LINES - replace any line breaks in content with spaces\n"
+            "1. Return ONLY the corrected fragment - no markdown, no explanations\n"
+            "2. Keep the same beginning and end; do not add or remove sections or closing brackets\n"
             "3. Properly escape quotes inside strings with \\\" \n"
             "4. Do NOT use raw newlines inside JSON string values\n"
-            "5. The JSON must have this exact structure:\n"
-            '{"sections": [{"section_type": "...", "content": "...", '
-            '"image_prompts": [{"text_segment": "...", "prompt_korean": "...", "prompt_english": "..."}, ...]}, ...]}\n\n'
-            f"TEXT TO FIX:\n{text}\n\n"
-            "Return the fixed JSON now:"
+            "5. Do NOT change the wording of any string value\n\n"
+            f"FRAGMENT TO FIX:\n{region}\n\n"
+            "Return the fixed fragment now:"
         )
-        response = self.client.messages.create(
+        response = self.guard.call(
+            self.client.messages.create,
             model=self.model,
-            max_tokens=8000,
+            max_tokens=min(8000, len(region) + 500),
             temperature=0.0,
-            system="You are a strict JSON fixer. Return only valid JSON with no markdown formatting.",
+            system="You are a strict JSON fixer. Return only the corrected fragment with no markdown formatting.",
             messages=[{"role": "user", "content": repair_prompt}],
         )
-        return self._extract_text(response)
+        self._record_usage("repair", response)
+        fixed = self._extract_text(response).strip()
+        if fixed.startswith("```"):
+            fixed = "\n".join(line for line in fixed.split("\n") if not line.startswith("```"))
+        return text[:start] + fixed + text[end:]
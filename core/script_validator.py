@@ -0,0 +1,51 @@
+import re
+from typing import List
+
+from models.data_models import ScriptData, ScriptSection, SectionIssue
+from prompts.script_prompt import SECTION_RULES
+
+_ARABIC_NUMERALS = re.compile(r"[0-9]+")
+
+
+def validate_section(section: ScriptSection, index: int) -> List[SectionIssue]:
+    """섹션 하나의 길이, 필수 도입 문구, 아라비아 숫자 사용 여부를 검사합니다."""
+    issues: List[SectionIssue] = []
+    rules = SECTION_RULES.get(section.section_type)
+    content = section.content.strip()
+
+    def add(code: str, message: str) -> None:
+        issues.append(
+            SectionIssue(
+                section_index=index,
+                section_type=section.section_type,
+                code=code,
+                message=message,
+            )
+        )
+
+    if rules:
+        length = len(content)
+        if length < rules["min_chars"]:
+            add("length_short", f"분량 부족: {length}자 (기준 {rules['min_chars']}–{rules['max_chars']}자)")
+        elif length > rules["max_chars"]:
+            add("length_long", f"분량 초과: {length}자 (기준 {rules['min_chars']}–{rules['max_chars']}자)")
+
+        starts_with = rules.get("starts_with")
+        if starts_with and not content.startswith(starts_with):
+            add("lead_in", f"'{starts_with}'(으)로 시작해야 합니다.")
+        contains = rules.get("contains")
+        if contains and contains not in content:
+            add("lead_in", f"'{contains}' 문구가 필요합니다.")
+
+    numerals = _ARABIC_NUMERALS.findall(content)
+    if numerals:
+        add("numerals", f"아라비아 숫자 사용: {', '.join(numerals[:5])}")
+
+    return issues
+
+
+def validate_script(script: ScriptData) -> List[SectionIssue]:
+    issues: List[SectionIssue] = []
+    for index, section in enumerate(script.sections):
+        issues.extend(validate_section(section, index))
+    return issues
@@ -0,0 +1,137 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+# 파생 화면 비율: 이름 -> (가로, 세로)
+ASPECT_VARIANTS = {
+    "9:16": (9, 16),
+    "1:1": (1, 1),
+}
+DEFAULT_VARIANTS = ("9:16", "1:1")
+
+# 에너지 계산용 축소 폭 (원본 해상도와 무관하게 일정한 비용)
+_ANALYSIS_WIDTH = 384
+# 가장자리보다 가운데를 약간 선호 (0이면 순수 에너지 기준)
+_CENTER_WEIGHT = 0.15
+_SAVE_OPTIONS = {"JPEG": {"quality": 90}, "WEBP": {"quality": 90}}
+
+
+def variant_path(image_path: str, ratio: str) -> str:
+    """예: 01_Opening_00.png + '9:16' -> 01_Opening_00_9x16.png"""
+    stem, ext = os.path.splitext(image_path)
+    return f"{stem}_{ratio.replace(':', 'x')}{ext}"
+
+
+def energy_map(gray: np.ndarray) -> np.ndarray:
+    """
+    그레이스케일 배열의 에지 에너지(가로/세로 기울기 절댓값 합)에
+    전체 평균과 다른 밝기(대비) 항을 더한 간단한 saliency 맵을 반환합니다.
+    """
+    gray = gray.astype(np.float32)
+    energy = np.zeros_like(gray)
+    energy[:, 1:] += np.abs(np.diff(gray, axis=1))
+    energy[1:, :] += np.abs(np.diff(gray, axis=0))
+    energy += 0.5 * np.abs(gray - gray.mean())
+    return energy
+
+
+def best_window(profile: np.ndarray, window: int) -> int:
+    """1차원 에너지 프로파일에서 합이 최대인 길이 window 구간의 시작 위치 (누적합으로 O(n))"""
+    n = profile.shape[0]
+    if window >= n:
+        return 0
+    cumsum = np.concatenate(([0.0], np.cumsum(profile, dtype=np.float64)))
+    sums = cumsum[window:] - cumsum[:-window]
+    if _CENTER_WEIGHT:
+        positions = np.arange(sums.shape[0], dtype=np.float64)
+        center = (n - window) / 2.0
+        distance = np.abs(positions - center) / max(center, 1.0)
+        sums = sums * (1.0 - _CENTER_WEIGHT * distance)
+    return int(np.argmax(sums))
+
+
+def crop_box(size: Tuple[int, int], energy: np.ndarray, ratio: Tuple[int, int]) -> Tuple[int, int, int, int]:
+    """
+    원본 크기(size)와 축소 에너지 맵으로 목표 비율의 최대 크기 crop 상자를 구합니다.
+    원본보다 세로로 긴 비율이면 세로 전체를 쓰고 가로 위치를, 아니면 가로 전체를 쓰고 세로 위치를 고릅니다.
+    """
+    width, height = size
+    target = ratio[0] / ratio[1]
+    scale = energy.shape[1] / width
+    if target < width / height:
+        crop_w = max(1, round(height * target))
+        start = best_window(energy.sum(axis=0), max(1, round(crop_w * scale)))
+        left = min(width - crop_w, round(start / scale))
+        return (left, 0, left + crop_w, height)
+    crop_h = max(1, round(width / target))
+    start = best_window(energy.sum(axis=1), max(1, round(crop_h * scale)))
+    top = min(height - crop_h, round(start / scale))
+    return (0, top, width, top + crop_h)
+
+
+def derive_variants(image_path: str, ratios: Sequence[str] = DEFAULT_VARIANTS) -> Dict[str, str]:
+    """
+    마스터 이미지 한 장에서 화면 비율별 crop 이미지를 만들어 원본 옆에 저장합니다.
+    이미 최신 파생 이미지가 있으면 다시 만들지 않습니다.
+    Returns: {비율: 파일 경로}
+    """
+    results: Dict[str, str] = {}
+    pending = []
+    master_mtime = os.path.getmtime(image_path)
+    for ratio in ratios:
+        path = variant_path(image_path, ratio)
+        if os.path.exists(path) and os.path.getmtime(path) >= master_mtime:
+            results[ratio] = path
+        else:
+            pending.append(ratio)
+    if not pending:
+        return results
+
+    with Image.open(image_path) as img:
+        img.load()
+        fmt = img.format or "PNG"
+        analysis_height = max(1, round(img.height * _ANALYSIS_WIDTH / img.width))
+        small = img.convert("L").resize((_ANALYSIS_WIDTH, analysis_height), Image.Resampling.BILINEAR)
+        energy = energy_map(np.asarray(small))
+        for ratio in pending:
+            box = crop_box(img.size, energy, ASPECT_VARIANTS[ratio])
+            path = variant_path(image_path, ratio)
+            tmp_path = f"{path}.tmp"
+            img.crop(box).save(tmp_path, format=fmt, **_SAVE_OPTIONS.get(fmt, {}))
+            os.replace(tmp_path, path)
+            results[ratio] = path
+    return results
+
+
+def _derive_safe(args: Tuple[str, Tuple[str, ...]]) -> Tuple[str, Dict[str, str], Optional[str]]:
+    image_path, ratios = args
+    try:
+        return image_path, derive_variants(image_path, ratios), None
+    except Exception as e:
+        return image_path, {}, str(e)
+
+
+def derive_variants_batch(
+    image_paths: List[str],
+    ratios: Sequence[str] = DEFAULT_VARIANTS,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Tuple[Dict[str, str], Optional[str]]]:
+    """
+    여러 마스터 이미지의 파생 이미지를 프로세스 풀에서 병렬로 만듭니다 (디코딩/crop/인코딩은 CPU 작업).
+    Returns: {원본 경로: ({비율: 파일 경로}, 오류 메시지 또는 None)}
+    """
+    jobs = [(path, tuple(ratios)) for path in image_paths]
+    if not jobs:
+        return {}
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        outputs = map(_derive_safe, jobs)
+        return {path: (variants, error) for path, variants, error in outputs}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return {
+            path: (variants, error)
+            for path, variants, error in executor.map(_derive_safe, jobs)
+        }
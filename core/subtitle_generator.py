@@ -4,6 +4,7 @@ from typing import List, Optional
 import google.generativeai as genai
 from pydub import AudioSegment
 
+from core.resilience import get_guard
 from models.data_models import AudioBlock, ScriptSection, TimestampedSection
 from utils.config import load_env, get_env
 
@@ -13,6 +14,9 @@ class SubtitleGenerator:
         load_env()
         self.api_key = get_env("GOOGLE_API_KEY")
         self.model = model
+        self.guard = get_guard("gemini_text")
+        # Gemini 대신 로컬 타임스탬프로 만든 경우 그 이유 (Gemini를 사용했으면 None)
+        self.last_fallback_reason: Optional[str] = None
         if self.api_key:
             genai.configure(api_key=self.api_key)
 
@@ -23,11 +27,18 @@ class SubtitleGenerator:
         audio_blocks: List[AudioBlock],
         timestamps: Optional[List[TimestampedSection]] = None,
     ) -> str:
+        """
+        Gemini로 오디오를 듣고 SRT를 만들고, 실패하거나 회로가 열려 있으면 섹션 타임스탬프로 만듭니다.
+        Gemini 호출은 제한 시간(GEMINI_TEXT_TIMEOUT_SECONDS)을 넘기면 끊고 바로 대체 경로로 넘어갑니다.
+        """
+        self.last_fallback_reason = None
         if audio_bytes and self.api_key:
             try:
-                return self._generate_srt_with_gemini(audio_bytes, sections)
-            except Exception:
-                pass
+                return self.guard.call(self._generate_srt_with_gemini, audio_bytes, sections)
+            except Exception as e:
+                self.last_fallback_reason = str(e)
+        elif audio_bytes:
+            self.last_fallback_reason = "GOOGLE_API_KEY가 설정되지 않았습니다."
 
         if timestamps:
             return self._generate_srt_from_timestamps(sections, timestamps)
@@ -52,7 +63,8 @@ class SubtitleGenerator:
                 prompt,
                 script_text,
                 {"mime_type": "audio/mpeg", "data": audio_bytes},
-            ]
+            ],
+            request_options={"timeout": self.guard.timeout},
         )
         text = getattr(response, "text", None)
         if not text:
@@ -69,7 +81,7 @@ class SubtitleGenerator:
             duration = block.duration_seconds
             if block.audio_data:
                 try:
-                    segment = AudioSegment.from_mp3(io.BytesIO(block.audio_data))
+                    segment = AudioSegment.from_file(io.BytesIO(block.audio_data), format=block.audio_format)
                     duration = max(duration, len(segment) / 1000.0)
                 except Exception:
                     pass
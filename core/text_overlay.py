@@ -1,86 +1,216 @@
+import math
 import os
-import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
 from PIL import Image, ImageDraw, ImageFont
 
+from models.data_models import OverlayBatchReport
+from utils.config import get_env, load_env
+
+DEFAULT_FONT_PATH = "assets/fonts/NanumSquareRoundB.ttf"
+DEFAULT_FONT_SIZE = 50
+# 자막 한 줄의 최대 폭 (이미지 너비 대비)
+MAX_LINE_RATIO = 0.8
+LAYER_PADDING = 20
+SHADOW_OFFSET = 2
+_SAVE_OPTIONS = {"JPEG": {"quality": 92}, "WEBP": {"quality": 92}}
+# 폰트 하나당 보관하는 글자 폭 수 (넘으면 비우고 다시 채움)
+MAX_CACHED_GLYPHS = 4096
+
+@lru_cache(maxsize=32)
+def load_font(font_path: str, font_size: int) -> ImageFont.FreeTypeFont:
+    """(경로, 크기)별로 폰트를 한 번만 로드합니다. 파일이 없으면 Pillow 기본 폰트를 사용합니다 (한글 깨질 수 있음)."""
+    try:
+        return ImageFont.truetype(font_path, font_size)
+    except IOError:
+        return ImageFont.load_default(font_size)
+
+
+def font_missing(font_path: str) -> bool:
+    """폰트 파일이 없어 load_font가 기본 폰트로 대체하는지 여부 (화면에서 안내용)"""
+    return not os.path.isfile(font_path)
+
+
+@lru_cache(maxsize=32)
+def _glyph_widths(font_path: str, font_size: int) -> Dict[str, float]:
+    """(경로, 크기)별 글자 폭 캐시 {글자: 폭(px)}. load_font와 같은 수의 폰트만 보관합니다."""
+    return {}
+
+
+def text_width(text: str, font_path: str, font_size: int) -> float:
+    """글자별 advance 폭(캐시)의 합으로 한 줄의 픽셀 폭을 계산합니다."""
+    widths = _glyph_widths(font_path, font_size)
+    total = 0.0
+    for char in text:
+        width = widths.get(char)
+        if width is None:
+            if len(widths) >= MAX_CACHED_GLYPHS:
+                widths.clear()
+            width = widths[char] = load_font(font_path, font_size).getlength(char)
+        total += width
+    return total
+
+
+def wrap_text(text: str, max_width: float, font_path: str, font_size: int) -> List[str]:
+    """
+    측정한 글자 폭 기준으로 max_width를 넘지 않게 줄을 나눕니다.
+    어절(공백) 단위로 나누고, 한 어절이 한 줄보다 길면 글자 단위로 나눕니다.
+    """
+    space = text_width(" ", font_path, font_size)
+    lines: List[str] = []
+    for paragraph in text.splitlines() or [""]:
+        line, line_width = "", 0.0
+        for word in paragraph.split():
+            word_width = text_width(word, font_path, font_size)
+            if line and line_width + space + word_width <= max_width:
+                line, line_width = f"{line} {word}", line_width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            line, line_width = "", 0.0
+            for char in word:
+                char_width = text_width(char, font_path, font_size)
+                if line and line_width + char_width > max_width:
+                    lines.append(line)
+                    line, line_width = "", 0.0
+                line, line_width = line + char, line_width + char_width
+        lines.append(line)
+    return lines
+
+
 class TextOverlay:
-    def __init__(self):
-        # 폰트 경로 설정 (없으면 기본 폰트 사용 시도)
-        self.font_path = "assets/fonts/NanumSquareRoundB.ttf"
-        self.default_font_size = 50
+    def __init__(self, font_path: Optional[str] = None, font_size: int = DEFAULT_FONT_SIZE):
+        """font_path 기본값은 OVERLAY_FONT_PATH 환경 변수, 없으면 assets/fonts/NanumSquareRoundB.ttf"""
+        load_env()
+        self.font_path = font_path or get_env("OVERLAY_FONT_PATH", DEFAULT_FONT_PATH)
+        self.default_font_size = font_size
+
+    @property
+    def font(self) -> ImageFont.FreeTypeFont:
+        return load_font(self.font_path, self.default_font_size)
+
+    @property
+    def font_missing(self) -> bool:
+        return font_missing(self.font_path)
+
+    def wrap(self, text: str, max_width: float) -> List[str]:
+        return wrap_text(text, max_width, self.font_path, self.default_font_size)
 
-    def add_text_to_image(self, image_path: str, text: str) -> str:
+    def add_text_to_image(self, image_path: str, text: str, output_path: str) -> str:
         """
-        이미지에 텍스트(자막)를 오버레이하고 덮어씁니다.
+        이미지에 텍스트(자막)를 입힌 사본을 output_path에 저장합니다 (원본은 변경하지 않음).
         """
+        if os.path.abspath(output_path) == os.path.abspath(image_path):
+            raise ValueError("output_path must differ from image_path (originals are never overwritten).")
         try:
-            img = Image.open(image_path).convert("RGBA")
-            draw = ImageDraw.Draw(img)
-            width, height = img.size
-
-            # 폰트 로드
-            try:
-                font = ImageFont.truetype(self.font_path, self.default_font_size)
-            except IOError:
-                # 폰트 파일이 없으면 기본 폰트 로드 (한글 깨질 수 있음)
-                font = ImageFont.load_default()
-                print(f"Warning: Font file not found at {self.font_path}. Using default font.")
-
-            # 텍스트 줄바꿈 (이미지 너비의 80% 기준)
-            # 대략적인 글자 수 계산 (한글 기준)
-            chars_per_line = int((width * 0.8) / self.default_font_size)
-            wrapped_text = textwrap.fill(text, width=chars_per_line)
-
-            # 텍스트 크기 계산 (bbox 사용)
-            bbox = draw.multiline_textbbox((0, 0), wrapped_text, font=font, align="center")
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            # 위치 계산 (중앙 하단)
-            x = (width - text_width) / 2
-            y = height * 0.75  # 하단 75% 지점
-
-            # 텍스트 배경 (반투명 검정 박스) - 가독성 확보
-            padding = 20
-            bg_x0 = x - padding
-            bg_y0 = y - padding
-            bg_x1 = x + text_width + padding
-            bg_y1 = y + text_height + padding
-            
-            # 반투명 레이어 생성
-            overlay = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            draw_overlay = ImageDraw.Draw(overlay)
-            draw_overlay.rectangle(
-                [bg_x0, bg_y0, bg_x1, bg_y1], 
-                fill=(0, 0, 0, 120) # 검정색, 투명도 120
-            )
-            
-            # 원본과 합성
-            img = Image.alpha_composite(img, overlay)
-            draw = ImageDraw.Draw(img)
-
-            # 텍스트 그리기 (그림자 효과 + 흰색 글씨)
-            shadow_offset = 2
-            # 그림자
-            draw.multiline_text(
-                (x + shadow_offset, y + shadow_offset), 
-                wrapped_text, 
-                font=font, 
-                fill=(0, 0, 0, 200), 
-                align="center"
-            )
-            # 본문
-            draw.multiline_text(
-                (x, y), 
-                wrapped_text, 
-                font=font, 
-                fill=(255, 255, 255, 255), 
-                align="center"
-            )
-
-            # 저장 (RGB로 변환하여 PNG 저장)
+            tmp_path = f"{output_path}.tmp"
+            with Image.open(image_path) as source:
+                fmt = source.format or "PNG"
+                self.composite(source, text).save(tmp_path, format=fmt, **_SAVE_OPTIONS.get(fmt, {}))
+            os.replace(tmp_path, output_path)
+            return output_path
+        except Exception as e:
+            raise RuntimeError(f"Failed to add text overlay: {str(e)}")
+
+    def composite(self, img: Image.Image, text: str, font_size: Optional[int] = None) -> Image.Image:
+        """
+        자막 레이어를 이미지 하단(75% 지점) 가운데에 합성한 이미지를 반환합니다.
+        전체 프레임이 아니라 자막 상자 영역만 잘라 합성하므로 추가 메모리는 자막 영역 크기 정도입니다.
+        img가 RGB/RGBA이면 그 이미지에 직접 그리므로, 파일에서 연 이미지를 넘기면 원본 파일은 그대로입니다.
+        font_size: 미리보기처럼 축소된 이미지에 쓸 때 지정 (기본값은 default_font_size)
+        """
+        if img.mode not in ("RGB", "RGBA"):
             img = img.convert("RGB")
-            img.save(image_path)
-            return image_path
+        width, height = img.size
+        font_size = font_size or self.default_font_size
+        layer = text_layer(text, self.font_path, font_size, int(width * MAX_LINE_RATIO))
 
-        except Exception as e:
-            raise RuntimeError(f"Failed to add text overlay: {str(e)}")
\ No newline at end of file
+        left = round((width - layer.width) / 2)
+        top = round(height * 0.75 - LAYER_PADDING)
+        return paste_layer(img, layer, left, top)
+
+
+def paste_layer(img: Image.Image, layer: Image.Image, left: int, top: int) -> Image.Image:
+    """RGBA 레이어를 (left, top)에 알파 합성합니다. 이미지 밖으로 나간 부분은 잘라내고 겹치는 영역만 처리합니다."""
+    width, height = img.size
+    box = (max(0, left), max(0, top), min(width, left + layer.width), min(height, top + layer.height))
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return img
+    region = img.crop(box).convert("RGBA")
+    region.alpha_composite(layer.crop((box[0] - left, box[1] - top, box[2] - left, box[3] - top)))
+    img.paste(region.convert(img.mode), box[:2])
+    return img
+
+
+@lru_cache(maxsize=256)
+def text_layer(text: str, font_path: str, font_size: int, max_width: int) -> Image.Image:
+    """
+    반투명 배경 상자 + 그림자 + 흰 글씨로 된 자막 상자 크기의 RGBA 레이어.
+    (자막, 폰트, 크기, 최대 폭)별로 캐시되므로 반환된 이미지를 수정하지 마세요.
+    """
+    font = load_font(font_path, font_size)
+    wrapped_text = "\n".join(wrap_text(text, max_width, font_path, font_size))
+    bbox = ImageDraw.Draw(Image.new("RGBA", (1, 1))).multiline_textbbox(
+        (0, 0), wrapped_text, font=font, align="center"
+    )
+    text_w = math.ceil(bbox[2] - bbox[0])
+    text_h = math.ceil(bbox[3] - bbox[1])
+
+    # 텍스트 배경 (반투명 검정 박스) - 가독성 확보
+    layer = Image.new("RGBA", (text_w + 2 * LAYER_PADDING, text_h + 2 * LAYER_PADDING), (0, 0, 0, 120))
+    draw = ImageDraw.Draw(layer)
+    # 텍스트 그리기 (그림자 효과 + 흰색 글씨)
+    origin = (LAYER_PADDING, LAYER_PADDING)
+    draw.multiline_text(
+        (origin[0] + SHADOW_OFFSET, origin[1] + SHADOW_OFFSET), wrapped_text, font=font,
+        fill=(0, 0, 0, 200), align="center",
+    )
+    draw.multiline_text(origin, wrapped_text, font=font, fill=(255, 255, 255, 255), align="center")
+    return layer
+
+
+def _overlay_safe(args: Tuple[str, str, str, str, int]) -> Tuple[str, Optional[str], Optional[str]]:
+    # 워커 프로세스마다 load_font 캐시가 따로 있으므로 폰트는 프로세스당 한 번만 로드됨
+    image_path, text, output_path, font_path, font_size = args
+    try:
+        TextOverlay(font_path, font_size).add_text_to_image(image_path, text, output_path)
+        return image_path, output_path, None
+    except Exception as e:
+        return image_path, None, str(e)
+
+
+def overlay_batch(
+    jobs: Sequence[Tuple[str, str, str]],
+    font_path: Optional[str] = None,
+    font_size: int = DEFAULT_FONT_SIZE,
+    max_workers: Optional[int] = None,
+) -> OverlayBatchReport:
+    """
+    (원본 경로, 자막, 출력 경로) 목록을 프로세스 풀에서 병렬로 처리합니다 (디코딩/합성/인코딩은 CPU 작업).
+    기본 워커 수는 CPU 코어 수입니다.
+    """
+    report = OverlayBatchReport()
+    if not jobs:
+        return report
+    font_path = TextOverlay(font_path).font_path
+    args = [(image_path, text, output_path, font_path, font_size) for image_path, text, output_path in jobs]
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(args)))
+    report.workers = workers
+
+    started = time.perf_counter()
+    if workers == 1:
+        outputs = list(map(_overlay_safe, args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_overlay_safe, args, chunksize=max(1, len(args) // (workers * 4))))
+    report.elapsed_seconds = time.perf_counter() - started
+
+    for image_path, output_path, error in outputs:
+        if error:
+            report.errors[image_path] = error
+        else:
+            report.outputs[image_path] = output_path
+    return report
@@ -0,0 +1,53 @@
+import io
+import os
+from typing import Tuple
+
+from PIL import Image
+
+from utils.file_io import atomic_write
+
+# 갤러리 카드용 / 확대 보기용 크기 (16:9 기준 최대 폭, 높이)
+THUMBNAIL_SIZE = (480, 270)
+PREVIEW_SIZE = (1280, 720)
+THUMB_DIR_NAME = "_thumbs"
+THUMB_QUALITY = 82
+
+
+def get_thumbnail(image_path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> str:
+    """
+    원본 옆 _thumbs/ 폴더에 고정 크기 JPEG 썸네일을 한 번만 만들고 그 경로를 반환합니다.
+    원본이 썸네일보다 새로우면(재생성 등) 다시 만듭니다.
+    썸네일을 만들 수 없으면 원본 경로를 그대로 반환합니다.
+    """
+    thumb_path = thumbnail_path(image_path, size)
+    try:
+        source_mtime = os.path.getmtime(image_path)
+        if os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= source_mtime:
+            return thumb_path
+        _render(image_path, thumb_path, size)
+        return thumb_path
+    except (OSError, ValueError):
+        return image_path
+
+
+def get_preview(image_path: str) -> str:
+    """확대 보기용 중간 크기 이미지 경로"""
+    return get_thumbnail(image_path, PREVIEW_SIZE)
+
+
+def thumbnail_path(image_path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> str:
+    directory, filename = os.path.split(image_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, THUMB_DIR_NAME, f"{stem}_{size[0]}x{size[1]}.jpg")
+
+
+def _render(image_path: str, thumb_path: str, size: Tuple[int, int]) -> None:
+    os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+    with Image.open(image_path) as img:
+        # JPEG 디코더는 목표 크기에 가까운 축소 스케일로 바로 디코딩
+        img.draft("RGB", size)
+        img = img.convert("RGB")
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=THUMB_QUALITY, optimize=True)
+    atomic_write(thumb_path, buffer.getvalue())
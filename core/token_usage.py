@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from utils.file_io import atomic_write
+
+# 응답 usage에서 누적하는 필드
+USAGE_FIELDS = (
+    "input_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+    "output_tokens",
+)
+
+
+def usage_to_dict(usage: Any) -> Dict[str, int]:
+    """Anthropic 응답의 usage 객체를 {필드: 토큰 수} 딕셔너리로 변환합니다 (없는 값은 0)."""
+    return {field: int(getattr(usage, field, 0) or 0) for field in USAGE_FIELDS}
+
+
+class TokenUsageStats:
+    """
+    Claude 호출 종류(generate/stream/regenerate/repair)별 토큰 사용량을 디스크에 누적 기록합니다.
+    - input_tokens: 캐시되지 않은 입력 토큰
+    - cache_creation_input_tokens: 이번 호출에서 캐시에 기록된 입력 토큰
+    - cache_read_input_tokens: 캐시에서 읽은 입력 토큰 (시스템 프롬프트 재사용분)
+    - output_tokens: 출력 토큰
+    대본 생성 호출은 섹션 타입별 출력 크기도 함께 기록하여 어떤 섹션이 출력 토큰을 차지하는지 보여줍니다.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str = "output/Stats/token_usage.json") -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+    def record(
+        self,
+        call: str,
+        usage: Dict[str, int],
+        section_sizes: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """
+        section_sizes: {section_type: 해당 섹션 JSON 문자 수}.
+        출력 토큰을 문자 수 비율로 섹션에 나누어 추정치로 누적합니다.
+        """
+        with self._lock:
+            data = self._read()
+            calls = data.setdefault("calls", {})
+            counters = calls.setdefault(call, {})
+            counters["calls"] = counters.get("calls", 0) + 1
+            for field in USAGE_FIELDS:
+                counters[field] = counters.get(field, 0) + usage.get(field, 0)
+
+            total_chars = sum(section_sizes.values()) if section_sizes else 0
+            if total_chars:
+                sections = data.setdefault("sections", {})
+                for section_type, chars in section_sizes.items():
+                    row = sections.setdefault(section_type, {"count": 0, "chars": 0, "output_tokens": 0.0})
+                    row["count"] += 1
+                    row["chars"] += chars
+                    row["output_tokens"] += usage.get("output_tokens", 0) * chars / total_chars
+            self._write(data)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for call, counters in self._read().get("calls", {}).items():
+            row = {field: counters.get(field, 0) for field in USAGE_FIELDS}
+            row["calls"] = counters.get("calls", 0)
+            prompt_tokens = (
+                row["input_tokens"] + row["cache_creation_input_tokens"] + row["cache_read_input_tokens"]
+            )
+            # 전체 입력 중 캐시에서 읽은 비율
+            row["cache_read_rate"] = (
+                row["cache_read_input_tokens"] / prompt_tokens if prompt_tokens else 0.0
+            )
+            row["avg_output_tokens"] = row["output_tokens"] / row["calls"] if row["calls"] else 0.0
+            result[call] = row
+        return result
+
+    def section_summary(self) -> List[Dict[str, float]]:
+        """섹션 타입별 평균 출력 크기 (추정 출력 토큰 기준 내림차순)"""
+        rows = []
+        for section_type, row in self._read().get("sections", {}).items():
+            count = row.get("count", 0) or 1
+            rows.append({
+                "section_type": section_type,
+                "count": row.get("count", 0),
+                "avg_chars": row.get("chars", 0) / count,
+                "avg_output_tokens": row.get("output_tokens", 0.0) / count,
+            })
+        return sorted(rows, key=lambda r: r["avg_output_tokens"], reverse=True)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, data: dict) -> None:
+        atomic_write(self.path, json.dumps(data))
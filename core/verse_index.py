@@ -0,0 +1,245 @@
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+from models.data_models import BibleReference
+from utils.bible_data import BOOK_ORDER
+from utils.bible_parser import parse_reference, resolve_book
+from utils.config import get_env, load_env
+from utils.file_io import atomic_write
+
+# 인덱스 파일 형식
+#   verses.idx : 헤더(매직 8바이트 + 레코드 수 u32) + 레코드(key u32, offset u32, length u32) * N
+#   verses.bin : 절 본문을 이어 붙인 UTF-8 바이트열
+# key = 책 번호(BOOK_ORDER 순서) << 20 | 장 << 10 | 절  → 정렬 순서 = 정경 순서
+_MAGIC = b"EBVIDX01"
+_HEADER = struct.Struct("<8sI")
+_RECORD = struct.Struct("<III")
+_KEY = struct.Struct("<I")
+
+_BOOK_IDS = {book: i for i, book in enumerate(BOOK_ORDER)}
+
+# '창 1:1 태초에...', '창세기 1:1 ...', 'Gen 1:1 ...' 형식
+_VERSE_LINE = re.compile(r"^(?P<book>.*?)\s*(?P<ch>\d+)\s*:\s*(?P<vs>\d+)\s+(?P<text>\S.*)$")
+# 책/장 없이 절만 적은 참조: '16절', '16-18절'
+_VERSE_ONLY = re.compile(r"^(?P<vs>\d+)\s*(?:[-~–]\s*(?P<ve>\d+))?\s*절$")
+
+
+def make_key(book: str, chapter: int, verse: int) -> int:
+    return (_BOOK_IDS[book] << 20) | (chapter << 10) | verse
+
+
+def _parse_line(line: str) -> Optional[Tuple[int, str]]:
+    """원본 텍스트 한 줄을 (key, 본문)으로 변환합니다. 해석할 수 없으면 None."""
+    fields = line.split("\t")
+    if len(fields) >= 4 and fields[1].strip().isdigit() and fields[2].strip().isdigit():
+        # 탭 구분 형식: 책<TAB>장<TAB>절<TAB>본문
+        book_name, chapter, verse, text = fields[0], fields[1], fields[2], "\t".join(fields[3:])
+    else:
+        match = _VERSE_LINE.match(line)
+        if match is None:
+            return None
+        book_name, chapter, verse, text = match.group("book", "ch", "vs", "text")
+
+    book = resolve_book(book_name.strip())
+    text = text.strip()
+    chapter, verse = int(chapter), int(verse)
+    if book is None or not text or not (0 < chapter < 1024 and 0 < verse < 1024):
+        return None
+    return make_key(book, chapter, verse), text
+
+
+class VerseIndex:
+    """
+    사용자가 제공한 성경 본문 파일을 (책, 장, 절) 주소의 고정 폭 인덱스로 한 번 컴파일하고,
+    이후에는 mmap으로 열어 이진 탐색으로 절 본문을 조회합니다.
+    인덱스는 첫 조회 시점에 로드되며, 원본 파일이 바뀌면 다시 컴파일합니다.
+
+    지원하는 원본 형식 (한 줄에 한 절, '#'으로 시작하는 줄은 무시):
+      창 1:1 태초에 하나님이 천지를 창조하시니라
+      창세기<TAB>1<TAB>1<TAB>태초에 하나님이 천지를 창조하시니라
+    """
+
+    INDEX_FILE = "verses.idx"
+    BLOB_FILE = "verses.bin"
+    META_FILE = "meta.json"
+    # 같은 원본 파일은 프로세스 안에서 한 번만 열도록 공유 (일괄 생성 워커 등)
+    _shared: Dict[str, "VerseIndex"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, source_path: str, index_dir: str = "output/Cache/verse_index") -> None:
+        self.source_path = source_path
+        self.index_dir = index_dir
+        self.count = 0
+        self.skipped_lines = 0
+        self._index: Optional[mmap.mmap] = None
+        self._blob: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @classmethod
+    def from_env(cls) -> Optional["VerseIndex"]:
+        """BIBLE_TEXT_PATH 환경 변수에 본문 파일이 지정되어 있으면 VerseIndex를 반환합니다."""
+        load_env()
+        path = get_env("BIBLE_TEXT_PATH")
+        if not path or not os.path.isfile(path):
+            return None
+        key = os.path.abspath(path)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(path)
+            return cls._shared[key]
+
+    def get_verse(self, book: str, chapter: int, verse: int) -> Optional[str]:
+        return self.get_passage(book, chapter, verse)
+
+    def get_passage(
+        self, book: str, chapter: int, verse_start: int, verse_end: Optional[int] = None
+    ) -> Optional[str]:
+        """verse_start-verse_end 구간의 절들을 공백으로 이어 반환합니다. 하나도 없으면 None."""
+        verse_end = verse_start if verse_end is None else verse_end
+        if book not in _BOOK_IDS or not (0 < chapter < 1024 and 0 < verse_start <= verse_end < 1024):
+            return None
+        texts = list(
+            self._iter_range(make_key(book, chapter, verse_start), make_key(book, chapter, verse_end))
+        )
+        return " ".join(texts) if texts else None
+
+    def lookup(self, reference: str, context: Optional[BibleReference] = None) -> Optional[str]:
+        """
+        '시편 23:1', '요 3:16-18', '16절' 같은 참조 문자열의 본문을 반환합니다.
+        책/장이 생략된 참조는 context(대본의 성경 구절)의 책/장으로 보완합니다.
+        절이 지정되지 않았거나 본문을 찾을 수 없으면 None.
+        """
+        reference = reference.strip()
+        match = _VERSE_ONLY.match(reference)
+        if match and context is not None:
+            ref = BibleReference(
+                book=context.book,
+                chapter=context.chapter,
+                verse_start=int(match.group("vs")),
+                verse_end=int(match.group("ve")) if match.group("ve") else None,
+            )
+        else:
+            try:
+                ref = parse_reference(reference)
+            except ValueError:
+                return None
+        if ref.verse_start is None:
+            return None
+        return self.get_passage(ref.book, ref.chapter, ref.verse_start, ref.verse_end)
+
+    def compile(self) -> int:
+        """원본 파일을 읽어 인덱스/본문 파일을 새로 만듭니다. 인덱싱된 절 수를 반환합니다."""
+        verses = {}
+        skipped = 0
+        with open(self.source_path, "r", encoding="utf-8-sig") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                parsed = _parse_line(line)
+                if parsed is None:
+                    skipped += 1
+                    continue
+                key, text = parsed
+                verses[key] = text
+
+        records = bytearray(_HEADER.pack(_MAGIC, len(verses)))
+        blob = bytearray()
+        for key in sorted(verses):
+            encoded = verses[key].encode("utf-8")
+            records += _RECORD.pack(key, len(blob), len(encoded))
+            blob += encoded
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._close()
+        self._atomic_write(self.BLOB_FILE, bytes(blob))
+        self._atomic_write(self.INDEX_FILE, bytes(records))
+        meta = dict(self._source_signature(), count=len(verses), skipped=skipped)
+        self._atomic_write(self.META_FILE, json.dumps(meta).encode("utf-8"))
+        self.count = len(verses)
+        self.skipped_lines = skipped
+        return self.count
+
+    def _iter_range(self, start_key: int, end_key: int) -> Iterator[str]:
+        self._ensure_loaded()
+        if not self.count:
+            return
+        index, blob = self._index, self._blob
+        # start_key 이상인 첫 레코드 (lower bound)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _KEY.unpack_from(index, _HEADER.size + mid * _RECORD.size)[0] < start_key:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self.count:
+            key, offset, length = _RECORD.unpack_from(index, _HEADER.size + lo * _RECORD.size)
+            if key > end_key:
+                break
+            yield blob[offset : offset + length].decode("utf-8")
+            lo += 1
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            if not self._is_fresh():
+                self.compile()
+            self._open()
+            self._loaded = True
+
+    def _is_fresh(self) -> bool:
+        try:
+            with open(self._path(self.META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not all(os.path.exists(self._path(name)) for name in (self.INDEX_FILE, self.BLOB_FILE)):
+            return False
+        if not all(meta.get(k) == v for k, v in self._source_signature().items()):
+            return False
+        self.skipped_lines = meta.get("skipped", 0)
+        return True
+
+    def _source_signature(self) -> dict:
+        st = os.stat(self.source_path)
+        return {
+            "source": os.path.abspath(self.source_path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def _open(self) -> None:
+        with open(self._path(self.INDEX_FILE), "rb") as f:
+            index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(index, 0)
+        if magic != _MAGIC or len(index) < _HEADER.size + count * _RECORD.size:
+            index.close()
+            raise ValueError(f"Invalid verse index file: {self._path(self.INDEX_FILE)}")
+        self._index = index
+        self.count = count
+        if count:
+            with open(self._path(self.BLOB_FILE), "rb") as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _close(self) -> None:
+        for mm in (self._index, self._blob):
+            if mm is not None:
+                mm.close()
+        self._index = self._blob = None
+        self._loaded = False
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    def _atomic_write(self, name: str, data: bytes) -> None:
+        atomic_write(self._path(name), data)
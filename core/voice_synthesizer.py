@@ -3,13 +3,23 @@ from typing import Dict
 from elevenlabs.client import ElevenLabs
 from elevenlabs import VoiceSettings
 
-from utils.config import load_env, require_env
+from core.pcm_audio import pcm_to_wav
+from core.resilience import get_guard
+from utils.config import get_env, load_env, require_env
+from utils.hangul_numerals import normalize_numerals
+
+# audio_format별 ElevenLabs output_format (PCM은 16bit 모노 little-endian, 헤더 없음)
+MP3_OUTPUT_FORMAT = "mp3_44100_128"
+DEFAULT_PCM_SAMPLE_RATE = 24000
 
 class VoiceSynthesizer:
     def __init__(self):
         load_env()
         self.api_key = require_env("ELEVENLABS_API_KEY")
-        self.client = ElevenLabs(api_key=self.api_key)
+        # pcm_44100은 상위 요금제에서만 제공되므로 기본값은 24kHz
+        self.pcm_sample_rate = int(get_env("ELEVENLABS_PCM_SAMPLE_RATE", str(DEFAULT_PCM_SAMPLE_RATE)))
+        self.guard = get_guard("elevenlabs")
+        self.client = ElevenLabs(api_key=self.api_key, timeout=self.guard.timeout)
 
     def get_all_voices(self) -> Dict[str, str]:
         """
@@ -17,7 +27,7 @@ class VoiceSynthesizer:
         Returns: { "Voice Name": "voice_id" } 형태의 딕셔너리
         """
         try:
-            response = self.client.voices.get_all()
+            response = self.guard.call(self.client.voices.get_all)
             voices = {v.name: v.voice_id for v in response.voices}
             if not voices:
                 raise RuntimeError("No voices found in ElevenLabs account.")
@@ -25,28 +35,40 @@ class VoiceSynthesizer:
         except Exception as e:
             raise RuntimeError(f"Failed to fetch voices: {str(e)}")
 
-    def generate_audio(self, text: str, voice_id: str) -> bytes:
+    def generate_audio(
+        self, text: str, voice_id: str, normalize_numbers: bool = True, audio_format: str = "mp3"
+    ) -> bytes:
         """
         텍스트를 음성으로 변환하여 오디오 바이트 데이터를 반환합니다.
+        normalize_numbers=True이면 아라비아 숫자를 한글 수사로 바꾼 뒤 합성합니다.
+        audio_format="wav"이면 PCM으로 받아 WAV 헤더를 붙여 반환합니다 (MP3 손실 인코딩 없음).
         """
         try:
             # 텍스트가 너무 짧거나 비어있으면 예외 처리 또는 빈 바이트 반환
             if not text or not text.strip():
                 return b""
+            if normalize_numbers:
+                text = normalize_numerals(text)
 
-            audio_generator = self.client.generate(
-                text=text,
-                voice=voice_id,
-                model="eleven_multilingual_v2",
-                voice_settings=VoiceSettings(
-                    stability=0.5,
-                    similarity_boost=0.75,
-                    style=0.0,
-                    use_speaker_boost=True
-                )
-            )
-            
-            # generator에서 모든 청크를 모아 bytes로 변환
-            return b"".join(audio_generator)
+            if audio_format == "wav":
+                pcm = self.guard.call(self._synthesize, text, voice_id, f"pcm_{self.pcm_sample_rate}")
+                return pcm_to_wav(pcm, self.pcm_sample_rate)
+            return self.guard.call(self._synthesize, text, voice_id, MP3_OUTPUT_FORMAT)
         except Exception as e:
-            raise RuntimeError(f"Failed to generate audio: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to generate audio: {str(e)}")
+
+    def _synthesize(self, text: str, voice_id: str, output_format: str) -> bytes:
+        audio_generator = self.client.generate(
+            text=text,
+            voice=voice_id,
+            model="eleven_multilingual_v2",
+            output_format=output_format,
+            voice_settings=VoiceSettings(
+                stability=0.5,
+                similarity_boost=0.75,
+                style=0.0,
+                use_speaker_boost=True
+            )
+        )
+        # generator에서 모든 청크를 모아 bytes로 변환 (스트림 도중 끊기면 처음부터 다시 요청)
+        return b"".join(audio_generator)
@@ -0,0 +1,160 @@
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from PIL import Image, ImageDraw, ImageOps
+
+from core.text_overlay import TextOverlay, load_font, paste_layer, wrap_text
+from models.data_models import ScriptData, ThumbnailCandidate
+
+THUMBNAIL_SIZE = (1280, 720)
+# 유튜브 맞춤 썸네일 파일 크기 제한
+MAX_THUMBNAIL_BYTES = 2 * 1024 * 1024
+# 용량 제한을 넘으면 차례로 낮춰 보는 JPEG 품질
+QUALITY_STEPS = (92, 85, 78, 70, 60, 50)
+# 제목 배치: bottom(하단 그라데이션), center(전체 어둡게, 가운데), left(왼쪽 그라데이션, 왼쪽 정렬)
+LAYOUTS = ("bottom", "center", "left")
+TITLE_MAX_LINES = 2
+TITLE_FONT_SIZES = (112, 100, 88, 76, 64, 56)
+_MARGIN = 60
+
+
+def pick_source_images(script: ScriptData, count: int) -> List[str]:
+    """생성된 이미지 중 대본 전체에 고르게 퍼진 count장을 고릅니다."""
+    paths: List[str] = []
+    for section in script.sections:
+        for ip in section.image_prompts:
+            if ip.image_path and os.path.exists(ip.image_path) and ip.image_path not in paths:
+                paths.append(ip.image_path)
+    if len(paths) <= count:
+        return paths
+    step = len(paths) / count
+    return [paths[int(i * step)] for i in range(count)]
+
+
+def fit_title(title: str, font_path: str, max_width: int) -> Tuple[int, List[str]]:
+    """TITLE_MAX_LINES 줄 안에 들어가는 가장 큰 글자 크기와 줄 목록을 반환합니다."""
+    for font_size in TITLE_FONT_SIZES:
+        lines = wrap_text(title, max_width, font_path, font_size)
+        if len(lines) <= TITLE_MAX_LINES:
+            return font_size, lines
+    font_size = TITLE_FONT_SIZES[-1]
+    lines = wrap_text(title, max_width, font_path, font_size)
+    return font_size, lines[: TITLE_MAX_LINES - 1] + [" ".join(lines[TITLE_MAX_LINES - 1 :])]
+
+
+def title_layer(lines: List[str], font_path: str, font_size: int, align: str) -> Image.Image:
+    """외곽선이 있는 흰 제목 글씨만 담은 글자 영역 크기의 RGBA 레이어"""
+    font = load_font(font_path, font_size)
+    stroke = max(2, font_size // 14)
+    text = "\n".join(lines)
+    spacing = font_size // 6
+    probe = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+    bbox = probe.multiline_textbbox((0, 0), text, font=font, align=align, spacing=spacing, stroke_width=stroke)
+    bbox = (math.floor(bbox[0]), math.floor(bbox[1]), math.ceil(bbox[2]), math.ceil(bbox[3]))
+    layer = Image.new("RGBA", (bbox[2] - bbox[0], bbox[3] - bbox[1]), (0, 0, 0, 0))
+    ImageDraw.Draw(layer).multiline_text(
+        (-bbox[0], -bbox[1]), text, font=font, fill=(255, 255, 255, 255), align=align,
+        spacing=spacing, stroke_width=stroke, stroke_fill=(0, 0, 0, 255),
+    )
+    return layer
+
+
+def _shade(img: Image.Image, layout: str) -> None:
+    """제목 가독성을 위해 제목이 놓일 영역만 어둡게 합니다 (그라데이션 마스크로 검정을 붙여넣기)."""
+    width, height = img.size
+    if layout == "center":
+        img.paste((0, 0, 0), (0, 0, width, height), Image.new("L", img.size, 96))
+        return
+    gradient = Image.linear_gradient("L")  # 위(0) → 아래(255), 시계 방향으로 돌리면 왼쪽(255) → 오른쪽(0)
+    if layout == "bottom":
+        box = (0, height * 45 // 100, width, height)
+        mask = gradient.resize((box[2] - box[0], box[3] - box[1])).point(lambda v: v * 200 // 255)
+    else:
+        box = (0, 0, width * 60 // 100, height)
+        mask = gradient.rotate(-90).resize((box[2] - box[0], box[3] - box[1]))
+        mask = mask.point(lambda v: v * 200 // 255)
+    img.paste((0, 0, 0), box, mask)
+
+
+def render_thumbnail(image_path: str, title: str, layout: str, font_path: Optional[str] = None) -> Image.Image:
+    """원본 이미지를 1280x720으로 채워 자르고 layout에 맞춰 제목을 얹은 RGB 이미지를 반환합니다."""
+    font_path = TextOverlay(font_path).font_path
+    with Image.open(image_path) as source:
+        source.draft("RGB", THUMBNAIL_SIZE)
+        img = ImageOps.fit(source.convert("RGB"), THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+    _shade(img, layout)
+
+    width, height = THUMBNAIL_SIZE
+    max_width = width - 2 * _MARGIN if layout != "left" else width * 55 // 100 - _MARGIN
+    font_size, lines = fit_title(title, font_path, max_width)
+    layer = title_layer(lines, font_path, font_size, "left" if layout == "left" else "center")
+    if layout == "bottom":
+        left, top = (width - layer.width) // 2, height - _MARGIN - layer.height
+    elif layout == "center":
+        left, top = (width - layer.width) // 2, (height - layer.height) // 2
+    else:
+        left, top = _MARGIN, (height - layer.height) // 2
+    return paste_layer(img, layer, left, top)
+
+
+def encode_under_limit(img: Image.Image, max_bytes: int = MAX_THUMBNAIL_BYTES) -> Tuple[bytes, int]:
+    """max_bytes 이하가 될 때까지 JPEG 품질을 낮춰 인코딩합니다. Returns: (바이트, 사용한 품질)"""
+    data = b""
+    for quality in QUALITY_STEPS:
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        data = buffer.getvalue()
+        if len(data) <= max_bytes:
+            return data, quality
+    raise ValueError(f"Thumbnail exceeds {max_bytes} bytes even at quality {QUALITY_STEPS[-1]} ({len(data)} bytes)")
+
+
+def _render_safe(args: Tuple[str, str, str, str, Optional[str]]) -> ThumbnailCandidate:
+    image_path, title, layout, output_path, font_path = args
+    candidate = ThumbnailCandidate(source_image=image_path, layout=layout)
+    try:
+        data, quality = encode_under_limit(render_thumbnail(image_path, title, layout, font_path))
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, output_path)
+        candidate.path = output_path
+        candidate.file_bytes = len(data)
+        candidate.quality = quality
+    except Exception as e:
+        candidate.error = str(e)
+    return candidate
+
+
+def render_thumbnails(
+    script: ScriptData,
+    title: str,
+    output_dir: str,
+    count: int = 6,
+    layouts: Sequence[str] = LAYOUTS,
+    font_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[ThumbnailCandidate]:
+    """
+    에피소드 이미지와 제목으로 썸네일 후보 count장을 프로세스 풀에서 병렬로 만듭니다 (이미지 API 호출 없음).
+    후보 i는 고른 이미지 i번째와 layouts[i % len(layouts)] 배치를 사용합니다.
+    """
+    sources = pick_source_images(script, count)
+    if not sources or not title.strip():
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = []
+    for i in range(count):
+        image_path = sources[i % len(sources)]
+        layout = layouts[i % len(layouts)]
+        output_path = os.path.join(output_dir, f"thumbnail_{i + 1:02d}_{layout}.jpg")
+        jobs.append((image_path, title.strip(), layout, output_path, font_path))
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        return list(map(_render_safe, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render_safe, jobs))
@@ -1,8 +1,33 @@
-from typing import List, Optional
+import uuid
+from typing import Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, ConfigDict, Field
 
 
+class BibleReference(BaseModel):
+    """정규화된 성경 구절 (책, 장, 시작 절, 끝 절)"""
+    book: str
+    chapter: int
+    verse_start: Optional[int] = None
+    verse_end: Optional[int] = None
+
+    @property
+    def key(self) -> Tuple[str, int, Optional[int], Optional[int]]:
+        return (self.book, self.chapter, self.verse_start, self.verse_end)
+
+    @property
+    def display(self) -> str:
+        # 키는 (책, 장)으로 통일하되, 표기는 시편만 '편'을 사용
+        unit = "편" if self.book == "시편" else "장"
+        text = f"{self.book} {self.chapter}{unit}"
+        if self.verse_start is not None:
+            text += f" {self.verse_start}"
+            if self.verse_end is not None and self.verse_end != self.verse_start:
+                text += f"-{self.verse_end}"
+            text += "절"
+        return text
+
+
 class ImagePrompt(BaseModel):
     """대본의 특정 텍스트 구간에 매칭되는 이미지 프롬프트"""
     text_segment: str = Field(..., description="이 이미지가 커버하는 대본 텍스트 조각")
@@ -10,6 +35,9 @@ class ImagePrompt(BaseModel):
     prompt_english: str = Field(..., description="Gemini API 호출용 영문 프롬프트")
     image_path: Optional[str] = Field(None, description="생성된 이미지 파일 경로")
     generated: bool = Field(False, description="이미지 생성 완료 여부")
+    variants: Dict[str, str] = Field(
+        default_factory=dict, description="마스터(16:9)에서 잘라낸 화면 비율별 이미지 경로 (예: '9:16')"
+    )
 
 
 class ScriptSection(BaseModel):
@@ -63,6 +91,8 @@ class AudioBlock(BaseModel):
     section_index: int
     text: str
     audio_data: Optional[bytes] = None
+    audio_format: str = Field("mp3", description="audio_data 형식: mp3 또는 wav (PCM)")
+    audio_path: Optional[str] = Field(None, description="프로젝트 자산 폴더에 저장된 오디오 파일 경로")
     duration_seconds: float = 0.0
     voice_id: str = ""
     confirmed: bool = False
@@ -80,16 +110,165 @@ class YouTubeMetadata(BaseModel):
     description: str = ""
     hashtags: str = ""
     tags: str = ""
+    thumbnail_candidates: List[str] = Field(default_factory=list, description="썸네일 후보 파일 경로")
+    thumbnail_path: str = Field("", description="선택한 썸네일 파일 경로")
 
 
 class ProjectState(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
+    project_id: str = Field(
+        default_factory=lambda: uuid.uuid4().hex[:12],
+        description="output/Projects/<project_id> 자산 폴더 이름",
+    )
     bible_passage: str = ""
     script: Optional[ScriptData] = None
     audio_blocks: List[AudioBlock] = Field(default_factory=list)
     timestamps: List[TimestampedSection] = Field(default_factory=list)
     final_audio_bytes: Optional[bytes] = None
+    final_audio_path: Optional[str] = None
     srt_content: Optional[str] = None
     selected_voice_id: str = ""
     youtube_metadata: Optional[YouTubeMetadata] = None
+
+
+class ChapterJobResult(BaseModel):
+    """일괄 생성에서 장 하나의 처리 결과"""
+    book: str
+    chapter: int
+    bible_reference: str
+    success: bool = False
+    cache_hit: bool = False
+    elapsed_seconds: float = 0.0
+    project_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkRunReport(BaseModel):
+    book: str
+    start_chapter: int
+    end_chapter: int
+    results: List[ChapterJobResult] = Field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> List[ChapterJobResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[ChapterJobResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def chapters_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.succeeded) / self.elapsed_seconds * 60.0
+
+
+class ImageJob(BaseModel):
+    """일괄 이미지 생성 작업 하나 (gallery 순서 기준 index)"""
+    index: int
+    section_index: int
+    prompt_index: int
+    prompt: str
+    filename: str
+
+
+class ImageJobResult(BaseModel):
+    index: int
+    section_index: int
+    prompt_index: int
+    success: bool = False
+    image_path: Optional[str] = None
+    cache_hit: bool = False
+    deduplicated: bool = Field(False, description="같은 배치의 동일 프롬프트 결과를 재사용")
+    file_bytes: int = 0
+    save_seconds: float = Field(0.0, description="API 응답 이후 디스크 저장(필요 시 변환 포함)에 걸린 시간")
+    attempts: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+class ImageBatchReport(BaseModel):
+    results: List[ImageJobResult] = Field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    rate_limit_hits: int = 0
+
+    @property
+    def succeeded(self) -> List[ImageJobResult]:
+        return [r for r in self.results if r.success]
+
+    @property
+    def failed(self) -> List[ImageJobResult]:
+        return [r for r in self.results if not r.success]
+
+    @property
+    def api_calls_saved(self) -> int:
+        return sum(1 for r in self.results if r.success and (r.cache_hit or r.deduplicated))
+
+    @property
+    def avg_file_bytes(self) -> float:
+        sizes = [r.file_bytes for r in self.succeeded if r.file_bytes]
+        return sum(sizes) / len(sizes) if sizes else 0.0
+
+    @property
+    def avg_save_ms(self) -> float:
+        # 새로 저장한 이미지만 (캐시/중복 복사 제외)
+        saves = [r.save_seconds for r in self.succeeded if not (r.cache_hit or r.deduplicated)]
+        return sum(saves) / len(saves) * 1000 if saves else 0.0
+
+    @property
+    def images_per_minute(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.succeeded) / self.elapsed_seconds * 60.0
+
+
+class OverlayBatchReport(BaseModel):
+    """자막 오버레이 일괄 처리 결과"""
+    outputs: Dict[str, str] = Field(default_factory=dict, description="원본 경로 -> 자막 이미지 경로")
+    errors: Dict[str, str] = Field(default_factory=dict, description="원본 경로 -> 오류 메시지")
+    elapsed_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def images_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return len(self.outputs) / self.elapsed_seconds
+
+
+class ThumbnailCandidate(BaseModel):
+    """유튜브 썸네일 후보 렌더링 결과"""
+    source_image: str
+    layout: str
+    path: Optional[str] = None
+    file_bytes: int = 0
+    quality: int = 0
+    error: Optional[str] = None
+
+
+class GcReport(BaseModel):
+    """프로젝트 자산 가비지 컬렉션 결과"""
+    removed_files: int = 0
+    freed_bytes: int = 0
+    evicted_projects: List[str] = Field(default_factory=list)
+    skipped_projects: List[str] = Field(default_factory=list, description="manifest와 project.json이 없어 정리하지 않은 프로젝트")
+    total_bytes: int = 0
+
+
+class LibraryMatch(BaseModel):
+    """이미지 라이브러리 유사도 검색 결과"""
+    image_path: str
+    prompt: str
+    art_style: str = ""
+    score: float = Field(..., description="코사인 유사도 (0~1)")
+
+
+class SectionIssue(BaseModel):
+    """대본 섹션 규칙 검사에서 발견된 문제"""
+    section_index: int
+    section_type: str
+    code: str = Field(..., description="length_short, length_long, lead_in, numerals")
+    message: str
@@ -1,6 +1,15 @@
+import time
+
 import streamlit as st
 from utils.session_state import get_state, update_state
+from core.script_cache import ScriptCache
+from core.bulk_generator import BulkScriptGenerator
+from core.parse_stats import ParseStats
+from core.token_usage import TokenUsageStats
+from core.prompt_translator import PromptTranslator
 from core.script_generator import ScriptGenerator
+from core.script_validator import validate_section
+from core.verse_index import VerseIndex
 from utils.bible_parser import parse_bible_reference
 from utils.bible_data import BIBLE_DATA
 
@@ -47,21 +56,138 @@ st.header("1. 성경 본문 선택")
 
 def generate_script_action(passage):
     """대본 생성 로직을 수행하는 함수"""
-    state.bible_passage = parse_bible_reference(passage)
+    try:
+        state.bible_passage = parse_bible_reference(passage)
+    except ValueError as e:
+        # 존재하지 않는 장은 LLM 호출 없이 바로 안내
+        st.error(str(e))
+        return
     update_state(state)
 
-    generator = ScriptGenerator()
+    generator = ScriptGenerator(
+        output_mode=st.session_state.get("script_output_mode", "json"),
+        defer_english=st.session_state.get("defer_english", False),
+    )
+    force_refresh = st.session_state.get("force_fresh_script", False)
     try:
-        with st.spinner(f"Claude가 '{passage}' 대본을 작성하고 있습니다... (약 15-30초 소요)"):
-            script_data = generator.generate_script(state.bible_passage)
-            state.script = script_data
-            update_state(state)
-            st.session_state.script_confirmed = False
-        st.success(f"대본 생성 완료! (이미지 프롬프트 {script_data.total_image_count}개 포함)")
+        if st.session_state.get("stream_script", True):
+            st.caption(f"Claude가 '{passage}' 대본을 작성하고 있습니다... 완성된 섹션부터 표시됩니다.")
+            live_view = st.container(border=True)
+
+            def render_section(section):
+                with live_view:
+                    st.markdown(f"**{section.section_type}**")
+                    st.write(section.content)
+
+            script_data = generator.generate_script_stream(
+                state.bible_passage, on_section=render_section, force_refresh=force_refresh
+            )
+        else:
+            with st.spinner(f"Claude가 '{passage}' 대본을 작성하고 있습니다... (약 15-30초 소요)"):
+                script_data = generator.generate_script(state.bible_passage, force_refresh=force_refresh)
+        state.script = script_data
+        update_state(state)
+        st.session_state.script_confirmed = False
+        if generator.last_cache_hit:
+            st.success(f"저장된 대본을 불러왔습니다. (이미지 프롬프트 {script_data.total_image_count}개 포함)")
+        else:
+            st.success(f"대본 생성 완료! (이미지 프롬프트 {script_data.total_image_count}개 포함)")
+        timing = generator.last_timing
+        if timing.get("first_section") is not None and timing.get("total") is not None:
+            st.caption(
+                f"⏱️ 첫 섹션까지 {timing['first_section']:.1f}초 · 전체 생성 {timing['total']:.1f}초"
+            )
+        usage = generator.last_usage
+        if usage and not generator.last_cache_hit:
+            st.caption(
+                f"토큰: 입력 {usage['input_tokens']:,} · 캐시 읽기 {usage['cache_read_input_tokens']:,} "
+                f"· 캐시 기록 {usage['cache_creation_input_tokens']:,} · 출력 {usage['output_tokens']:,}"
+            )
     except Exception as e:
         st.error(f"오류 발생: {e}")
 
-tab_ot, tab_nt, tab_direct = st.tabs(["구약 성경", "신약 성경", "직접 입력"])
+st.radio(
+    "출력 방식",
+    options=["json", "tool"],
+    format_func=lambda m: {"json": "JSON 텍스트", "tool": "도구 호출 (스키마 고정)"}[m],
+    horizontal=True,
+    key="script_output_mode",
+    help="도구 호출 방식은 모델이 스키마에 맞는 구조화된 값을 직접 반환하여 파싱 실패가 줄어듭니다.",
+)
+st.toggle(
+    "실시간 스트리밍 표시",
+    value=True,
+    key="stream_script",
+    help="섹션이 완성되는 대로 바로 화면에 표시합니다.",
+)
+st.toggle(
+    "영문 이미지 프롬프트는 대본 확정 후 생성",
+    key="defer_english",
+    help="대본 생성 시 한글 이미지 설명만 받아 대본이 더 빨리 나옵니다. 영문 프롬프트는 '대본 저장 및 확정' 때 한 번에 번역합니다.",
+)
+st.checkbox(
+    "캐시 무시하고 새로 생성",
+    key="force_fresh_script",
+    help="같은 본문으로 이전에 생성한 대본이 있어도 Claude를 다시 호출합니다.",
+)
+cache_stats = ScriptCache().stats()
+st.caption(
+    f"대본 캐시: {cache_stats['entries']}개 저장 · 적중 {cache_stats['hits']} / 미적중 {cache_stats['misses']} "
+    f"(적중률 {cache_stats['hit_rate'] * 100:.0f}%)"
+)
+if VerseIndex.from_env() is not None:
+    st.caption("본문 인용(Reading) 섹션의 성경 구절은 로컬 성경 본문(BIBLE_TEXT_PATH)에서 삽입합니다.")
+with st.expander("출력 방식별 파싱 통계", expanded=False):
+    parse_summary = ParseStats().summary()
+    if parse_summary:
+        st.table([
+            {
+                "방식": mode,
+                "호출 수": row["total"],
+                "바로 성공": row["direct"],
+                "로컬 복구": row["local_recovery"],
+                "재호출 복구": row["model_repair"],
+                "실패": row["failed"],
+                "파싱 실패율": f"{row['failure_rate'] * 100:.1f}%",
+                "재호출 비율": f"{row['repair_call_rate'] * 100:.1f}%",
+            }
+            for mode, row in parse_summary.items()
+        ])
+    else:
+        st.caption("아직 기록된 생성 결과가 없습니다.")
+with st.expander("토큰 사용량", expanded=False):
+    token_stats = TokenUsageStats()
+    usage_summary = token_stats.summary()
+    if usage_summary:
+        st.table([
+            {
+                "호출": call,
+                "호출 수": row["calls"],
+                "입력": row["input_tokens"],
+                "캐시 읽기": row["cache_read_input_tokens"],
+                "캐시 기록": row["cache_creation_input_tokens"],
+                "출력": row["output_tokens"],
+                "캐시 적중 비율": f"{row['cache_read_rate'] * 100:.1f}%",
+                "평균 출력": f"{row['avg_output_tokens']:.0f}",
+            }
+            for call, row in usage_summary.items()
+        ])
+        section_rows = token_stats.section_summary()
+        if section_rows:
+            st.caption("섹션별 평균 출력 크기 (출력 토큰은 문자 수 비율로 나눈 추정치)")
+            st.table([
+                {
+                    "섹션": row["section_type"],
+                    "생성 수": row["count"],
+                    "평균 문자 수": f"{row['avg_chars']:.0f}",
+                    "평균 출력 토큰": f"{row['avg_output_tokens']:.0f}",
+                }
+                for row in section_rows
+            ])
+    else:
+        st.caption("아직 기록된 토큰 사용량이 없습니다.")
+
+tab_ot, tab_nt, tab_direct, tab_bulk = st.tabs(["구약 성경", "신약 성경", "직접 입력", "일괄 생성"])
 
 with tab_ot:
     col_book, col_chapter = st.columns([1, 2])
@@ -125,11 +251,76 @@ with tab_direct:
         else:
             st.warning("성경 구절을 입력해주세요.")
 
+with tab_bulk:
+    st.caption("한 책의 여러 장을 미리 생성해 장별 프로젝트 파일(output/Projects)로 저장합니다.")
+    col_testament, col_book = st.columns([1, 2])
+    with col_testament:
+        bulk_testament = st.radio("구분", list(BIBLE_DATA.keys()), horizontal=True, key="bulk_testament")
+    with col_book:
+        bulk_book = st.selectbox("성경 선택", list(BIBLE_DATA[bulk_testament].keys()), key="bulk_book")
+
+    bulk_chapter_count = BIBLE_DATA[bulk_testament][bulk_book]
+    if bulk_chapter_count > 1:
+        bulk_range = st.slider(
+            "장 범위", 1, bulk_chapter_count, (1, bulk_chapter_count), key="bulk_range"
+        )
+    else:
+        bulk_range = (1, 1)
+
+    col_workers, col_tpm = st.columns(2)
+    with col_workers:
+        bulk_workers = st.slider("동시 실행 수", 1, 8, 4, key="bulk_workers")
+    with col_tpm:
+        bulk_tpm = st.number_input(
+            "분당 토큰 한도", min_value=10000, max_value=2000000, value=80000, step=10000, key="bulk_tpm"
+        )
+
+    if st.button(f"📚 {bulk_book} {bulk_range[0]}-{bulk_range[1]}장 일괄 생성", key="btn_bulk", type="primary"):
+        runner = BulkScriptGenerator(
+            max_workers=bulk_workers,
+            tokens_per_minute=int(bulk_tpm),
+            force_refresh=st.session_state.get("force_fresh_script", False),
+            output_mode=st.session_state.get("script_output_mode", "json"),
+            defer_english=st.session_state.get("defer_english", False),
+        )
+        total_chapters = bulk_range[1] - bulk_range[0] + 1
+        progress = st.progress(0.0, text="일괄 생성 준비 중...")
+        started = time.perf_counter()
+        results = []
+        try:
+            for result in runner.iter_run(bulk_book, bulk_range[0], bulk_range[1]):
+                results.append(result)
+                icon = "✅" if result.success else "❌"
+                progress.progress(
+                    len(results) / total_chapters,
+                    text=f"{icon} {result.bible_reference} ({len(results)}/{total_chapters})",
+                )
+        except ValueError as e:
+            st.error(str(e))
+
+        if results:
+            elapsed = time.perf_counter() - started
+            succeeded = [r for r in results if r.success]
+            st.success(
+                f"완료 {len(succeeded)}/{total_chapters}장 · {elapsed:.0f}초 · "
+                f"처리량 {len(succeeded) / elapsed * 60:.1f}장/분"
+            )
+            st.table([
+                {
+                    "장": r.chapter,
+                    "결과": "성공" if r.success else "실패",
+                    "캐시": "✔" if r.cache_hit else "",
+                    "소요(초)": f"{r.elapsed_seconds:.1f}",
+                    "파일/오류": r.project_path if r.success else r.error,
+                }
+                for r in sorted(results, key=lambda r: r.chapter)
+            ])
+
 # --- Edit Section ---
 if state.script:
     st.divider()
     st.header("2. 대본 편집")
-    st.info("💡 팁: 숫자가 한글(이십칠장, 일절 등)로 되어 있는지 확인해주세요. 음성 생성 시 훨씬 자연스럽습니다.")
+    st.info("💡 팁: 숫자는 음성 생성 시 한글(이십칠장, 일절 등)로 자동 변환됩니다. 읽는 방식이 어색하면 직접 한글로 고쳐주세요.")
 
     full_script_default = build_full_script_text(state.script.sections)
     full_script_text = st.text_area(
@@ -144,6 +335,46 @@ if state.script:
     if not full_script_text.strip():
         st.warning("대본 내용이 비어있습니다.")
 
+    # 편집 중인 텍스트 기준으로 섹션 규칙(분량/도입 문구/숫자 표기) 검사
+    draft_sections = [section.model_copy(deep=True) for section in state.script.sections]
+    apply_full_script_text(full_script_text, draft_sections)
+    issues = []
+    for index, section in enumerate(draft_sections):
+        issues.extend(validate_section(section, index))
+
+    with st.expander(
+        f"🔎 대본 규칙 검사 ({'문제 ' + str(len(issues)) + '건' if issues else '통과'})",
+        expanded=bool(issues),
+    ):
+        if not issues:
+            st.success("모든 섹션이 분량/도입 문구/숫자 표기 규칙을 만족합니다.")
+        issues_by_section = {}
+        for issue in issues:
+            issues_by_section.setdefault(issue.section_index, []).append(issue)
+        for index, section_issues in issues_by_section.items():
+            col_msg, col_regen = st.columns([3, 1])
+            with col_msg:
+                st.markdown(f"**{section_issues[0].section_type}**")
+                for issue in section_issues:
+                    st.caption(f"• {issue.message}")
+            with col_regen:
+                if st.button("🔁 이 섹션만 다시 생성", key=f"regen_section_{index}", use_container_width=True):
+                    try:
+                        with st.spinner(f"{section_issues[0].section_type} 섹션을 다시 작성하는 중..."):
+                            apply_full_script_text(full_script_text, state.script.sections)
+                            regen = ScriptGenerator(defer_english=st.session_state.get("defer_english", False))
+                            regen.regenerate_section(
+                                state.script, index, problems=[i.message for i in section_issues]
+                            )
+                            update_state(state)
+                        # 편집기 내용을 새 대본으로 갱신
+                        st.session_state.full_script_text = build_full_script_text(state.script.sections)
+                        st.session_state.pop("full_script_editor", None)
+                        st.session_state.script_confirmed = False
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"섹션 재생성 실패: {e}")
+
     st.divider()
 
     col_confirm, col_next = st.columns([1, 1])
@@ -154,6 +385,19 @@ if state.script:
             st.session_state.script_confirmed = True
             st.toast("대본이 저장되었습니다.", icon="✅")
 
+            missing_english = [ip for ip in state.script.all_image_prompts if not ip.prompt_english.strip()]
+            if missing_english:
+                try:
+                    with st.spinner(f"영문 이미지 프롬프트 {len(missing_english)}개를 번역하는 중..."):
+                        translator = PromptTranslator()
+                        translated_count = translator.fill_missing_english(state.script)
+                        update_state(state)
+                    st.caption(
+                        f"🌐 영문 프롬프트 {translated_count}개 번역 완료 ({translator.last_latency:.1f}초)"
+                    )
+                except Exception as e:
+                    st.error(f"영문 프롬프트 번역 실패: {e} (Step 2에서 다시 시도할 수 있습니다)")
+
     if st.session_state.script_confirmed:
         st.success(f"✅ 대본이 확정되었습니다! (이미지 프롬프트 {state.script.total_image_count}개)")
         with col_next:
@@ -1,12 +1,22 @@
 import io
 import os
-import zipfile
 import time
+import zipfile
 
 import streamlit as st
+from PIL import Image
 
 from utils.session_state import get_state, update_state
-from core.image_generator import ImageGenerator
+from core.asset_store import AssetStore
+from core.image_batch import ImageBatchGenerator, build_image_jobs
+from core.image_cache import ImageCache
+from core.image_generator import ImageGenerator, image_mime_type
+from core.image_library import ImageLibrary
+from core.smart_crop import DEFAULT_VARIANTS, derive_variants_batch
+from core.text_overlay import TextOverlay
+from core.thumbnails import get_preview, get_thumbnail
+from models.data_models import ImageBatchReport
+from core.prompt_translator import PromptTranslator
 
 st.title("Step 2: 이미지")
 state = get_state()
@@ -64,31 +74,25 @@ st.divider()
 st.header("2. 이미지 프롬프트 검수")
 st.info(f"총 {state.script.total_image_count}개의 이미지 프롬프트가 생성되었습니다. 한글 설명을 수정 후 '프롬프트 수정' 버튼을 눌러 AI가 영어 프롬프트를 자동 생성합니다.")
 
-# Claude API를 사용한 프롬프트 번역 함수
-def translate_prompt_to_english(korean_text: str, art_style: str) -> str:
-    """한글 이미지 설명을 영어 Gemini 프롬프트로 변환"""
-    from anthropic import Anthropic
-    from utils.config import require_env
-
-    api_key = require_env("ANTHROPIC_API_KEY")
-    client = Anthropic(api_key=api_key)
-
-    prompt = f"""Convert this Korean image description into a detailed English prompt for Gemini image generation.
-Keep it concise but vivid. Focus on visual elements, composition, and atmosphere.
-
-Korean description: {korean_text}
-Art style context: {art_style}
-
-Return ONLY the English prompt, nothing else."""
-
-    response = client.messages.create(
-        model="claude-haiku-4-5-20251001",
-        max_tokens=200,
-        temperature=0.3,
-        messages=[{"role": "user", "content": prompt}]
-    )
-
-    return response.content[0].text.strip()
+# 번역 결과는 (한글 설명, 스타일, 모델) 기준으로 캐시되어 변경 없는 프롬프트는 API를 호출하지 않습니다.
+def get_translator() -> PromptTranslator:
+    if "prompt_translator" not in st.session_state:
+        st.session_state.prompt_translator = PromptTranslator()
+    return st.session_state.prompt_translator
+
+missing_english = [ip for ip in state.script.all_image_prompts if not ip.prompt_english.strip()]
+if missing_english:
+    st.warning(f"영문 프롬프트가 없는 이미지 설명이 {len(missing_english)}개 있습니다.")
+    if st.button("🌐 영문 프롬프트 일괄 생성", type="primary"):
+        try:
+            with st.spinner("영문 프롬프트를 번역하는 중..."):
+                translator = get_translator()
+                translator.fill_missing_english(state.script)
+                update_state(state)
+            st.toast(f"번역 완료 ({translator.last_latency:.1f}초)", icon="✅")
+            st.rerun()
+        except Exception as e:
+            st.error(f"번역 실패: {e}")
 
 global_idx = 0
 for i, section in enumerate(state.script.sections):
@@ -106,7 +110,7 @@ for i, section in enumerate(state.script.sections):
                 st.text(ip.text_segment[:100] + ("..." if len(ip.text_segment) > 100 else ""))
 
                 if ip.image_path and os.path.exists(ip.image_path):
-                    st.image(ip.image_path, width=150)
+                    st.image(get_thumbnail(ip.image_path), width=150)
                     st.success("생성 완료")
 
             with col_edit:
@@ -140,7 +144,7 @@ for i, section in enumerate(state.script.sections):
                             update_state(state)
 
                             # AI로 영어 프롬프트 생성
-                            new_en = translate_prompt_to_english(new_kr, state.script.art_style)
+                            new_en = get_translator().translate(new_kr, state.script.art_style)
                             ip.prompt_english = new_en
                             update_state(state)
                             st.success("완료!")
@@ -151,10 +155,45 @@ for i, section in enumerate(state.script.sections):
 
             global_idx += 1
 
-# 전체 저장 버튼
-if st.button("💾 모든 변경사항 저장", use_container_width=True):
-    update_state(state)
-    st.toast("프롬프트가 저장되었습니다.", icon="✅")
+# 전체 저장 버튼 / 전체 적용 버튼: 수정된 한글 설명을 모아 한 번에 번역
+col_save, col_apply = st.columns(2)
+with col_save:
+    if st.button("💾 모든 변경사항 저장", use_container_width=True):
+        update_state(state)
+        st.toast("프롬프트가 저장되었습니다.", icon="✅")
+with col_apply:
+    apply_all = st.button("✨ 모든 수정사항 일괄 적용", use_container_width=True)
+
+if apply_all:
+    edited = []
+    for i, section in enumerate(state.script.sections):
+        for j, ip in enumerate(section.image_prompts):
+            new_kr = st.session_state.get(f"kr_{i}_{j}", ip.prompt_korean)
+            if new_kr != ip.prompt_korean or not ip.prompt_english.strip():
+                edited.append((ip, new_kr))
+
+    if not edited:
+        st.toast("변경된 프롬프트가 없습니다.", icon="ℹ️")
+    else:
+        try:
+            with st.spinner(f"수정된 프롬프트 {len(edited)}개를 번역하는 중..."):
+                translator = get_translator()
+                translated = translator.translate_batch(
+                    [new_kr for _, new_kr in edited], state.script.art_style
+                )
+                for (ip, new_kr), new_en in zip(edited, translated):
+                    ip.prompt_korean = new_kr
+                    ip.prompt_english = new_en
+                update_state(state)
+            st.toast(
+                f"{len(edited)}개 적용 완료 (캐시 {translator.last_cache_hits}개, "
+                f"API 요청 {translator.last_api_calls}회, {translator.last_latency:.1f}초)",
+                icon="✅",
+            )
+            time.sleep(0.5)
+            st.rerun()
+        except Exception as e:
+            st.error(f"일괄 적용 실패: {e}")
 
 # ──────────────────────────────────────────────
 # 3. 이미지 갤러리 (생성 + 확인)
@@ -182,16 +221,69 @@ with col_btn:
         st.success("✅ 모든 이미지 생성 완료!")
         generate_all = False
 
+with st.expander("⚙️ 동시 생성 설정", expanded=False):
+    col_workers, col_rate = st.columns(2)
+    with col_workers:
+        st.number_input("동시 생성 수", min_value=1, max_value=8, value=4, key="image_workers")
+    with col_rate:
+        st.number_input(
+            "분당 최대 요청 수", min_value=1, max_value=120, value=20, key="images_per_minute",
+            help="429/할당량 오류가 나면 자동으로 속도를 줄이고 재시도합니다.",
+        )
+    st.checkbox(
+        "느린 요청 중복 전송 (hedging)", value=False, key="image_hedge",
+        help="최근 95% 요청보다 오래 걸리는 요청은 같은 요청을 한 번 더 보내 먼저 도착한 이미지를 사용합니다. "
+             "느린 꼬리 지연은 줄지만 중복 요청도 과금되므로 전체 요청의 10% 이내, 동시에 2건까지만 보냅니다.",
+    )
+
 # 전체 이미지 목록 구성
 all_prompts = []
 for section in state.script.sections:
     for ip in section.image_prompts:
         all_prompts.append((section, ip))
 
+# 지금까지 생성한 이미지 라이브러리 (비슷한 프롬프트의 이미지를 재사용 후보로 제안)
+def get_image_library() -> ImageLibrary:
+    return ImageLibrary.shared()
+
+
+def add_to_library(ip) -> None:
+    try:
+        get_image_library().add(ip.prompt_english, ip.image_path, state.script.art_style)
+    except OSError:
+        pass
+
+
 # 이미지 확대 보기 다이얼로그
 @st.dialog("이미지 상세 보기", width="large")
-def show_image_detail(img_path: str, idx: int, section_type: str, prompt_kr: str):
-    st.image(img_path, use_container_width=True)
+def show_image_detail(img_path: str, idx: int, section_type: str, prompt_kr: str, variants: dict, caption: str):
+    # 자막은 원본을 바꾸지 않고 미리보기 이미지 위에만 합성 (폰트 크기는 원본 대비 비율로 축소)
+    show_caption = bool(caption.strip()) and st.toggle("자막 미리보기", key=f"caption_preview_{idx}")
+    overlay = TextOverlay()
+    if show_caption and overlay.font_missing:
+        st.warning(f"자막 폰트 파일이 없어 기본 폰트를 사용합니다 (한글이 깨질 수 있음): {overlay.font_path}")
+
+    def render(path: str, **kwargs):
+        preview_path = get_preview(path)
+        if not show_caption:
+            st.image(preview_path, **kwargs)
+            return
+        with Image.open(path) as original:
+            original_width = original.width
+        with Image.open(preview_path) as preview:
+            font_size = max(8, round(overlay.default_font_size * preview.width / original_width))
+            st.image(overlay.composite(preview, caption, font_size=font_size), **kwargs)
+
+    existing = {ratio: path for ratio, path in variants.items() if os.path.exists(path)}
+    if existing:
+        tabs = st.tabs(["16:9"] + list(existing))
+        with tabs[0]:
+            render(img_path, use_container_width=True)
+        for tab, path in zip(tabs[1:], existing.values()):
+            with tab:
+                render(path, width=360)
+    else:
+        render(img_path, use_container_width=True)
     st.caption(f"**이미지 #{idx + 1}** | 섹션: {section_type}")
     st.caption(f"설명: {prompt_kr}")
 
@@ -213,42 +305,51 @@ for row_start in range(0, len(all_prompts), cols_per_row):
                 st.caption(f"**#{idx + 1}** | {section.section_type}")
 
                 if ip.image_path and os.path.exists(ip.image_path):
-                    # 이미지 표시
-                    st.image(ip.image_path, use_container_width=True)
+                    # 이미지 표시 (원본 대신 고정 크기 썸네일 전송)
+                    st.image(get_thumbnail(ip.image_path), use_container_width=True)
 
                     # 버튼 그룹 (2열)
                     btn_col1, btn_col2 = st.columns(2)
                     with btn_col1:
                         if st.button("🔍 확대", key=f"view_{idx}", use_container_width=True):
-                            show_image_detail(ip.image_path, idx, section.section_type, ip.prompt_korean)
+                            show_image_detail(ip.image_path, idx, section.section_type, ip.prompt_korean, ip.variants,
+                                              ip.text_segment)
 
                     with btn_col2:
                         # 재생성 버튼
                         if st.button("🔄 재생성", key=f"regen_{idx}", use_container_width=True):
                             with st.spinner(f"이미지 #{idx + 1} 재생성 중..."):
                                 try:
-                                    img_gen = ImageGenerator()
+                                    img_gen = ImageGenerator(asset_store=AssetStore(state.project_id))
                                     full_prompt = f"{state.script.art_style}. {ip.prompt_english}"
                                     filename = img_gen.get_output_path(idx, section.section_type,
                                                                        all_prompts[:idx+1].count((section, ip)) - 1)
-                                    img_path = img_gen.generate_image(full_prompt, filename)
+                                    # 같은 프롬프트라도 새 이미지를 받도록 캐시를 건너뜀
+                                    img_path = img_gen.generate_image(full_prompt, filename, force_refresh=True)
                                     ip.image_path = img_path
                                     ip.generated = True
+                                    ip.variants = {}
                                     update_state(state)
+                                    add_to_library(ip)
+                                    img_gen.asset_store.write_manifest(state)
                                     st.rerun()
                                 except Exception as e:
                                     st.error(f"재생성 실패: {e}")
 
-                    # 다운로드 버튼
-                    with open(ip.image_path, "rb") as f:
-                        st.download_button(
-                            "⬇️ 다운로드",
-                            data=f.read(),
-                            file_name=f"{idx + 1:02d}_{section.section_type}.png",
-                            mime="image/png",
-                            key=f"dl_{idx}",
-                            use_container_width=True
-                        )
+                    # 다운로드 버튼: 원본 파일은 요청한 카드에서만 읽음
+                    if st.session_state.get("image_download_ready") == idx:
+                        with open(ip.image_path, "rb") as f:
+                            st.download_button(
+                                "💾 원본 저장",
+                                data=f.read(),
+                                file_name=f"{idx + 1:02d}_{section.section_type}{os.path.splitext(ip.image_path)[1]}",
+                                mime=image_mime_type(ip.image_path),
+                                key=f"dl_{idx}",
+                                use_container_width=True
+                            )
+                    elif st.button("⬇️ 다운로드", key=f"dl_prepare_{idx}", use_container_width=True):
+                        st.session_state.image_download_ready = idx
+                        st.rerun()
 
                     st.caption(f"💭 {ip.prompt_korean[:50]}..." if len(ip.prompt_korean) > 50 else ip.prompt_korean)
                 else:
@@ -256,55 +357,137 @@ for row_start in range(0, len(all_prompts), cols_per_row):
                     st.info("🖼️ 생성 대기 중", icon="⏳")
                     st.caption(f"{ip.prompt_korean[:40]}..." if len(ip.prompt_korean) > 40 else ip.prompt_korean)
 
+                    # 이전에 생성한 비슷한 이미지가 있으면 API 호출 없이 재사용
+                    matches = (
+                        get_image_library().search(ip.prompt_english, art_style=state.script.art_style)
+                        if ip.prompt_english.strip() else []
+                    )
+                    if matches:
+                        with st.expander(f"♻️ 비슷한 이미지 {len(matches)}개", expanded=False):
+                            for m, match in enumerate(matches):
+                                st.image(get_thumbnail(match.image_path), use_container_width=True)
+                                st.caption(f"유사도 {match.score:.2f} · {match.prompt[:60]}")
+                                if st.button("이 이미지 사용", key=f"reuse_{idx}_{m}", use_container_width=True):
+                                    asset_store = AssetStore(state.project_id)
+                                    sub_index = next(k for k, p in enumerate(section.image_prompts) if p is ip)
+                                    safe_name = "".join(c for c in section.section_type if c.isalnum())
+                                    ext = os.path.splitext(match.image_path)[1]
+                                    ip.image_path = asset_store.import_file(
+                                        match.image_path, f"images/{idx:02d}_{safe_name}_{sub_index:02d}{ext}"
+                                    )
+                                    ip.generated = True
+                                    ip.variants = {}
+                                    update_state(state)
+                                    asset_store.write_manifest(state)
+                                    st.rerun()
+
 # 전체 이미지 생성 로직
 if generate_all:
     st.divider()
     st.subheader("🎨 이미지 생성 중...")
 
-    img_gen = ImageGenerator()
-    progress_bar = st.progress(0, text="이미지 생성 준비 중...")
-    status_container = st.container()
+    asset_store = AssetStore(state.project_id)
+    engine = ImageBatchGenerator(
+        max_workers=int(st.session_state.get("image_workers", 4)),
+        images_per_minute=float(st.session_state.get("images_per_minute", 20)),
+        image_generator=ImageGenerator(asset_store=asset_store, hedge=st.session_state.get("image_hedge", False)),
+    )
+    jobs = build_image_jobs(state.script, engine.image_generator)
+    progress_bar = st.progress(generated_count / total_images if total_images else 0.0,
+                               text=f"이미지 {len(jobs)}개 생성 준비 중...")
     gallery_preview = st.container()
+    preview_cols = gallery_preview.columns(4)
+
+    # 결과는 완료된 순서대로 도착하며, 세션 상태 갱신은 메인 스레드에서만 수행
+    report = ImageBatchReport()
+    started = time.perf_counter()
+    hedges_before = engine.image_generator.guard.hedges
+    for result in engine.iter_run(jobs):
+        report.results.append(result)
+        done = len(report.results)
+        section = state.script.sections[result.section_index]
+        if result.success:
+            ip = section.image_prompts[result.prompt_index]
+            ip.image_path = result.image_path
+            ip.generated = True
+            ip.variants = {}
+            update_state(state)
+            add_to_library(ip)
+            # 가비지 컬렉터가 새 이미지를 지우지 않도록 매니페스트를 바로 갱신
+            asset_store.write_manifest(state)
+            with preview_cols[(done - 1) % 4]:
+                st.image(get_thumbnail(result.image_path), caption=f"✅ #{result.index + 1}", use_container_width=True)
+        else:
+            st.error(f"이미지 #{result.index + 1} 생성 실패: {result.error}")
+        progress_bar.progress(
+            min(1.0, (generated_count + done) / total_images),
+            text=f"이미지 {done}/{len(jobs)} 완료 ({section.section_type}) · "
+                 f"현재 속도 제한 {engine.limiter.rate_per_minute:.0f}회/분",
+        )
 
-    global_idx = 0
-    for i, section in enumerate(state.script.sections):
-        for j, ip in enumerate(section.image_prompts):
-            if ip.generated and ip.image_path:
-                global_idx += 1
-                continue
-
-            progress_bar.progress(
-                global_idx / total_images,
-                text=f"이미지 {global_idx + 1}/{total_images} 생성 중... ({section.section_type})"
-            )
-
-            with status_container:
-                st.caption(f"🎨 프롬프트: {ip.prompt_korean[:80]}...")
-
-            try:
-                full_prompt = f"{state.script.art_style}. {ip.prompt_english}"
-                filename = img_gen.get_output_path(global_idx, section.section_type, j)
-                img_path = img_gen.generate_image(full_prompt, filename)
-
-                ip.image_path = img_path
-                ip.generated = True
-                update_state(state)
-
-                # 갤러리 미리보기 업데이트
-                with gallery_preview:
-                    cols = st.columns(4)
-                    with cols[global_idx % 4]:
-                        st.image(img_path, caption=f"✅ #{global_idx + 1}", use_container_width=True)
-
-            except Exception as e:
-                st.error(f"이미지 #{global_idx + 1} 생성 실패: {e}")
-
-            global_idx += 1
-            time.sleep(1)  # API 레이트 리밋 방지
-
+    report.elapsed_seconds = time.perf_counter() - started
+    report.rate_limit_hits = engine.rate_limit_hits
+    st.session_state.last_image_run = {
+        "succeeded": len(report.succeeded),
+        "failed": len(report.failed),
+        "elapsed": report.elapsed_seconds,
+        "images_per_minute": report.images_per_minute,
+        "rate_limit_hits": report.rate_limit_hits,
+        "api_calls_saved": report.api_calls_saved,
+        "avg_file_bytes": report.avg_file_bytes,
+        "avg_save_ms": report.avg_save_ms,
+        "hedges": engine.image_generator.guard.hedges - hedges_before,
+    }
     progress_bar.progress(1.0, text="모든 이미지 생성 완료!")
-    st.balloons()
-    st.rerun()
+    if not report.failed:
+        st.balloons()
+        st.rerun()
+
+last_run = st.session_state.get("last_image_run")
+if last_run:
+    st.caption(
+        f"⏱️ 마지막 일괄 생성: 성공 {last_run['succeeded']}개 · 실패 {last_run['failed']}개 · "
+        f"{last_run['elapsed']:.1f}초 ({last_run['images_per_minute']:.1f}장/분) · "
+        f"레이트 리밋 재시도 {last_run['rate_limit_hits']}회 · "
+        f"캐시/중복 재사용으로 절약한 API 호출 {last_run.get('api_calls_saved', 0)}회"
+    )
+    st.caption(
+        f"💾 이미지당 평균 {last_run.get('avg_file_bytes', 0) / 1024:.0f}KB · "
+        f"저장 {last_run.get('avg_save_ms', 0):.1f}ms · "
+        f"중복 전송(hedging) {last_run.get('hedges', 0)}회"
+    )
+image_cache_stats = ImageCache().stats()
+st.caption(
+    f"이미지 캐시: {image_cache_stats['entries']}개 ({image_cache_stats['bytes'] / 1024 / 1024:.0f}MB) · "
+    f"적중 {image_cache_stats['hits']} / 미적중 {image_cache_stats['misses']} "
+    f"(적중률 {image_cache_stats['hit_rate'] * 100:.0f}%)"
+)
+
+# 세로/정사각 변형 (API 재호출 없이 마스터 이미지에서 로컬 crop)
+if generated_count > 0:
+    ratio_labels = " · ".join(DEFAULT_VARIANTS)
+    missing_variants = [
+        ip for _, ip in all_prompts
+        if ip.image_path and os.path.exists(ip.image_path)
+        and not all(os.path.exists(ip.variants.get(r, "")) for r in DEFAULT_VARIANTS)
+    ]
+    if missing_variants and st.button(f"📱 쇼츠용 변형 만들기 ({ratio_labels})", use_container_width=True,
+                                      help="생성된 16:9 이미지에서 중요한 영역을 찾아 세로/정사각 이미지를 잘라냅니다."):
+        with st.spinner(f"이미지 {len(missing_variants)}개의 변형을 만드는 중..."):
+            started = time.perf_counter()
+            outputs = derive_variants_batch([ip.image_path for ip in missing_variants])
+            elapsed = time.perf_counter() - started
+        errors = 0
+        for ip in missing_variants:
+            variants, error = outputs.get(ip.image_path, ({}, "missing"))
+            if error:
+                errors += 1
+            ip.variants = variants
+        update_state(state)
+        AssetStore(state.project_id).write_manifest(state)
+        st.success(f"변형 {len(missing_variants) - errors}개 완료 ({elapsed:.1f}초)")
+        if errors:
+            st.warning(f"{errors}개 이미지는 변형을 만들지 못했습니다.")
 
 # 전체 ZIP 다운로드
 if generated_count > 0:
@@ -314,9 +497,8 @@ if generated_count > 0:
         with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
             for idx, (section, ip) in enumerate(all_prompts):
                 if ip.image_path and os.path.exists(ip.image_path):
-                    filename = f"{idx + 1:02d}_{section.section_type}.png"
-                    with open(ip.image_path, "rb") as f:
-                        zf.writestr(filename, f.read())
+                    filename = f"{idx + 1:02d}_{section.section_type}{os.path.splitext(ip.image_path)[1]}"
+                    zf.write(ip.image_path, filename, compress_type=zipfile.ZIP_STORED)
 
         st.download_button(
             "💾 ZIP 파일 저장",
@@ -1,7 +1,8 @@
 import streamlit as st
 from utils.session_state import get_state, update_state
 from core.voice_synthesizer import VoiceSynthesizer
-from core.audio_processor import AudioProcessor
+from core.audio_processor import DEFAULT_CROSSFADE_MS, SECTION_GAP_MS, AudioProcessor
+from core.asset_store import AssetStore
 from models.data_models import AudioBlock
 
 st.title("Step 3: 음성")
@@ -97,6 +98,15 @@ if not state.audio_blocks:
 
 processor = AudioProcessor()
 
+audio_format = st.radio(
+    "음성 파일 형식",
+    options=["mp3", "wav"],
+    format_func=lambda f: "MP3" if f == "mp3" else "WAV (PCM, 무손실)",
+    horizontal=True,
+    key="tts_audio_format",
+    help="WAV는 ElevenLabs에서 PCM으로 받아 최종 병합 때 한 번만 인코딩합니다.",
+)
+
 # 진행률 표시
 confirmed_count = sum(1 for b in state.audio_blocks if b.confirmed)
 total_count = len(state.audio_blocks)
@@ -137,11 +147,20 @@ for i, block in enumerate(state.audio_blocks):
             if st.button(f"🔊 {btn_label}", key=f"btn_gen_{i}", type="primary" if not block.audio_data else "secondary", use_container_width=True):
                 with st.spinner("생성 중..."):
                     try:
-                        audio_data = synthesizer.generate_audio(block.text, state.selected_voice_id)
+                        audio_data = synthesizer.generate_audio(
+                            block.text, state.selected_voice_id, audio_format=audio_format
+                        )
                         block.audio_data = audio_data
+                        block.audio_format = audio_format
                         block.voice_id = state.selected_voice_id
                         block.confirmed = False
+                        asset_store = AssetStore(state.project_id)
+                        block.audio_path = asset_store.write_bytes(
+                            f"audio/{i + 1:02d}_{section.section_type}.{audio_format}",
+                            audio_data,
+                        )
                         update_state(state)
+                        asset_store.write_manifest(state)
                         st.rerun()
                     except Exception as e:
                         st.error(f"실패: {e}")
@@ -156,7 +175,7 @@ for i, block in enumerate(state.audio_blocks):
 
         # 오디오 플레이어 (play/stop + 스크롤 지원)
         if block.audio_data:
-            st.audio(block.audio_data, format="audio/mp3")
+            st.audio(block.audio_data, format=f"audio/{block.audio_format}")
             if block.duration_seconds > 0:
                 st.caption(f"길이: {block.duration_seconds:.1f}초")
 
@@ -166,6 +185,17 @@ for i, block in enumerate(state.audio_blocks):
 st.divider()
 st.header("4. 전체 오디오 병합")
 
+with st.expander("후처리 옵션", expanded=False):
+    use_pcm = st.checkbox(
+        "PCM 후처리 (앞뒤 무음 제거 · 음량 정규화 · 경계 페이드)",
+        value=bool(state.audio_blocks) and all(b.audio_format == "wav" for b in state.audio_blocks),
+        help="끄면 블록을 그대로 이어 붙입니다 (같은 형식의 MP3는 재인코딩 없이 병합).",
+    )
+    gap_ms = st.slider("섹션 간 간격 (ms)", min_value=0, max_value=2000, value=SECTION_GAP_MS, step=50, disabled=not use_pcm)
+    crossfade_ms = st.slider(
+        "경계 페이드 (ms)", min_value=0, max_value=100, value=DEFAULT_CROSSFADE_MS, step=5, disabled=not use_pcm
+    )
+
 if st.button("🎵 전체 오디오 병합 및 확정", type="primary", use_container_width=True):
     not_confirmed = [b.section_index + 1 for b in state.audio_blocks if not b.confirmed]
     missing_audio = [b.section_index + 1 for b in state.audio_blocks if not b.audio_data]
@@ -178,13 +208,23 @@ if st.button("🎵 전체 오디오 병합 및 확정", type="primary", use_cont
         with st.spinner("오디오 병합 및 타임스탬프 계산 중..."):
             try:
                 sections_meta = [{"section_type": s.section_type} for s in state.script.sections]
-                final_audio, timestamps = processor.merge_audio_blocks(state.audio_blocks, sections_meta)
+                if use_pcm:
+                    final_audio, timestamps = processor.merge_pcm_blocks(
+                        state.audio_blocks, sections_meta, gap_ms=gap_ms, crossfade_ms=crossfade_ms
+                    )
+                else:
+                    final_audio, timestamps = processor.merge_audio_blocks(state.audio_blocks, sections_meta)
 
                 state.final_audio_bytes = final_audio
                 state.timestamps = timestamps
+                asset_store = AssetStore(state.project_id)
+                state.final_audio_path = asset_store.write_bytes("audio/Final_Audio.mp3", final_audio)
                 update_state(state)
+                asset_store.write_manifest(state)
 
                 st.success("오디오 병합 완료!")
+                if processor.last_merge_mode == "stream_copy":
+                    st.caption("MP3 프레임을 그대로 이어 붙였습니다 (재인코딩 없음).")
             except Exception as e:
                 st.error(f"병합 실패: {e}")
 
@@ -1,7 +1,11 @@
+import os
+import tempfile
+
 import streamlit as st
 
 from core.exporter import build_zip_package
 from core.subtitle_generator import SubtitleGenerator
+from core.text_overlay import TextOverlay, overlay_batch
 from utils.session_state import get_state, update_state
 
 st.title("Step 4: 내보내기")
@@ -28,6 +32,8 @@ if st.button("📝 SRT 생성하기", type="primary"):
             state.srt_content = srt_text
             update_state(state)
             st.success("SRT 생성 완료")
+            if generator.last_fallback_reason:
+                st.info(f"Gemini 대신 섹션 타임스탬프로 SRT를 만들었습니다: {generator.last_fallback_reason}")
         except Exception as e:
             st.error(f"SRT 생성 실패: {e}")
 
@@ -41,15 +47,39 @@ st.header("2. ZIP 패키지 내보내기")
 if not state.srt_content:
     st.info("먼저 SRT를 생성해주세요.")
 else:
+    burn_captions = st.checkbox(
+        "이미지에 자막 입히기 (Images_Captioned 폴더 추가)", value=False,
+        help="각 이미지가 설명하는 대본 구간을 이미지 하단에 입힌 사본을 함께 넣습니다. 모든 CPU 코어를 사용합니다.",
+    )
     if st.button("📦 ZIP 만들기", type="primary"):
-        with st.spinner("ZIP 패키지 생성 중..."):
+        with st.spinner("ZIP 패키지 생성 중..."), tempfile.TemporaryDirectory() as caption_dir:
             try:
+                captioned_images = None
+                if burn_captions:
+                    overlay = TextOverlay()
+                    if overlay.font_missing:
+                        st.warning(f"자막 폰트 파일이 없어 기본 폰트를 사용합니다 (한글이 깨질 수 있음): {overlay.font_path}")
+                    jobs = [
+                        (ip.image_path, ip.text_segment,
+                         os.path.join(caption_dir, f"{idx:03d}{os.path.splitext(ip.image_path)[1]}"))
+                        for idx, ip in enumerate(state.script.all_image_prompts)
+                        if ip.image_path and os.path.exists(ip.image_path) and ip.text_segment.strip()
+                    ]
+                    overlay_report = overlay_batch(jobs)
+                    captioned_images = overlay_report.outputs
+                    st.caption(
+                        f"자막 이미지 {len(overlay_report.outputs)}장 · "
+                        f"{overlay_report.images_per_second:.1f}장/초 (프로세스 {overlay_report.workers}개)"
+                    )
+                    if overlay_report.errors:
+                        st.warning(f"{len(overlay_report.errors)}장은 자막을 입히지 못했습니다.")
                 zip_bytes = build_zip_package(
                     bible_reference=state.script.bible_reference,
                     script=state.script,
                     final_audio_bytes=state.final_audio_bytes,
                     srt_content=state.srt_content,
                     timestamps=state.timestamps,
+                    captioned_images=captioned_images,
                 )
                 st.download_button(
                     "💾 ZIP 다운로드",
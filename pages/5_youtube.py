@@ -1,6 +1,13 @@
+import os
+
 import streamlit as st
 
-from utils.session_state import get_state
+from core.asset_store import AssetStore
+from core.text_overlay import TextOverlay
+from core.thumbnails import get_thumbnail
+from core.youtube_thumbnail import render_thumbnails
+from models.data_models import YouTubeMetadata
+from utils.session_state import get_state, update_state
 
 st.title("Step 5: 유튜브")
 state = get_state()
@@ -11,3 +18,63 @@ if state.youtube_metadata:
     st.write("제목 후보:", state.youtube_metadata.title_candidates)
 else:
     st.write("메타데이터가 아직 없습니다.")
+
+st.divider()
+st.header("썸네일 후보")
+
+if not state.script:
+    st.warning("먼저 Step 1~2에서 스크립트와 이미지를 생성해주세요.")
+    st.stop()
+
+metadata = state.youtube_metadata
+default_title = ""
+if metadata:
+    default_title = metadata.selected_title or (metadata.title_candidates[0] if metadata.title_candidates else "")
+title = st.text_input("썸네일 제목", value=default_title or state.script.bible_reference)
+count = st.slider("후보 수", min_value=3, max_value=12, value=6, step=3)
+
+if st.button("🖼️ 썸네일 후보 만들기", type="primary"):
+    overlay = TextOverlay()
+    if overlay.font_missing:
+        st.warning(f"제목 폰트 파일이 없어 기본 폰트를 사용합니다 (한글이 깨질 수 있음): {overlay.font_path}")
+    with st.spinner("썸네일 렌더링 중..."):
+        asset_store = AssetStore(state.project_id)
+        candidates = render_thumbnails(
+            state.script, title, os.path.join(asset_store.image_dir, "thumbnails"), count=count
+        )
+        if not candidates:
+            st.error("썸네일을 만들 이미지나 제목이 없습니다. Step 2에서 이미지를 먼저 생성해주세요.")
+        else:
+            if state.youtube_metadata is None:
+                state.youtube_metadata = YouTubeMetadata()
+            state.youtube_metadata.thumbnail_candidates = [c.path for c in candidates if c.path]
+            update_state(state)
+            asset_store.write_manifest(state)
+            failed = [c for c in candidates if c.error]
+            st.success(f"썸네일 후보 {len(candidates) - len(failed)}장 생성 완료")
+            for candidate in failed:
+                st.warning(f"{os.path.basename(candidate.source_image)} ({candidate.layout}) 실패: {candidate.error}")
+
+metadata = state.youtube_metadata
+if metadata and metadata.thumbnail_candidates:
+    cols = st.columns(3)
+    for i, path in enumerate(metadata.thumbnail_candidates):
+        if not os.path.exists(path):
+            continue
+        with cols[i % 3]:
+            selected = path == metadata.thumbnail_path
+            st.image(get_thumbnail(path), caption=f"{'✅ ' if selected else ''}{os.path.getsize(path) / 1024:.0f} KB")
+            if st.button("이 썸네일 선택", key=f"thumb_select_{i}", disabled=selected):
+                metadata.thumbnail_path = path
+                update_state(state)
+                AssetStore(state.project_id).write_manifest(state)
+                st.rerun()
+            # 다운로드 버튼: 파일은 요청한 후보에서만 읽음
+            if st.session_state.get("thumbnail_download_ready") == path:
+                with open(path, "rb") as f:
+                    st.download_button(
+                        "💾 저장", f.read(), file_name=os.path.basename(path), mime="image/jpeg", key=f"thumb_dl_{i}"
+                    )
+            elif st.button("⬇️ 다운로드", key=f"thumb_dl_prepare_{i}"):
+                st.session_state.thumbnail_download_ready = path
+                st.rerun()
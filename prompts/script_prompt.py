@@ -1,3 +1,7 @@
+import re
+
+from models.data_models import ImagePrompt, ScriptSection
+
 SYSTEM_PROMPT = """You are a creative writer for a YouTube channel called "Everyday Bible" (하루 딱! 한장).
 Your goal is to create a meditative, insightful, and engaging script based on a given Bible passage.
 Write in calm, reflective Korean using the polite tone ("~습니다", "~입니다").
@@ -99,9 +103,170 @@ Example format (showing varying number of image_prompts per section):
 Return ONLY the JSON object. Ensure all content is on single lines with no raw newlines.
 """
 
+# 섹션별 길이/도입 문구 규칙 (SYSTEM_PROMPT의 Script Structure, Length Targets와 동일하게 유지)
+SECTION_RULES = {
+    "Opening": {"min_chars": 110, "max_chars": 170},
+    "PassageIntro": {"min_chars": 210, "max_chars": 320},
+    "ReadingOne": {
+        "min_chars": 150, "max_chars": 240,
+        "starts_with": "먼저", "contains": "말씀을 함께 읽어보겠습니다",
+    },
+    "ExplanationOne": {"min_chars": 260, "max_chars": 360},
+    "ReadingTwo": {
+        "min_chars": 150, "max_chars": 230,
+        "starts_with": "이제 두 번째 구절을 함께 보겠습니다", "contains": "말씀입니다",
+    },
+    "ExplanationTwo": {"min_chars": 260, "max_chars": 360},
+    "ReadingThree": {
+        "min_chars": 150, "max_chars": 230,
+        "starts_with": "마지막으로", "contains": "말씀을 읽어보겠습니다",
+    },
+    "ExplanationThree": {"min_chars": 260, "max_chars": 360},
+    "Prayer": {"min_chars": 260, "max_chars": 380, "starts_with": "이제 함께 기도하겠습니다"},
+    "Ending": {"min_chars": 80, "max_chars": 140},
+}
+
+KOREAN_ONLY_INSTRUCTION = """
+**KOREAN-ONLY IMAGE PROMPTS:**
+- Each image prompt has ONLY "text_segment" and "prompt_korean".
+- Do NOT write "prompt_english". English prompts are produced in a separate step.
+"""
+
+# 예시 JSON에서 prompt_english 항목을 제거한 한국어 전용 시스템 프롬프트
+KOREAN_ONLY_SYSTEM_PROMPT = (
+    re.sub(r', "prompt_english": "[^"]*"', "", SYSTEM_PROMPT).rstrip()
+    + "\n"
+    + KOREAN_ONLY_INSTRUCTION
+)
+
+
+READING_SECTIONS = ("ReadingOne", "ReadingTwo", "ReadingThree")
+
+VERSE_REFERENCE_INSTRUCTION = """
+**VERSE REFERENCES INSTEAD OF VERSE TEXT (ReadingOne, ReadingTwo, ReadingThree):**
+- Write ONLY the lead-in sentence in "content". Do NOT write the Bible verse text itself.
+- Add a "bible_verse" field with the exact reference of the verse to read, e.g. "사사기 7:7" or "요한복음 3:16-17".
+- The verse text is inserted automatically from the licensed translation right after the lead-in.
+- The image prompts of these sections may describe the scene of the verse, but their text_segment quotes only the lead-in.
+"""
+
+
+def get_system_prompt(korean_only: bool = False, verse_references: bool = False) -> str:
+    """
+    korean_only: prompt_english 없이 한글 이미지 프롬프트만 생성
+    verse_references: Reading 섹션에서 구절 본문 대신 bible_verse 참조만 생성 (VerseIndex로 본문 삽입)
+    """
+    prompt = KOREAN_ONLY_SYSTEM_PROMPT if korean_only else SYSTEM_PROMPT
+    if verse_references:
+        prompt = prompt.rstrip() + "\n" + VERSE_REFERENCE_INSTRUCTION
+    return prompt
+
+
 def get_user_prompt(bible_passage: str) -> str:
     return f"""
 Please create a script for the following Bible passage:
 
 Input: {bible_passage}
 """
+
+
+def get_section_regen_prompt(
+    bible_passage: str,
+    section_type: str,
+    current_content: str,
+    previous_content: str,
+    next_content: str,
+    problems: list,
+    korean_only: bool = False,
+    verse_references: bool = False,
+) -> str:
+    rules = SECTION_RULES.get(section_type, {})
+    rule_lines = []
+    if rules.get("min_chars"):
+        rule_lines.append(
+            f"- Length: {rules['min_chars']}–{rules['max_chars']} Korean characters (including spaces)."
+        )
+    if rules.get("starts_with"):
+        rule_lines.append(f'- Must start with: "{rules["starts_with"]}"')
+    if rules.get("contains"):
+        rule_lines.append(f'- Must contain: "{rules["contains"]}"')
+    rule_lines.append("- ALL numbers must be written in Korean Hangul (no Arabic numerals).")
+    output_fields = '"section_type": "{}", "content": "..."'.format(section_type)
+    if verse_references and section_type in READING_SECTIONS:
+        rule_lines.append(
+            '- Write only the lead-in sentence in "content" and put the verse reference '
+            '(e.g. "사사기 7:7") in "bible_verse"; the verse text is inserted automatically.'
+        )
+        output_fields += ', "bible_verse": "..."'
+    problem_lines = "\n".join(f"- {p}" for p in problems) or "- (none reported)"
+    image_fields = '"text_segment", "prompt_korean"' + ("" if korean_only else ', "prompt_english"')
+
+    return f"""
+Rewrite ONLY the {section_type} section of the script for: {bible_passage}
+
+Problems with the current version:
+{problem_lines}
+
+Rules for this section:
+{chr(10).join(rule_lines)}
+
+Previous section (for context, do not repeat it):
+{previous_content or "(none)"}
+
+Current {section_type} section:
+{current_content}
+
+Next section (for context, do not repeat it):
+{next_content or "(none)"}
+
+Return ONLY one JSON object (no markdown) of the form:
+{{{output_fields}, "image_prompts": [{{...}}]}}
+Each image prompt has {image_fields}, following the image prompt guidelines.
+"""
+
+
+SCRIPT_TOOL_NAME = "submit_script"
+
+TOOL_MODE_INSTRUCTION = f"""
+Submit the finished script by calling the `{SCRIPT_TOOL_NAME}` tool.
+Put all 10 sections in the tool input instead of writing JSON as text.
+"""
+
+
+def _object_schema(model, fields: list) -> dict:
+    """pydantic 모델 스키마에서 모델이 채워야 할 필드만 남긴 object 스키마를 만듭니다."""
+    properties = model.model_json_schema()["properties"]
+    kept = {}
+    for name in fields:
+        prop = dict(properties[name])
+        prop.pop("title", None)
+        prop.pop("default", None)
+        kept[name] = prop
+    return {"type": "object", "properties": kept, "required": list(fields)}
+
+
+def get_script_tool(korean_only: bool = False, verse_references: bool = False) -> dict:
+    """ScriptData/ScriptSection/ImagePrompt 스키마를 tool input_schema로 변환합니다."""
+    image_fields = ["text_segment", "prompt_korean"]
+    if not korean_only:
+        image_fields.append("prompt_english")
+    image_prompt = _object_schema(ImagePrompt, image_fields)
+    section = _object_schema(ScriptSection, ["section_type", "content", "image_prompts"])
+    section["properties"]["image_prompts"]["items"] = image_prompt
+    if verse_references:
+        # Reading 섹션에서만 채우는 선택 필드
+        section["properties"]["bible_verse"] = {
+            "type": "string",
+            "description": "Reading 섹션에서 읽을 구절 참조 (예: '사사기 7:7')",
+        }
+    return {
+        "name": SCRIPT_TOOL_NAME,
+        "description": "Submit the complete Everyday Bible script with exactly 10 sections.",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "sections": {"type": "array", "items": section, "minItems": 10, "maxItems": 10}
+            },
+            "required": ["sections"],
+        },
+    }
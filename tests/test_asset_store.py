@@ -0,0 +1,99 @@
+import json
+import os
+import time
+
+import pytest
+
+from core import asset_store
+from core.asset_store import AssetStore, collect_garbage, mark_active
+from models.data_models import ImagePrompt, ProjectState, ScriptData, ScriptSection
+
+OLD = time.time() - 7 * 24 * 60 * 60
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(asset_store, "_active_projects", {})
+
+
+def make_state(project_id, image_path):
+    prompt = ImagePrompt(text_segment="", prompt_korean="", prompt_english="", image_path=image_path)
+    script = ScriptData(
+        bible_reference="요한복음 3장",
+        sections=[ScriptSection(section_type="Opening", content="", image_prompts=[prompt])],
+    )
+    return ProjectState(project_id=project_id, script=script)
+
+
+def make_project(root, project_id, image_bytes=b"x" * 100, referenced=True):
+    store = AssetStore(project_id, str(root))
+    path = store.write_bytes("images/001.png", image_bytes)
+    store.write_manifest(make_state(project_id, path) if referenced else ProjectState(project_id=project_id))
+    os.utime(path, (OLD, OLD))
+    return store, path
+
+
+def age_manifest(store):
+    manifest_path = os.path.join(store.project_dir, asset_store.MANIFEST_FILE)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["updated_at"] = OLD
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def test_unreferenced_files_are_swept(tmp_path):
+    _, path = make_project(tmp_path, "p1", referenced=False)
+    report = collect_garbage(str(tmp_path))
+    assert not os.path.exists(path)
+    assert report.removed_files >= 1
+
+
+def test_project_without_manifest_or_state_is_skipped(tmp_path):
+    os.makedirs(tmp_path / "orphan" / "images")
+    orphan = tmp_path / "orphan" / "images" / "a.png"
+    orphan.write_bytes(b"x" * 100)
+    os.utime(orphan, (OLD, OLD))
+    report = collect_garbage(str(tmp_path), max_bytes=0)
+    assert orphan.exists()
+    assert report.skipped_projects == ["orphan"]
+    assert report.total_bytes == 100
+
+
+def test_manifest_is_rebuilt_from_project_file(tmp_path):
+    store, path = make_project(tmp_path, "p1")
+    manifest_path = os.path.join(store.project_dir, asset_store.MANIFEST_FILE)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        files = json.load(f)["files"]
+    os.remove(manifest_path)
+    with open(os.path.join(store.project_dir, asset_store.PROJECT_FILE), "w", encoding="utf-8") as f:
+        f.write(make_state("p1", path).model_dump_json())
+    collect_garbage(str(tmp_path))
+    assert os.path.exists(path)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["files"] == files
+
+
+def test_eviction_skips_recently_updated_and_active_projects(tmp_path):
+    stale, stale_path = make_project(tmp_path, "stale")
+    fresh, fresh_path = make_project(tmp_path, "fresh")
+    active, active_path = make_project(tmp_path, "active")
+    age_manifest(stale)
+    age_manifest(active)
+    # 다른 세션이 사용 중인 프로젝트 (protect에는 없음)
+    mark_active("active", str(tmp_path))
+
+    report = collect_garbage(str(tmp_path), max_bytes=0, protect={"current"})
+
+    assert report.evicted_projects == ["stale"]
+    assert not os.path.exists(stale_path)
+    assert os.path.exists(fresh_path)
+    assert os.path.exists(active_path)
+
+
+def test_protected_project_is_never_evicted(tmp_path):
+    store, path = make_project(tmp_path, "current")
+    age_manifest(store)
+    report = collect_garbage(str(tmp_path), max_bytes=0, protect={"current"})
+    assert report.evicted_projects == []
+    assert os.path.exists(path)
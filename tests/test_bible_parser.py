@@ -0,0 +1,65 @@
+import pytest
+
+from utils.bible_parser import (
+    ChapterOutOfRangeError,
+    parse_bible_reference,
+    parse_reference,
+    reference_key,
+    resolve_book,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("시편 23편", ("시편", 23, None, None)),
+        ("시 23", ("시편", 23, None, None)),
+        ("Psalm 23", ("시편", 23, None, None)),
+        ("시편 이십삼편", ("시편", 23, None, None)),
+        ("요 3:16-18", ("요한복음", 3, 16, 18)),
+        ("요 한 복 음 3장", ("요한복음", 3, None, None)),
+        ("요삼 1", ("요한삼서", 1, None, None)),
+        ("유다서", ("유다서", 1, None, None)),
+    ],
+)
+def test_parse_reference(text, expected):
+    assert parse_reference(text).key == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # 한글 장 번호가 더 긴 별칭('요삼', '요일')으로 먹히지 않아야 함
+        ("요 삼장 십육절", ("요한복음", 3, 16, None)),
+        ("요 일장", ("요한복음", 1, None, None)),
+        ("요 이장", ("요한복음", 2, None, None)),
+    ],
+)
+def test_chapter_word_is_not_read_as_book_alias(text, expected):
+    assert parse_reference(text).key == expected
+
+
+def test_display_uses_pyeon_for_psalms_only():
+    assert parse_bible_reference("시 23") == "시편 23편"
+    assert parse_bible_reference("Psalm 23:1-3") == "시편 23편 1-3절"
+    assert parse_bible_reference("요 3:16") == "요한복음 3장 16절"
+
+
+def test_reference_key_is_shared_across_spellings():
+    assert reference_key("시 23") == reference_key("시편 23편") == reference_key("Psalm 23")
+
+
+def test_resolve_book():
+    assert resolve_book("창") == "창세기"
+    assert resolve_book("요 한 복 음") == "요한복음"
+    assert resolve_book("요삼") == "요한삼서"
+    assert resolve_book("없는책") is None
+
+
+def test_chapter_out_of_range():
+    with pytest.raises(ChapterOutOfRangeError):
+        parse_bible_reference("시편 151편")
+
+
+def test_unknown_book_is_returned_cleaned():
+    assert parse_bible_reference("  알 수 없는   본문 ") == "알 수 없는 본문"
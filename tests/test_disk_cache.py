@@ -0,0 +1,57 @@
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from core.disk_cache import DiskLRUCache
+from core.image_cache import ImageCache
+from core.script_cache import ScriptCache
+from models.data_models import ScriptData
+
+
+def test_base_class_is_abstract(tmp_path):
+    with pytest.raises(TypeError):
+        DiskLRUCache(str(tmp_path), 1, 1)
+
+
+def test_script_cache_round_trip_and_stats(tmp_path):
+    cache = ScriptCache(str(tmp_path))
+    script = ScriptData(bible_reference="요한복음 3장", sections=[])
+    assert cache.get("k") is None
+    cache.put("k", script)
+    assert cache.contains("k")
+    assert cache.get("k") == script
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_script_cache_evicts_least_recently_used(tmp_path):
+    cache = ScriptCache(str(tmp_path), max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, ScriptData(bible_reference=key, sections=[]))
+    old = time.time() - 100
+    os.utime(cache._entry_path("a"), (old, old))
+    os.utime(cache._entry_path("b"), (old - 10, old - 10))
+    cache.get("b")  # b를 최근 사용으로 갱신 → a가 가장 오래됨
+    cache.put("c", ScriptData(bible_reference="c", sections=[]))
+    assert not cache.contains("a")
+    assert cache.contains("b") and cache.contains("c")
+
+
+def test_script_cache_key_ignores_reference_spelling():
+    args = ("model", 0.7, "system", "user")
+    assert ScriptCache.make_key("시 23", *args) == ScriptCache.make_key("Psalm 23", *args)
+
+
+def test_image_cache_copies_and_clears(tmp_path):
+    source = tmp_path / "source.png"
+    Image.new("RGB", (4, 4)).save(source)
+    cache = ImageCache(str(tmp_path / "cache"))
+    key = ImageCache.make_key("model", "16:9", " prompt ")
+    assert key == ImageCache.make_key("model", "16:9", "prompt")
+    path = cache.put(key, str(source))
+    assert cache.get(key) == path and os.path.exists(path)
+    cache.clear()
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,66 @@
+import pytest
+
+from utils.hangul_numerals import native_korean, normalize_numerals, parse_sino_korean, sino_korean
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [(0, "영"), (10, "십"), (27, "이십칠"), (150, "백오십"), (10000, "만"), (24000, "이만 사천")],
+)
+def test_sino_korean(n, expected):
+    assert sino_korean(n) == expected
+    assert parse_sino_korean(expected.replace(" ", "")) == n
+
+
+def test_native_korean():
+    assert [native_korean(n) for n in (1, 3, 20, 24)] == ["한", "세", "스무", "스물네"]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("27장", "이십칠장"),
+        ("24,000명", "이만 사천 명"),
+        ("3명", "세 명"),
+        ("2024년 6월 1일", "이천이십사년 유월 일일"),
+        ("시편 23편", "시편 이십삼편"),
+    ],
+)
+def test_counters(text, expected):
+    assert normalize_numerals(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("요한복음 3:16", "요한복음 삼장 십육절"),
+        ("요한복음 3:16-18 말씀", "요한복음 삼장 십육절에서 십팔절 말씀"),
+        ("시편 23:1", "시편 이십삼편 일절"),
+        ("요한일서 4:8", "요한일서 사장 팔절"),
+    ],
+)
+def test_chapter_verse_after_book_name(text, expected):
+    assert normalize_numerals(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("오전 10:30에 모입니다", "오전 열 시 삼십 분에 모입니다"),
+        ("12:00 정오", "열두 시 정오"),
+        ("9:00~10:00 예배", "아홉 시~열 시 예배"),
+        ("3:1의 비율", "삼 대 일의 비율"),
+    ],
+)
+def test_colon_without_book_is_not_chapter_verse(text, expected):
+    assert normalize_numerals(text) == expected
+
+
+def test_default_book_reads_bare_reference():
+    assert normalize_numerals("23:1 말씀", book="시편") == "이십삼편 일절 말씀"
+    assert normalize_numerals("3:16", book="요한복음") == "삼장 십육절"
+
+
+def test_text_without_digits_is_returned_as_is():
+    text = "숫자가 없는 문장"
+    assert normalize_numerals(text) is text
@@ -0,0 +1,33 @@
+import io
+
+import pytest
+from PIL import Image
+
+from core import image_generator
+from core.image_generator import ImageGenerator
+
+
+@pytest.fixture
+def generator(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+    return ImageGenerator(use_cache=False, storage_codec="auto")
+
+
+def png_bytes():
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 4)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_save_keeps_bytes_when_codec_matches(generator):
+    path = generator._save_image_bytes(png_bytes(), "image/png", str(generator.output_dir) + "/a")
+    assert path.endswith(".png")
+    assert generator.save_log[path]["transcoded"] is False
+
+
+def test_save_log_is_bounded(generator, monkeypatch):
+    monkeypatch.setattr(image_generator, "SAVE_LOG_MAX_ENTRIES", 3)
+    data = png_bytes()
+    paths = [generator._save_image_bytes(data, "image/png", f"{generator.output_dir}/{i}") for i in range(5)]
+    assert list(generator.save_log) == paths[-3:]
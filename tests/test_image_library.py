@@ -0,0 +1,69 @@
+import time
+
+import numpy as np
+import pytest
+
+from core.image_library import ImageLibrary
+
+
+def make_image(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.fixture
+def library(tmp_path):
+    return ImageLibrary(str(tmp_path / "library"))
+
+
+def test_search_finds_similar_prompt(library, tmp_path):
+    library.add("a shepherd with sheep on a green hill", make_image(tmp_path, "a.png", b"a"), "watercolor")
+    library.add("a storm over the sea of galilee", make_image(tmp_path, "b.png", b"b"), "watercolor")
+
+    matches = library.search("shepherd with sheep on a hill", threshold=0.3)
+
+    assert matches[0].prompt == "a shepherd with sheep on a green hill"
+    assert matches[0].score > 0.3
+
+
+def test_search_filters_by_art_style(library, tmp_path):
+    library.add("a shepherd with sheep", make_image(tmp_path, "a.png", b"a"), "watercolor")
+
+    assert library.search("a shepherd with sheep", threshold=0.3, art_style="oil") == []
+
+
+def test_same_image_is_stored_once(library, tmp_path):
+    first = library.add("a shepherd", make_image(tmp_path, "a.png", b"same"))
+    second = library.add("another prompt", make_image(tmp_path, "b.png", b"same"))
+
+    assert first == second
+    assert len(library) == 1
+
+
+def test_cold_load_matches_live_search(library, tmp_path):
+    for i, prompt in enumerate(["a shepherd with sheep", "a storm at sea", "bread and fish"]):
+        library.add(prompt, make_image(tmp_path, f"{i}.png", prompt.encode()))
+    library.flush()
+
+    reloaded = ImageLibrary(library.library_dir)
+
+    assert len(reloaded) == 3
+    assert [m.prompt for m in reloaded.search("storm at sea", threshold=0.3)] == ["a storm at sea"]
+
+
+def test_install_rows_keeps_matrix_seen_by_search(library, tmp_path):
+    # search()는 잠금 밖에서 행렬 뷰를 읽으므로, 재계산 결과 설치가 그 뷰를 바꾸면 안 됨
+    for i, prompt in enumerate(["a shepherd with sheep", "a storm at sea"]):
+        library.add(prompt, make_image(tmp_path, f"{i}.png", prompt.encode()))
+    while library._rebuilding:
+        time.sleep(0.01)
+    with library._lock:
+        view = library._matrix[: library._size]
+        before = view.copy()
+        library._install_rows(np.zeros((1, library.dim), dtype=np.float32))
+
+        np.testing.assert_array_equal(view, before)
+        assert library._size == 2
+        assert not library._matrix[0].any()
+        np.testing.assert_array_equal(library._matrix[1], before[1])
@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from core.json_recovery import RecoveryError, recover_json
+
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "json_corpus")
+
+
+@pytest.mark.parametrize("name", sorted(os.listdir(CORPUS_DIR)))
+def test_corpus_recovers_to_object(name):
+    with open(os.path.join(CORPUS_DIR, name), "r", encoding="utf-8") as f:
+        assert isinstance(recover_json(f.read()), dict)
+
+
+def test_smart_quotes_and_trailing_comma():
+    assert recover_json('{“a”: “b”, "c": [1, 2,],}') == {"a": "b", "c": [1, 2]}
+
+
+def test_inner_quotes_are_escaped():
+    assert recover_json('{"a": "그가 "예"라고 말했다"}') == {"a": '그가 "예"라고 말했다'}
+
+
+# 잘린 응답: 마지막 완결 값까지 살리고, 끝의 미완성 토큰만 버림
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": "x", "b": [1, 2', {"a": "x", "b": [1, 2]}),
+        ('{"title": "t", "sections": [{"n": 5', {"title": "t", "sections": [{"n": 5}]}),
+        ('{"a": 1, "b": tr', {"a": 1}),
+        ('{"a": 1, "b": true', {"a": 1, "b": True}),
+        ('{"a": [null, false, -1.5e3', {"a": [None, False, -1500.0]}),
+        ('{"a": 1, "b": 2.', {"a": 1}),
+        ('{"a": "x", "b": "unfinished', {"a": "x"}),
+    ],
+)
+def test_truncated_literals(text, expected):
+    assert recover_json(text) == expected
+
+
+def test_missing_comma_between_literals():
+    assert recover_json('{"a": [1 2], "b": 3}') == {"a": [1, 2], "b": 3}
+
+
+def test_no_object():
+    with pytest.raises(RecoveryError):
+        recover_json("no json here")
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from core.json_stream import SectionStreamReader
+
+SECTIONS = [
+    {"section_type": "intro", "content": "시작 {괄호}와 \"따옴표\""},
+    {"section_type": "verse", "content": "줄\n바꿈 [배열] \\ 역슬래시", "extra": {"a": [1, 2]}},
+    {"section_type": "outro", "content": "끝"},
+]
+DOCUMENT = "```json\n" + json.dumps({"title": "t", "sections": SECTIONS}, ensure_ascii=False) + "\n```"
+
+
+def feed_all(reader, text, size):
+    sections = []
+    for i in range(0, len(text), size):
+        sections.extend(reader.feed(text[i : i + size]))
+    return sections
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(DOCUMENT)])
+def test_sections_are_emitted_regardless_of_chunking(size):
+    reader = SectionStreamReader()
+
+    assert feed_all(reader, DOCUMENT, size) == SECTIONS
+    assert reader.text == DOCUMENT
+
+
+def test_section_is_emitted_as_soon_as_it_closes():
+    reader = SectionStreamReader()
+    first = json.dumps(SECTIONS[0], ensure_ascii=False)
+
+    assert reader.feed('{"sections": [' + first[:-1]) == []
+    assert reader.feed("}") == [SECTIONS[0]]
+
+
+def test_text_before_json_is_ignored():
+    reader = SectionStreamReader()
+    text = '설명 [참고] "인용"\n{"sections": [{"section_type": "a", "content": "b"}]}'
+
+    assert reader.feed(text) == [{"section_type": "a", "content": "b"}]
+
+
+def test_raw_newline_in_string_is_accepted():
+    reader = SectionStreamReader()
+
+    assert reader.feed('{"sections": [{"section_type": "a", "content": "줄\n바꿈"}]}') == [
+        {"section_type": "a", "content": "줄\n바꿈"}
+    ]
+
+
+def test_objects_without_section_fields_are_skipped():
+    reader = SectionStreamReader()
+    text = '{"sections": [{"content": "b"}, {"section_type": "a", "content": "c"}]}'
+
+    assert reader.feed(text) == [{"section_type": "a", "content": "c"}]
+
+
+def test_nested_objects_are_not_emitted_separately():
+    reader = SectionStreamReader()
+    text = '{"meta": {"x": [{"section_type": "n", "content": "n"}]}, "sections": []}'
+
+    assert reader.feed(text) == []
@@ -0,0 +1,60 @@
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from core.prompt_translator import PromptTranslator, TranslationCache, parse_prompts
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"prompts": ["a ", "b"]}', ["a", "b"]),
+        ('```json\n{"prompts": ["a"]}\n```', ["a"]),
+        ('["a", "b"]', ["a", "b"]),
+        ("null", None),
+        ('"just a string"', None),
+        ('{"prompts": {"1": "a"}}', None),
+        ('{"prompts": [{"text": "a"}]}', None),
+        ("not json", None),
+    ],
+)
+def test_parse_prompts(text, expected):
+    assert parse_prompts(text) == expected
+
+
+class FakeMessages:
+    """입력 개수에 따라 미리 정한 응답 텍스트를 돌려주는 messages.create 대역"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = 0
+
+    def create(self, messages, **kwargs):
+        self.calls += 1
+        count = len(re.findall(r"^\d+\. ", messages[0]["content"], flags=re.M))
+        return SimpleNamespace(content=[SimpleNamespace(text=self.responses(count))])
+
+
+def make_translator(monkeypatch, tmp_path, responses):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    translator = PromptTranslator(batch_size=3, cache=TranslationCache(str(tmp_path / "t.json")))
+    translator.client = SimpleNamespace(messages=FakeMessages(responses))
+    return translator
+
+
+def test_wrong_shape_falls_back_per_item(monkeypatch, tmp_path):
+    # 묶음 요청에는 객체가 아닌 JSON(null)을, 항목별 요청에는 정상 응답을 반환
+    translator = make_translator(
+        monkeypatch, tmp_path,
+        lambda count: "null" if count > 1 else json.dumps({"prompts": ["english"]}),
+    )
+    assert translator.translate_batch(["하나", "둘", "셋"], "watercolor") == ["english"] * 3
+    assert translator.client.messages.calls == 4
+
+
+def test_single_item_with_wrong_shape_raises_runtime_error(monkeypatch, tmp_path):
+    translator = make_translator(monkeypatch, tmp_path, lambda count: '"just a string"')
+    with pytest.raises(RuntimeError):
+        translator.translate("하나", "watercolor")
@@ -0,0 +1,54 @@
+import pytest
+
+from core.script_cache import ScriptCache
+from core.script_generator import ScriptGenerator
+from core.script_validator import validate_section
+from models.data_models import ScriptSection
+
+
+class FakeVerseIndex:
+    def __init__(self, verses):
+        self.verses = verses
+
+    def lookup(self, reference, context=None):
+        return self.verses.get(reference)
+
+
+@pytest.fixture
+def make_generator(monkeypatch, tmp_path):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    monkeypatch.chdir(tmp_path)
+
+    def make(**kwargs):
+        return ScriptGenerator(use_cache=False, **kwargs)
+
+    return make
+
+
+def test_spliced_verse_numerals_are_normalized(make_generator):
+    generator = make_generator(verse_index=FakeVerseIndex({"민수기 1:46": "계수된 자가 603,550명이었더라"}))
+    sections = generator._build_sections(
+        {"sections": [{"section_type": "ReadingOne", "content": "1절 말씀입니다.", "bible_verse": "민수기 1:46"}]},
+        "민수기",
+    )
+    generator._splice_verses(sections, "민수기 1장")
+    assert sections[0].content == '일절 말씀입니다. "계수된 자가 육십만 삼천오백오십 명이었더라"'
+    assert not [i for i in validate_section(sections[0], 0) if i.code == "numerals"]
+
+
+def test_splice_skips_verse_already_in_content(make_generator):
+    generator = make_generator(verse_index=FakeVerseIndex({"시편 23:1": "여호와는 나의 목자시니"}))
+    section = ScriptSection(section_type="ReadingOne", content="여호와는 나의 목자시니", bible_verse="시편 23:1")
+    generator._splice_verses([section], "시편 23편")
+    assert section.content == "여호와는 나의 목자시니"
+
+
+def test_cache_key_is_shared_across_reference_spellings(make_generator, tmp_path):
+    generator = make_generator()
+    generator.cache = ScriptCache(str(tmp_path / "cache"))
+    keys = {
+        generator._cache_key(reference, generator._user_prompt(reference))
+        for reference in ("시 23", "시편 23편", "Psalm 23", "시편23장")
+    }
+    assert len(keys) == 1
+    assert generator._user_prompt("Psalm 23") == generator._user_prompt("시편 23편")
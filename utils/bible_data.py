@@ -17,4 +17,19 @@ BIBLE_DATA = {
         "야고보서": 5, "베드로전서": 5, "베드로후서": 3, "요한일서": 5, "요한이서": 1,
         "요한삼서": 1, "유다서": 1, "요한계시록": 22
     }
-}
\ No newline at end of file
+}
+
+# 정경 순서의 책 목록 (창세기=0 ... 요한계시록=65)
+BOOK_ORDER = [book for testament in BIBLE_DATA.values() for book in testament]
+
+# 책 이름 → 장 수 (구약/신약 통합, O(1) 조회용)
+CHAPTER_COUNTS = {
+    book: count
+    for testament in BIBLE_DATA.values()
+    for book, count in testament.items()
+}
+
+
+def get_chapter_count(book: str) -> int:
+    """책의 장 수를 반환합니다. 없는 책이면 0을 반환합니다."""
+    return CHAPTER_COUNTS.get(book, 0)
@@ -1,10 +1,222 @@
 import re
+from typing import Dict, List, Optional, Tuple
+
+from models.data_models import BibleReference
+from utils.bible_data import BIBLE_DATA, CHAPTER_COUNTS
+from utils.hangul_numerals import HANGUL_NUMBER_CHARS, parse_sino_korean
+
+# 책별 약어/영문 이름 (정식 한글 이름은 BIBLE_DATA에서 자동 추가)
+BOOK_ALIASES = {
+    "창세기": ["창", "Genesis", "Gen", "Gn"],
+    "출애굽기": ["출", "Exodus", "Exod", "Ex"],
+    "레위기": ["레", "Leviticus", "Lev"],
+    "민수기": ["민", "Numbers", "Num"],
+    "신명기": ["신", "Deuteronomy", "Deut", "Dt"],
+    "여호수아": ["수", "여호수아서", "Joshua", "Josh"],
+    "사사기": ["삿", "Judges", "Judg"],
+    "룻기": ["룻", "Ruth"],
+    "사무엘상": ["삼상", "1Samuel", "1Sam"],
+    "사무엘하": ["삼하", "2Samuel", "2Sam"],
+    "열왕기상": ["왕상", "1Kings", "1Kgs"],
+    "열왕기하": ["왕하", "2Kings", "2Kgs"],
+    "역대상": ["대상", "1Chronicles", "1Chr"],
+    "역대하": ["대하", "2Chronicles", "2Chr"],
+    "에스라": ["스", "Ezra"],
+    "느헤미야": ["느", "Nehemiah", "Neh"],
+    "에스더": ["에", "Esther", "Esth"],
+    "욥기": ["욥", "Job"],
+    "시편": ["시", "Psalms", "Psalm", "Ps", "Psa"],
+    "잠언": ["잠", "Proverbs", "Prov"],
+    "전도서": ["전", "Ecclesiastes", "Eccl"],
+    "아가": ["아", "아가서", "SongofSongs", "Song"],
+    "이사야": ["사", "이사야서", "Isaiah", "Isa"],
+    "예레미야": ["렘", "예레미야서", "Jeremiah", "Jer"],
+    "예레미야애가": ["애", "애가", "Lamentations", "Lam"],
+    "에스겔": ["겔", "에스겔서", "Ezekiel", "Ezek"],
+    "다니엘": ["단", "다니엘서", "Daniel", "Dan"],
+    "호세아": ["호", "호세아서", "Hosea", "Hos"],
+    "요엘": ["욜", "요엘서", "Joel"],
+    "아모스": ["암", "아모스서", "Amos"],
+    "오바댜": ["옵", "오바댜서", "Obadiah", "Obad"],
+    "요나": ["욘", "요나서", "Jonah", "Jon"],
+    "미가": ["미", "미가서", "Micah", "Mic"],
+    "나훔": ["나", "나훔서", "Nahum", "Nah"],
+    "하박국": ["합", "하박국서", "Habakkuk", "Hab"],
+    "스바냐": ["습", "스바냐서", "Zephaniah", "Zeph"],
+    "학개": ["학", "학개서", "Haggai", "Hag"],
+    "스가랴": ["슥", "스가랴서", "Zechariah", "Zech"],
+    "말라기": ["말", "말라기서", "Malachi", "Mal"],
+    "마태복음": ["마", "마태", "Matthew", "Matt", "Mt"],
+    "마가복음": ["막", "마가", "Mark", "Mk"],
+    "누가복음": ["눅", "누가", "Luke", "Lk"],
+    "요한복음": ["요", "요한", "John", "Jn"],
+    "사도행전": ["행", "Acts"],
+    "로마서": ["롬", "Romans", "Rom"],
+    "고린도전서": ["고전", "1Corinthians", "1Cor"],
+    "고린도후서": ["고후", "2Corinthians", "2Cor"],
+    "갈라디아서": ["갈", "Galatians", "Gal"],
+    "에베소서": ["엡", "Ephesians", "Eph"],
+    "빌립보서": ["빌", "Philippians", "Phil"],
+    "골로새서": ["골", "Colossians", "Col"],
+    "데살로니가전서": ["살전", "1Thessalonians", "1Thess"],
+    "데살로니가후서": ["살후", "2Thessalonians", "2Thess"],
+    "디모데전서": ["딤전", "1Timothy", "1Tim"],
+    "디모데후서": ["딤후", "2Timothy", "2Tim"],
+    "디도서": ["딛", "Titus"],
+    "빌레몬서": ["몬", "Philemon", "Phlm"],
+    "히브리서": ["히", "Hebrews", "Heb"],
+    "야고보서": ["약", "James", "Jas"],
+    "베드로전서": ["벧전", "1Peter", "1Pet"],
+    "베드로후서": ["벧후", "2Peter", "2Pet"],
+    "요한일서": ["요일", "1John", "1Jn"],
+    "요한이서": ["요이", "2John", "2Jn"],
+    "요한삼서": ["요삼", "3John", "3Jn"],
+    "유다서": ["유", "Jude"],
+    "요한계시록": ["계", "계시록", "Revelation", "Rev"],
+}
+
+
+class ChapterOutOfRangeError(ValueError):
+    """책은 인식했지만 장 번호가 해당 책의 범위를 벗어난 경우"""
+
+
+_TERMINAL = "$"
+_SKIP_CHARS = " \t."
+
+_NUMBER = rf"\d+|[{HANGUL_NUMBER_CHARS}]+"
+_REMAINDER = re.compile(
+    rf"^(?:(?P<ch>{_NUMBER})\s*(?:장|편)?"
+    rf"(?:\s*[:：.]?\s*(?P<vs>{_NUMBER})\s*절?"
+    rf"(?:\s*[-~–]\s*(?P<ve>{_NUMBER})\s*절?)?)?)?\s*(?:말씀)?$"
+)
+
+
+def _normalize_alias(alias: str) -> str:
+    return "".join(ch for ch in alias.lower() if ch not in _SKIP_CHARS)
+
+
+def _build_alias_trie() -> Dict:
+    trie: Dict = {}
+    for testament in BIBLE_DATA.values():
+        for book in testament:
+            for alias in [book] + BOOK_ALIASES.get(book, []):
+                node = trie
+                for ch in _normalize_alias(alias):
+                    node = node.setdefault(ch, {})
+                node[_TERMINAL] = book
+    return trie
+
+
+# 모듈 로드 시 한 번만 생성
+_ALIAS_TRIE = _build_alias_trie()
+
+
+def _book_candidates(text: str) -> List[Tuple[str, int]]:
+    """
+    문자열 앞부분과 일치하는 모든 책 이름을 긴 것부터 찾습니다.
+    별칭 안의 공백('요 한 복 음')은 건너뛰므로 '요 삼장'처럼 장 번호가 별칭('요삼')으로 읽힐 수도 있습니다.
+    Returns: [(정식 책 이름, 책 이름 다음 위치), ...]
+    """
+    node = _ALIAS_TRIE
+    candidates = []
+    for i, ch in enumerate(text):
+        if ch in _SKIP_CHARS:
+            continue
+        node = node.get(ch.lower())
+        if node is None:
+            break
+        if _TERMINAL in node:
+            candidates.append((node[_TERMINAL], i + 1))
+    return candidates[::-1]
+
+
+def _match_book(text: str) -> Tuple[Optional[str], int]:
+    """
+    문자열 앞부분에서 책 이름을 찾습니다.
+    나머지가 장/절 형식으로 해석되는 가장 긴 후보를 고르고 ('요 삼장' -> 요한복음, '요삼 1장' -> 요한삼서),
+    그런 후보가 없으면 가장 긴 후보를 반환합니다.
+    Returns: (정식 책 이름, 책 이름 다음 위치) / 없으면 (None, 0)
+    """
+    candidates = _book_candidates(text)
+    if not candidates:
+        return None, 0
+    for book, end in candidates:
+        if _REMAINDER.match(text[end:].strip(_SKIP_CHARS)):
+            return book, end
+    return candidates[0]
+
+
+def resolve_book(name: str) -> Optional[str]:
+    """책 이름/약어 전체가 정확히 일치할 때 정식 책 이름을 반환합니다. 예: '창' -> '창세기'"""
+    book, end = _match_book(name)
+    if book is None or name[end:].strip(_SKIP_CHARS):
+        return None
+    return book
+
+
+def _to_int(token: Optional[str]) -> Optional[int]:
+    if token is None:
+        return None
+    return int(token) if token.isdigit() else parse_sino_korean(token)
+
+
+def parse_reference(text: str) -> BibleReference:
+    """
+    성경 구절 문자열을 구조화된 BibleReference로 변환합니다.
+    예: '시편 23편', '시 23', 'Psalm 23', '시편23장', '요 3:16-18', '시편 이십삼편'
+    알 수 없는 형식이면 ValueError, 장 번호가 범위를 벗어나면 ChapterOutOfRangeError를 발생시킵니다.
+    """
+    cleaned = re.sub(r"\s+", " ", text.strip())
+    book, end = _match_book(cleaned)
+    if book is None:
+        raise ValueError(f"성경 책 이름을 찾을 수 없습니다: {text}")
+
+    match = _REMAINDER.match(cleaned[end:].strip(_SKIP_CHARS))
+    if match is None:
+        raise ValueError(f"장/절 형식을 해석할 수 없습니다: {text}")
+
+    chapter_count = CHAPTER_COUNTS[book]
+    chapter = _to_int(match.group("ch"))
+    if chapter is None:
+        # 한 장짜리 책(오바댜, 유다서 등)은 장 번호 생략 가능
+        if chapter_count != 1:
+            raise ValueError(f"장 번호가 필요합니다: {text}")
+        chapter = 1
+    if not 1 <= chapter <= chapter_count:
+        raise ChapterOutOfRangeError(f"{book}은(는) 1-{chapter_count}장까지 있습니다: {chapter}장")
+
+    verse_start = _to_int(match.group("vs"))
+    verse_end = _to_int(match.group("ve"))
+    if verse_start is not None and verse_end is not None and verse_end < verse_start:
+        raise ValueError(f"절 범위가 올바르지 않습니다: {verse_start}-{verse_end}")
+
+    return BibleReference(
+        book=book, chapter=chapter, verse_start=verse_start, verse_end=verse_end
+    )
+
+
+def reference_key(text: str) -> str:
+    """캐시/중복 제거용 정규화 키. 해석할 수 없는 입력은 공백만 정리해 반환합니다."""
+    try:
+        return "|".join("" if v is None else str(v) for v in parse_reference(text).key)
+    except ValueError:
+        return re.sub(r"\s+", " ", text.strip())
 
 
 def parse_bible_reference(text: str) -> str:
     """
     사용자 입력 성경 구절 문자열을 정제합니다.
+    알려진 책이면 표준 표기('시편 23편', '요한복음 3장 16절')로 바꾸고,
+    장 번호가 범위를 벗어나면 ChapterOutOfRangeError를 발생시킵니다.
+    책 이름을 알 수 없는 입력은 공백만 정리하여 그대로 반환합니다.
     """
-    cleaned = text.strip()
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    return cleaned
\ No newline at end of file
+    cleaned = re.sub(r"\s+", " ", text.strip())
+    book, _ = _match_book(cleaned)
+    if book is None:
+        return cleaned
+    try:
+        return parse_reference(cleaned).display
+    except ChapterOutOfRangeError:
+        raise
+    except ValueError:
+        return cleaned
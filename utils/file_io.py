@@ -0,0 +1,50 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Union
+
+
+def atomic_write(path: str, data: Union[bytes, str]) -> None:
+    """
+    같은 폴더의 임시 파일에 쓴 뒤 os.replace로 바꿔치기합니다.
+    읽는 쪽은 이전 내용이나 새 내용 중 하나만 보며, 쓰다가 실패하면 임시 파일을 지웁니다.
+    str은 UTF-8로 씁니다.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_copy(source_path: str, path: str) -> None:
+    """source_path 파일을 path로 원자적으로 복사합니다."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def file_sha256(path: str) -> str:
+    """파일 내용의 SHA-256 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,180 @@
+import re
+from typing import Optional
+
+from utils.bible_data import BOOK_ORDER
+
+# 한자어 수사
+_SINO_DIGITS = ["", "일", "이", "삼", "사", "오", "육", "칠", "팔", "구"]
+_SINO_SMALL_UNITS = ["", "십", "백", "천"]
+_SINO_LARGE_UNITS = ["", "만", "억", "조", "경"]
+
+# 고유어 수사 (관형형: 한/두/세/네/스무)
+_NATIVE_ONES = ["", "한", "두", "세", "네", "다섯", "여섯", "일곱", "여덟", "아홉"]
+_NATIVE_TENS = ["", "열", "스물", "서른", "마흔", "쉰", "예순", "일흔", "여든", "아흔"]
+
+# 고유어로 읽는 단위 (99 이하일 때만, 그 이상은 한자어 + 띄어쓰기)
+_NATIVE_COUNTERS = {
+    "명", "개", "마리", "살", "사람", "번", "번째", "째", "시", "시간",
+    "가지", "권", "잔", "그릇", "벌", "척", "채", "달", "군데",
+}
+# 한자어로 읽고 붙여 쓰는 단위
+_SINO_COUNTERS = {
+    "장", "절", "편", "년", "월", "일", "개월", "주", "주일", "주년", "세",
+    "층", "원", "대", "호", "회", "차", "권째", "km", "kg", "%",
+}
+_COUNTER_READINGS = {"%": "퍼센트", "km": "킬로미터", "kg": "킬로그램"}
+# 읽을 때 형태가 바뀌는 월 이름
+_MONTH_READINGS = {6: "유월", 10: "시월"}
+
+# 한글 수사 → 정수 변환용
+_SINO_DIGIT_VALUES = {d: i for i, d in enumerate(_SINO_DIGITS) if d}
+_SINO_DIGIT_VALUES.update({"영": 0, "공": 0})
+_SINO_SMALL_UNIT_VALUES = {"십": 10, "백": 100, "천": 1000}
+HANGUL_NUMBER_CHARS = "".join(_SINO_DIGIT_VALUES) + "".join(_SINO_SMALL_UNIT_VALUES) + "만"
+
+_COUNTER_PATTERN = "|".join(
+    re.escape(c) for c in sorted(_NATIVE_COUNTERS | _SINO_COUNTERS, key=len, reverse=True)
+)
+# 'N:M' 바로 앞에 있으면 장:절로 읽는 책 이름 (숫자마다 대조하지 않고 'N:M' 앞부분만 검사)
+_BOOK_BEFORE = re.compile(
+    "(?:" + "|".join(re.escape(b) for b in sorted(BOOK_ORDER, key=len, reverse=True)) + r")\s*$"
+)
+_BOOK_WINDOW = max(len(b) for b in BOOK_ORDER) + 3
+_PATTERN = re.compile(
+    r"(?P<ch>\d+)\s*:\s*(?P<vs>\d+)(?:\s*[-~]\s*(?P<ve>\d+)(?![\d:]|\s*:))?"
+    r"|(?P<num>\d{1,3}(?:,\d{3})+|\d+)(?:\.(?P<frac>\d+))?"
+    rf"(?P<sp>\s*)(?P<counter>{_COUNTER_PATTERN})?"
+)
+
+
+def sino_korean(n: int) -> str:
+    """정수를 한자어 수사로 변환합니다. 예: 24000 -> '이만 사천', 27 -> '이십칠'"""
+    if n == 0:
+        return "영"
+    if n < 0:
+        return "마이너스 " + sino_korean(-n)
+
+    groups = []
+    unit_index = 0
+    while n > 0:
+        n, group = divmod(n, 10000)
+        if group:
+            reading = _read_group(group)
+            # 만 단위의 '일'은 생략 (일만 -> 만), 억 이상은 유지
+            if reading == "일" and unit_index == 1:
+                reading = ""
+            groups.append(reading + _SINO_LARGE_UNITS[unit_index])
+        unit_index += 1
+    return " ".join(reversed(groups))
+
+
+def native_korean(n: int) -> str:
+    """1-99를 관형형 고유어 수사로 변환합니다. 예: 3 -> '세', 20 -> '스무'"""
+    if not 0 < n < 100:
+        raise ValueError(f"Native Korean numerals support 1-99: {n}")
+    if n == 20:
+        return "스무"
+    tens, ones = divmod(n, 10)
+    return _NATIVE_TENS[tens] + _NATIVE_ONES[ones]
+
+
+def normalize_numerals(text: str, book: Optional[str] = None) -> str:
+    """
+    문장 속 아라비아 숫자를 TTS용 한글 수사로 바꿉니다.
+    - 장/절: '27장' -> '이십칠장', '요한복음 3:16' -> '요한복음 삼장 십육절', '시편 23:1' -> '시편 이십삼편 일절'
+    - 시각/비율: 책 이름이 앞에 없는 'N:M'은 '10:30' -> '열 시 삼십 분', '3:1' -> '삼 대 일'
+      (book을 지정하면 책 이름 없는 'N:M'도 그 책의 장:절로 읽음)
+    - 수량: '24,000명' -> '이만 사천 명', '3명' -> '세 명'
+    - 날짜: '2024년 6월 1일' -> '이천이십사년 유월 일일'
+    """
+    if not text or not any(ch.isdigit() for ch in text):
+        return text
+    return _PATTERN.sub(lambda match: _replace(match, book), text)
+
+
+def _read_group(n: int) -> str:
+    """0-9999 구간을 읽습니다. 십/백/천 앞의 '일'은 생략합니다."""
+    parts = []
+    for position in range(3, -1, -1):
+        digit = (n // 10 ** position) % 10
+        if digit == 0:
+            continue
+        if digit == 1 and position > 0:
+            parts.append(_SINO_SMALL_UNITS[position])
+        else:
+            parts.append(_SINO_DIGITS[digit] + _SINO_SMALL_UNITS[position])
+    return "".join(parts)
+
+
+def _replace(match: re.Match, default_book: Optional[str] = None) -> str:
+    if match.group("ch"):
+        before = _BOOK_BEFORE.search(match.string, max(0, match.start() - _BOOK_WINDOW), match.start())
+        book = before.group(0).rstrip() if before else default_book
+        if book:
+            return _read_chapter_verse(match, book)
+        return _read_clock(match)
+
+    value = int(match.group("num").replace(",", ""))
+    frac = match.group("frac")
+    counter = match.group("counter")
+
+    if frac:
+        number = sino_korean(value) + " 점 " + "".join(_SINO_DIGITS[int(d)] or "영" for d in frac)
+    elif counter in _NATIVE_COUNTERS and 0 < value < 100:
+        if counter in ("번째", "째") and value == 1:
+            return "첫 " + counter
+        return f"{native_korean(value)} {counter}"
+    elif counter == "월" and value in _MONTH_READINGS:
+        return _MONTH_READINGS[value]
+    else:
+        number = sino_korean(value)
+
+    if not counter:
+        return number + match.group("sp")
+    counter_reading = _COUNTER_READINGS.get(counter, counter)
+    if counter in _NATIVE_COUNTERS or " " in number:
+        return f"{number} {counter_reading}"
+    return number + counter_reading
+
+
+def _read_chapter_verse(match: re.Match, book: str) -> str:
+    unit = "편" if book == "시편" else "장"
+    reading = f"{sino_korean(int(match.group('ch')))}{unit} {sino_korean(int(match.group('vs')))}절"
+    if match.group("ve"):
+        reading += f"에서 {sino_korean(int(match.group('ve')))}절"
+    return reading
+
+
+def _read_clock(match: re.Match) -> str:
+    """책 없는 'N:M': 시각이면 'N시 M분', 아니면 비율 'N 대 M' (뒤의 '-K'는 일반 숫자로 읽음)"""
+    hour, minute = int(match.group("ch")), int(match.group("vs"))
+    if 0 < hour <= 24 and len(match.group("vs")) == 2 and minute < 60:
+        reading = f"{native_korean(hour)} 시" + (f" {sino_korean(minute)} 분" if minute else "")
+    else:
+        reading = f"{sino_korean(hour)} 대 {sino_korean(minute)}"
+    tail = match.group(0)[match.end("vs") - match.start():]
+    return reading + normalize_numerals(tail)
+
+
+def parse_sino_korean(text: str) -> int:
+    """한자어 수사를 정수로 변환합니다. 예: '이십삼' -> 23, '백오십' -> 150"""
+    total = 0
+    group = 0
+    digit = None
+    for ch in text.replace(" ", ""):
+        if ch in _SINO_DIGIT_VALUES:
+            if digit is not None:
+                raise ValueError(f"Invalid Sino-Korean numeral: {text}")
+            digit = _SINO_DIGIT_VALUES[ch]
+        elif ch in _SINO_SMALL_UNIT_VALUES:
+            group += (1 if digit is None else digit) * _SINO_SMALL_UNIT_VALUES[ch]
+            digit = None
+        elif ch == "만":
+            total += (group + (digit or 0) or 1) * 10000
+            group = 0
+            digit = None
+        else:
+            raise ValueError(f"Invalid Sino-Korean numeral: {text}")
+    if not text.strip():
+        raise ValueError("Empty numeral")
+    return total + group + (digit or 0)